@@ -0,0 +1,89 @@
+"""sock client benchmark.
+
+Measures records/sec and MB/sec through the SockClient framing used by the
+service socket transport, for small and multi-MB records:
+
+    python standalone_tests/sock_client_benchmark.py
+    python standalone_tests/sock_client_benchmark.py --sizes 100 4194304 --seconds 5
+"""
+
+import argparse
+import socket
+import threading
+import time
+
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.proto import wandb_server_pb2 as spb
+from wandb.sdk.lib.sock_client import SockClient, SockClientClosedError
+
+
+def make_request(size):
+    record = pb.Record()
+    record.output.line = "x" * size
+    sreq = spb.ServerRequest()
+    sreq.record_publish.CopyFrom(record)
+    return sreq
+
+
+def run(size, seconds):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    port = listener.getsockname()[1]
+
+    writer = SockClient()
+    writer.connect(port)
+    conn, _ = listener.accept()
+    reader = SockClient()
+    reader.set_socket(conn)
+
+    sreq = make_request(size)
+    nbytes = sreq.ByteSize() + SockClient.HEADLEN
+    stop = threading.Event()
+
+    def send():
+        while not stop.is_set():
+            writer.send_server_request(sreq)
+        writer.shutdown(socket.SHUT_WR)
+
+    sender = threading.Thread(target=send)
+    sender.start()
+
+    count = 0
+    start = time.time()
+    while time.time() - start < seconds:
+        reader.read_server_request()
+        count += 1
+    elapsed = time.time() - start
+    stop.set()
+    try:
+        while reader.read_server_request():
+            pass
+    except SockClientClosedError:
+        pass
+    sender.join()
+    writer.close()
+    reader.close()
+    listener.close()
+
+    rate = count / elapsed
+    print(
+        "size={:>10} records/sec={:>12.1f} MB/sec={:>10.1f}".format(
+            size, rate, rate * nbytes / 1e6
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sock client benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 1000, 64 * 1024, 4 * 1024 * 1024]
+    )
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
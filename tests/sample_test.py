@@ -38,3 +38,30 @@ def test_all():
         for n in range(1000):
             l = doit(n, samples=s)
             check(n, l, samples=s)
+
+
+def test_types():
+    s = sample.UniformSampleAccumulator()
+    s.add_many([1, True, 3])
+    assert s.is_int
+    assert s.get() == (1, 1, 3)
+    s.add(2.5)
+    assert not s.is_int
+    assert s.get() == (1.0, 1.0, 3.0, 2.5)
+
+    s = sample.UniformSampleAccumulator()
+    s.add_many([1, 2 ** 70])
+    assert not s.is_int
+    assert s.get() == (1.0, float(2 ** 70))
+
+
+def test_sampled_history():
+    h = sample.SampledHistory()
+    for n in range(1000):
+        h.add_many(dict(step=n, loss=n / 2, name="str", nested=dict(a=1)))
+    sampled = dict(h.items())
+    assert sorted(sampled) == ["loss", "step"]
+    assert sampled["step"].is_int
+    assert sampled["step"].get() == doit(1000)
+    assert not sampled["loss"].is_int
+    assert sampled["loss"].get() == tuple(n / 2 for n in doit(1000))
@@ -0,0 +1,130 @@
+"""
+artifact download tests.
+"""
+
+import base64
+import hashlib
+import os
+import platform
+import threading
+
+import pytest
+from six.moves import BaseHTTPServer
+from wandb.sdk import wandb_artifacts
+from wandb.sdk.interface import artifacts
+
+
+class RangeServer(object):
+    """Serves one file, honoring range requests."""
+
+    def __init__(self, data):
+        self.data = data
+        self.ranges = []
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                data = server.data
+                server.ranges.append(self.headers.get("Range"))
+                if self.headers.get("Range"):
+                    start = int(self.headers["Range"][len("bytes=") :].split("-")[0])
+                    self.send_response(206)
+                    data = data[start:]
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = BaseHTTPServer.HTTPServer(("localhost", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        self.url = "http://localhost:{}/file".format(self._httpd.server_port)
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _entry(data):
+    digest = base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+    return wandb_artifacts.ArtifactManifestEntry(
+        "file.bin", None, digest=digest, size=len(data)
+    )
+
+
+def _partial_path(path):
+    return os.path.join(
+        os.path.dirname(path), "tmp_%s.partial" % os.path.basename(path)
+    )
+
+
+@pytest.mark.parametrize("partial", [b"", b"x" * 3, b"first half"])
+def test_download_to_cache_resume(test_dir, partial):
+    data = b"first half, second half"
+    server = RangeServer(data)
+    policy = wandb_artifacts.WandbStoragePolicy()
+    path = os.path.join(os.getcwd(), "object")
+    if partial:
+        with open(_partial_path(path), "wb") as f:
+            f.write(partial)
+
+    policy._download_to_cache(server.url, path, _entry(data))
+    server.close()
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert not os.path.exists(_partial_path(path))
+    if partial == b"first half":
+        assert server.ranges == ["bytes=10-"]
+    elif partial:
+        # the partial file was not part of this file, it is downloaded again
+        assert server.ranges == ["bytes=3-", None]
+    else:
+        assert server.ranges == [None]
+
+
+def test_place_file_copy(test_dir, monkeypatch):
+    monkeypatch.setenv("WANDB_ARTIFACT_LINK_TYPE", "copy")
+    with open("src", "w") as f:
+        f.write("data")
+    with open("dst", "w") as f:
+        f.write("old")
+    assert artifacts.place_file("src", "dst") == "copy"
+    with open("dst") as f:
+        assert f.read() == "data"
+    assert not os.path.samefile("src", "dst")
+    assert os.stat("src").st_mtime == os.stat("dst").st_mtime
+    assert sorted(os.listdir(".")) == ["dst", "src"]
+
+
+def test_place_file_default(test_dir):
+    with open("src", "w") as f:
+        f.write("data")
+    mode = os.stat("src").st_mode
+    method = artifacts.place_file("src", "dst")
+    assert method in ("reflink", "copy")
+    assert not os.path.samefile("src", "dst")
+    # the downloaded file can be edited without changing the cache
+    with open("dst", "w") as f:
+        f.write("edited")
+    with open("src") as f:
+        assert f.read() == "data"
+    assert os.stat("src").st_mode == mode
+    assert sorted(os.listdir(".")) == ["dst", "src"]
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="no hardlinks")
+def test_place_file_hardlink(test_dir, monkeypatch):
+    monkeypatch.setenv("WANDB_ARTIFACT_LINK_TYPE", "hardlink")
+    with open("src", "w") as f:
+        f.write("data")
+    mode = os.stat("src").st_mode
+    assert artifacts.place_file("src", "dst") == "hardlink"
+    assert os.path.samefile("src", "dst")
+    assert os.stat("src").st_mode == mode
+    assert sorted(os.listdir(".")) == ["dst", "src"]
@@ -1,10 +1,12 @@
 import contextlib
 import datetime
 import getpass
+import glob
 import importlib
 import netrc
 import os
 import platform
+import shutil
 import subprocess
 import sys
 import traceback
@@ -963,6 +965,54 @@ def test_sync_wandb_run(runner, live_mock_server):
         assert "wandb: ERROR Nothing to sync." in result.output
 
 
+def test_sync_wandb_run_jobs(runner, live_mock_server):
+    with runner.isolated_filesystem():
+        utils.fixture_copy("wandb")
+        shutil.copytree(
+            os.path.join("wandb", "offline-run-20210216_154407-g9dvvkua"),
+            os.path.join("wandb", "offline-run-20210216_154408-g9dvvkua"),
+        )
+
+        result = runner.invoke(cli.sync, ["--sync-all", "--jobs", "2"])
+        print(result.output)
+        assert result.exit_code == 0
+        assert "[2/2] Synced " in result.output
+        assert "Synced 2 of 2 runs" in result.output
+        assert len(glob.glob(os.path.join("wandb", "*", "*.synced"))) == 2
+
+
+def _write_corrupt_run(run_dir):
+    from wandb.sdk.internal import datastore
+
+    os.makedirs(run_dir)
+    ds = datastore.DataStore()
+    ds.open_for_write(os.path.join(run_dir, "run-bad.wandb"))
+    ds._write_data(b"\xff\xff\xff")
+    ds.close()
+
+
+def test_sync_wandb_run_failed(runner, live_mock_server):
+    with runner.isolated_filesystem():
+        _write_corrupt_run(os.path.join("wandb", "offline-run-20210216_154407-bad"))
+
+        result = runner.invoke(cli.sync, ["--sync-all"])
+        print(result.output)
+        assert result.exit_code == 1
+        assert "Unable to sync" in result.output
+
+
+def test_sync_wandb_run_jobs_failed(runner, live_mock_server):
+    with runner.isolated_filesystem():
+        utils.fixture_copy("wandb")
+        _write_corrupt_run(os.path.join("wandb", "offline-run-20210216_154408-bad"))
+
+        result = runner.invoke(cli.sync, ["--sync-all", "--jobs", "2"])
+        print(result.output)
+        assert result.exit_code == 1
+        assert "Synced 1 of 2 runs" in result.output
+        assert "Failed to sync 1 runs" in result.output
+
+
 @pytest.mark.skipif(
     sys.version_info >= (3, 9), reason="Tensorboard not currently built for 3.9"
 )
@@ -9,6 +9,7 @@ import six
 import sys
 import glob
 import platform
+import threading
 from click.testing import CliRunner
 from . import utils
 from .utils import dummy_data
@@ -131,6 +132,68 @@ def test_image_accepts_other_images(mocked_run):
     assert image_a == image_b
 
 
+def test_image_batch_to_uint8():
+    batch = np.stack(
+        [
+            np.random.random((8, 8, 3)),
+            np.random.random((8, 8, 3)) * 2 - 1,
+            np.random.random((8, 8, 3)) * 300,
+            np.zeros((8, 8, 3)),
+        ]
+    )
+    converted = wandb.Image.batch_to_uint8(batch)
+    for image, expected in zip(converted, batch):
+        assert (image == wandb.Image.to_uint8(expected)).all()
+
+    masks = np.random.randint(2, size=(2, 8, 8), dtype=np.uint8)
+    assert (wandb.Image.batch_to_uint8(masks) == masks * 255).all()
+
+
+def test_image_from_batch(mocked_run):
+    batch = np.random.random((4, 3, 10, 12))
+    images = wandb.Image.from_batch(batch.transpose(0, 2, 3, 1), captions="abcd")
+    assert [image._caption for image in images] == list("abcd")
+    for i, image in enumerate(images):
+        assert image.image.size == (12, 10)
+        image.bind_to_run(mocked_run, "batch", 0, i)
+        assert image.to_json(mocked_run)["path"].endswith("batch_0_%d.png" % i)
+        expected = wandb.Image.to_uint8(batch[i].transpose(1, 2, 0))
+        assert (np.asarray(image.image) == expected).all()
+
+
+def test_image_from_batch_copies_data(mocked_run):
+    class BlockedEncoder(data_types.ImageEncoder):
+        def __init__(self):
+            super().__init__("png")
+            self.release = threading.Event()
+
+        def encode(self, image):
+            self.release.wait()
+            return super().encode(image)
+
+    encoder = BlockedEncoder()
+    batch = np.full((2, 16, 16), 200, dtype=np.uint8)
+    images = wandb.Image.from_batch(batch, encoder=encoder)
+    # the caller reuses its buffer before the images are encoded
+    batch[:] = 0
+    encoder.release.set()
+    for i, image in enumerate(images):
+        image.bind_to_run(mocked_run, "batch", 0, i)
+        image.to_json(mocked_run)
+        assert PIL.Image.open(image._path).getpixel((0, 0)) == 200
+
+
+def test_image_encoder(mocked_run):
+    encoder = data_types.ImageEncoder("jpg", quality=80)
+    wb_image = wandb.Image(np.random.random((10, 10, 4)), encoder=encoder)
+    wb_image.bind_to_run(mocked_run, "jpg", 0)
+    assert wb_image.to_json(mocked_run)["format"] == "jpg"
+    assert wb_image._path.endswith(".jpg")
+    assert PIL.Image.open(wb_image._path).format == "JPEG"
+    with pytest.raises(ValueError):
+        data_types.ImageEncoder("tiff")
+
+
 def test_image_accepts_bounding_boxes(mocked_run):
     img = wandb.Image(image, boxes={"predictions": {"box_data": [full_box]}})
     img.bind_to_run(mocked_run, "images", 0)
@@ -833,6 +896,49 @@ def test_table_from_pandas():
     assert table.data == table_data
 
 
+def test_table_add_data_many():
+    rows = [["a", 1, True], ["b", 2.5, False], [None, 3, True]]
+    table = wandb.Table(columns=["s", "n", "b"])
+    for row in rows:
+        table.add_data(*row)
+    table_many = wandb.Table(columns=["s", "n", "b"])
+    table_many.add_data_many(rows[:1])
+    table_many.add_data_many(rows[1:])
+    assert table_many == table
+
+    with pytest.raises(ValueError):
+        table_many.add_data_many([["c", 4]])
+    with pytest.raises(TypeError):
+        table_many.add_data_many([["c", "d", True]])
+    assert table_many.data == rows
+
+    # the error explains against the type assigned from the preceding rows
+    table = wandb.Table(columns=["n"])
+    with pytest.raises(TypeError, match="String not assignable to Number"):
+        table.add_data_many([[1], ["x"]])
+
+
+def test_table_columnar_from_numpy():
+    np_data = np.arange(12).reshape(4, 3)
+    table = wandb.Table(columns=["a", "b", "c"], data=np_data)
+    rows_table = wandb.Table(columns=["a", "b", "c"])
+    for row in np_data:
+        rows_table.add_data(*row)
+    assert table._column_types == rows_table._column_types
+    # rows are only materialized when needed
+    assert table._rows is None
+    assert table.get_column("b") == [1, 4, 7, 10]
+    assert np.all(table.get_column("c", convert_to="numpy") == np_data[:, 2])
+    assert [row for _, row in table.iterrows()] == np_data.tolist()
+    assert table._to_table_json(max_rows=2)["data"] == np_data[:2].tolist()
+    table.add_data_many(np_data)
+    assert table._rows is None
+    assert table.get_column("a") == [0, 3, 6, 9] * 2
+    table.add_data(1, 2, 3)
+    assert table.data[-1] == [1, 2, 3]
+    assert len(table.data) == 9
+
+
 def test_graph():
     graph = wandb.Graph()
     node_a = data_types.Node("a", "Node A", size=(4,))
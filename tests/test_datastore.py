@@ -143,3 +143,266 @@ def test_data_write_fill(with_datastore):
         expected_records=records,
         expected_record_sizes=lengths,
     )
+
+
+def _history_record(step, size=10):
+    rec = wandb_internal_pb2.Record()
+    item = rec.history.item.add()
+    item.key = "data"
+    item.value_json = json.dumps("x" * size)
+    rec.history.step.num = step
+    return rec
+
+
+def _write_records(fname, records, compression=None):
+    if os.path.exists(fname):
+        os.unlink(fname)
+    wandb._set_internal_process()
+    s = datastore.DataStore()
+    s.open_for_write(fname, compression=compression)
+    for rec in records:
+        s.write(rec)
+    s.close()
+
+
+def _scan_all(ds):
+    records = []
+    while True:
+        data = ds.scan_data()
+        if data is None:
+            break
+        rec = wandb_internal_pb2.Record()
+        rec.ParseFromString(data)
+        records.append(rec)
+    return records
+
+
+def test_scan_index_seek(test_dir):
+    run = wandb_internal_pb2.Record()
+    run.run.run_id = "abc"
+    records = [run]
+    # mix small records and records spanning several blocks
+    for step in range(20):
+        records.append(_history_record(step, size=50000 if step % 7 == 3 else 10))
+        out = wandb_internal_pb2.Record()
+        out.output.line = "line {}".format(step)
+        records.append(out)
+    _write_records(FNAME, records)
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert _scan_all(s) == records
+
+    index = s.build_index()
+    assert len(index) == len(records)
+    assert index.types[0] == 17
+    assert list(index.steps[1::2]) == list(range(20))
+    assert set(index.types[2::2]) == {4}
+    assert os.path.exists(FNAME + datastore.LEVELDBLOG_INDEX_SUFFIX)
+
+    assert s.seek_record(5)
+    assert _scan_all(s) == records[5:]
+    assert s.seek_step(10)
+    assert _scan_all(s) == records[21:]
+    assert not s.seek_step(100)
+    assert s.scan_data() is None
+    s.close()
+
+    # sidecar index is reused
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    loaded = datastore.DataStoreIndex.load(FNAME + datastore.LEVELDBLOG_INDEX_SUFFIX)
+    assert list(loaded.offsets) == list(index.offsets)
+    assert s.seek_step(3)
+    assert _scan_all(s)[0] == records[7]
+    s.close()
+
+
+def test_scan_index_extend(test_dir):
+    records = [_history_record(step) for step in range(5)]
+    _write_records(FNAME, records)
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert len(s.build_index()) == 5
+    s.close()
+
+    records += [_history_record(step) for step in range(5, 10)]
+    _write_records(FNAME, records)
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    index = s.build_index()
+    assert list(index.steps) == list(range(10))
+    assert s.seek_record(9)
+    assert _scan_all(s) == records[9:]
+    s.close()
+
+
+def test_scan_index_replaced_file(test_dir):
+    records = [_history_record(step) for step in range(10)]
+    _write_records(FNAME, records)
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    s.build_index()
+    s.close()
+
+    # a different run of the same size is written to the same file
+    records = [_history_record(step) for step in range(100, 110)]
+    _write_records(FNAME, records)
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert list(s.build_index().steps) == list(range(100, 110))
+    assert s.seek_record(4)
+    assert _scan_all(s) == records[4:]
+    s.close()
+
+
+def test_scan_index_invalid_offsets(test_dir):
+    records = [_history_record(step) for step in range(10)]
+    _write_records(FNAME, records)
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    index = s.build_index()
+    # the offsets do not point at records anymore
+    for num in range(len(index)):
+        index.offsets[num] += 1
+    assert s.seek_step(5)
+    assert _scan_all(s) == records[5:]
+    s.close()
+
+
+def test_scan_unpadded_end(with_datastore):
+    """Leave less than a header worth of space at the end of the last block."""
+    ds = with_datastore
+    ds._write_data(b"\x01" * (32768 - 7 - 7 - 3))
+    ds.close()
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert s._scan_raw_data() == b"\x01" * (32768 - 7 - 7 - 3)
+    assert s._scan_raw_data() is None
+    s.close()
+
+
+def test_append(test_dir):
+    records = [_history_record(step, size=20000) for step in range(5)]
+    _write_records(FNAME, records)
+
+    s = datastore.DataStore()
+    s.open_for_append(FNAME)
+    more = [_history_record(step) for step in range(5, 8)]
+    for rec in more:
+        s.write(rec)
+    s.close()
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert _scan_all(s) == records + more
+    s.close()
+
+
+@pytest.mark.parametrize("torn_bytes", [3, 100, 32768 + 100])
+def test_append_torn_record(test_dir, torn_bytes):
+    records = [_history_record(step, size=30000) for step in range(3)]
+    _write_records(FNAME, records)
+    complete_size = os.stat(FNAME).st_size
+    # simulate a crash in the middle of writing a (multi block) record
+    torn = _history_record(3, size=70000)
+    _write_records(FNAME, records + [torn])
+    with open(FNAME, "r+b") as f:
+        f.truncate(complete_size + torn_bytes)
+
+    s = datastore.DataStore()
+    s.open_for_append(FNAME)
+    assert os.stat(FNAME).st_size == complete_size
+    rec = _history_record(4)
+    s.write(rec)
+    s.close()
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert _scan_all(s) == records + [rec]
+    s.close()
+
+
+def test_append_empty(test_dir):
+    with open(FNAME, "wb"):
+        pass
+    wandb._set_internal_process()
+    s = datastore.DataStore()
+    s.open_for_append(FNAME)
+    rec = _history_record(0)
+    s.write(rec)
+    s.close()
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert _scan_all(s) == [rec]
+    s.close()
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd"])
+def test_compression(test_dir, compression):
+    records = [
+        _history_record(step, size=size) for step, size in enumerate([10, 40000])
+    ]
+    _write_records(FNAME, records)
+    uncompressed_size = os.stat(FNAME).st_size
+    _write_records(FNAME, records, compression=compression)
+    assert os.stat(FNAME).st_size < uncompressed_size
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert s._version == 1
+    assert _scan_all(s) == records
+    s.close()
+
+
+def test_compression_unknown(test_dir):
+    wandb._set_internal_process()
+    s = datastore.DataStore()
+    with pytest.raises(ValueError):
+        s.open_for_write(FNAME, compression="lzma")
+    s.close()
+
+
+def test_read_version_0(test_dir):
+    records = [_history_record(step) for step in range(3)]
+    # uncompressed logs are written as version 0, without codec bytes
+    _write_records(FNAME, records[:2])
+    with open(FNAME, "rb") as f:
+        data = f.read()
+    assert data[6] == 0
+    assert data[7 + 7 :].startswith(records[0].SerializeToString())
+
+    s = datastore.DataStore()
+    s.open_for_append(FNAME, compression="zlib")
+    s.write(records[2])
+    s.close()
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert s._version == 0
+    assert _scan_all(s) == records
+    s.close()
+
+
+def test_write_buffered(test_dir):
+    wandb._set_internal_process()
+    s = datastore.DataStore()
+    s.open_for_write(FNAME)
+    s.write(_history_record(0))
+    # partial blocks are only written on flush
+    assert os.stat(FNAME).st_size == 7
+    s.flush()
+    assert s.buffered_bytes() == 0
+    assert os.stat(FNAME).st_size == s._index
+    # complete blocks are written as they fill up
+    s.write(_history_record(1, size=40000))
+    assert os.stat(FNAME).st_size == 32768
+    assert s.buffered_bytes() == s._index - 32768
+    s.write(_history_record(2))
+    s.close()
+
+    s = datastore.DataStore()
+    s.open_for_scan(FNAME)
+    assert [r.history.step.num for r in _scan_all(s)] == [0, 1, 2]
+    s.close()
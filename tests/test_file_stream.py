@@ -5,11 +5,17 @@ file_stream tests.
 from __future__ import print_function
 from dataclasses import dataclass
 
+import gzip
 import json
 import pytest
 import os
+import requests
+import threading
+import time
 
-from wandb.sdk.internal.file_stream import CRDedupeFilePolicy
+from wandb.filesync import stats
+from wandb.sdk.internal import file_stream
+from wandb.sdk.internal.file_stream import CRDedupeFilePolicy, FileStreamApi
 from wandb.sdk.lib import file_stream_utils
 from wandb import util
 
@@ -126,6 +132,188 @@ def test_fstream_requests_error(
     assert "Dropped streaming file chunk" in stderr
 
 
+class FakeApi(object):
+    api_key = "X" * 40
+    user_agent = "test"
+    retry_callback = None
+
+    def __init__(self):
+        self.dynamic_settings = {"heartbeat_seconds": 30}
+
+    def settings(self):
+        return dict(base_url="http://localhost", entity="ent", project="proj")
+
+
+def _wait_for(cond, timeout=10):
+    start = time.time()
+    while not cond():
+        assert time.time() - start < timeout
+        time.sleep(0.01)
+
+
+def test_fstream_pipelined(mocker):
+    fs = FileStreamApi(FakeApi(), "run", time.time())
+    mocker.patch.object(fs, "rate_limit_seconds", return_value=0.01)
+    release = threading.Event()
+    posts = []
+
+    def post(url, **kwargs):
+        data = json.loads(kwargs["data"])
+        posts.append(data)
+        # the first history request is stuck in the backend
+        if "history" in data.get("files", {}):
+            release.wait()
+        return mocker.Mock(headers={})
+
+    fs._client.post = post
+    fs.start()
+    fs.push("history", "h0")
+    _wait_for(lambda: fs.stats()["inflight_requests"] == 1)
+    fs.push("history", "h1")
+    fs.push("history", "h2")
+    fs.push("output", "o0")
+    # other files keep streaming while the history request is stuck
+    _wait_for(lambda: fs.stats()["sent_chunks"] == 1)
+    stats = fs.stats()
+    assert stats["pending_chunks"] == 3
+    assert stats["inflight_requests"] == 1
+    assert stats["lag_seconds"] > 0
+
+    release.set()
+    fs.finish(0)
+    history = [p["files"]["history"] for p in posts if "history" in p.get("files", {})]
+    assert history == [
+        {"offset": 0, "content": ["h0"]},
+        {"offset": 1, "content": ["h1", "h2"]},
+    ]
+    assert posts[-1]["complete"]
+    assert fs.stats() == dict(
+        pending_chunks=0,
+        pending_bytes=0,
+        spooled_bytes=0,
+        inflight_requests=0,
+        sent_chunks=4,
+        dropped_chunks=0,
+        lag_seconds=0.0,
+    )
+
+
+def test_fstream_backpressure(mocker):
+    fs = FileStreamApi(FakeApi(), "run", time.time())
+    fs.MAX_PENDING_BYTES = 10
+    fs.set_file_policy("history", file_stream.JsonlFilePolicy())
+    fs.set_file_policy("summary", file_stream.SummaryFilePolicy())
+    mocker.patch.object(fs, "rate_limit_seconds", return_value=0.01)
+    release = threading.Event()
+    posts = []
+
+    def post(url, **kwargs):
+        data = json.loads(kwargs["data"])
+        posts.append(data)
+        if "files" in data:
+            release.wait()
+        return mocker.Mock(headers={})
+
+    fs._client.post = post
+    fs.start()
+    fs.push("history", "h" * 12)
+    _wait_for(lambda: fs.stats()["inflight_requests"] == 1)
+    # past the limit chunks are spooled to disk without blocking
+    start = time.time()
+    lines = ["h%04d" % i for i in range(100)]
+    for ndx, line in enumerate(lines):
+        fs.push("history", line)
+        fs.push("summary", "s%d" % ndx)
+    assert time.time() - start < 1
+    stats = fs.stats()
+    assert stats["pending_bytes"] == 12
+    # only the latest summary is kept
+    assert stats["spooled_bytes"] == 5 * 100 + 3
+    assert stats["pending_chunks"] == 1 + 100 + 1
+    assert stats["lag_seconds"] > 0
+
+    release.set()
+    fs.finish(0)
+    history = []
+    summaries = []
+    for post in posts:
+        files = post.get("files", {})
+        if "history" in files:
+            assert files["history"]["offset"] == len(history)
+            history.extend(files["history"]["content"])
+        if "summary" in files:
+            summaries.extend(files["summary"]["content"])
+    # no history line is lost
+    assert history == ["h" * 12] + lines
+    assert summaries == ["s99"]
+    stats = fs.stats()
+    assert stats["pending_chunks"] == 0
+    assert stats["spooled_bytes"] == 0
+    assert stats["dropped_chunks"] == 0
+
+
+def test_fstream_compression_negotiated(mocker):
+    fs = FileStreamApi(FakeApi(), "run", time.time())
+    upload_stats = stats.Stats()
+    fs.set_upload_stats(upload_stats)
+    posts = []
+
+    def post(url, **kwargs):
+        posts.append(kwargs)
+        return mocker.Mock(headers={"Accept-Encoding": "br, gzip;q=0.5"})
+
+    fs._client.post = post
+    chunks = [
+        file_stream.Chunk("history", json.dumps(dict(loss=i))) for i in range(200)
+    ]
+    fs._send(chunks[:100])
+    fs._send(chunks[100:])
+    fs._send_status({"complete": False})
+
+    assert [p["headers"].get("Content-Encoding") for p in posts] == [
+        None,
+        "gzip",
+        None,
+    ]
+    data = json.loads(gzip.decompress(posts[1]["data"]))
+    assert data["files"]["history"]["offset"] == 100
+    summary = upload_stats.summary()
+    raw_bytes = sum(len(p["data"]) for p in posts) - len(posts[1]["data"])
+    raw_bytes += len(gzip.decompress(posts[1]["data"]))
+    assert summary["file_stream_raw_bytes"] == raw_bytes
+    assert summary["file_stream_sent_bytes"] == sum(len(p["data"]) for p in posts)
+
+
+def test_fstream_compression_rejected(mocker):
+    fs = FileStreamApi(FakeApi(), "run", time.time(), compression="gzip")
+    posts = []
+
+    def post(url, **kwargs):
+        posts.append(kwargs)
+        response = mocker.Mock(headers={})
+        if "Content-Encoding" in kwargs["headers"]:
+            error = requests.Response()
+            error.status_code = 415
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+                response=error
+            )
+        return response
+
+    fs._client.post = post
+    chunks = [
+        file_stream.Chunk("history", json.dumps(dict(loss=i))) for i in range(200)
+    ]
+    assert fs._send(chunks[:100])
+    assert fs._send(chunks[100:])
+    # the rejected body is resent as is, later bodies are not compressed
+    assert [p["headers"].get("Content-Encoding") for p in posts] == [
+        "gzip",
+        None,
+        None,
+    ]
+    assert json.loads(posts[1]["data"])["files"]["history"]["offset"] == 0
+
+
 def test_crdedupe_consecutive_offsets():
     fp = CRDedupeFilePolicy()
     console = {1: "a", 2: "a", 3: "a", 8: "a", 12: "a", 13: "a", 30: "a"}
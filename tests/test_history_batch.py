@@ -0,0 +1,75 @@
+"""
+history batch tests.
+"""
+
+import math
+
+import pytest
+import wandb
+from wandb.sdk.interface import history_batch
+
+
+def test_history_batch_roundtrip():
+    batch = history_batch.HistoryBatch()
+    assert batch.add(dict(a=1, b=2.5))
+    assert batch.add(dict(a=2))
+    assert batch.add(dict(b=float("nan"), c=-(2 ** 63)))
+    assert len(batch) == 3
+
+    rows = history_batch.rows_from_proto(batch.to_proto())
+    assert rows[0] == dict(a=1, b=2.5)
+    assert rows[1] == dict(a=2)
+    assert math.isnan(rows[2]["b"])
+    assert rows[2]["c"] == -(2 ** 63)
+    assert isinstance(rows[0]["a"], int)
+
+    assert history_batch.json_rows_from_proto(batch.to_proto()) == [
+        {"a": "1", "b": "2.5"},
+        {"a": "2"},
+        {"b": "NaN", "c": str(-(2 ** 63))},
+    ]
+
+    batch.clear()
+    assert len(batch) == 0
+    assert history_batch.rows_from_proto(batch.to_proto()) == []
+
+
+@pytest.mark.parametrize(
+    "row",
+    [{}, dict(a="str"), dict(a=True), dict(a=[1]), dict(a=dict(b=1)), dict(a=2 ** 64)],
+)
+def test_history_batch_reject(row):
+    batch = history_batch.HistoryBatch()
+    assert not batch.add(row)
+    assert len(batch) == 0
+
+
+def test_history_batch_type_conflict():
+    batch = history_batch.HistoryBatch()
+    assert batch.add(dict(a=1, b=1))
+    assert not batch.add(dict(b=2, a=1.5))
+    assert len(batch) == 1
+    assert history_batch.rows_from_proto(batch.to_proto()) == [dict(a=1, b=1)]
+
+
+def test_history_batch_full(live_mock_server, test_settings, parse_ctx):
+    test_settings.update(_history_batch_rows=4, _history_batch_seconds=60)
+    run = wandb.init(settings=test_settings)
+    for i in range(6):
+        run.log(dict(val=i, loss=i / 2))
+    run.log(dict(val=1.5))
+    run.log(dict(other="str"))
+    run.log(dict(val=7), commit=False)
+    run.log(dict(loss=0.25))
+    run.summary["extra"] = 3
+    run.log(dict(val=9))
+    run.finish()
+
+    ctx_util = parse_ctx(live_mock_server.get_ctx())
+    history = ctx_util.history
+    assert [h["_step"] for h in history] == list(range(10))
+    assert [h.get("val") for h in history] == [0, 1, 2, 3, 4, 5, 1.5, None, 7, 9]
+    assert history[8]["loss"] == 0.25
+    assert history[7]["other"] == "str"
+    assert ctx_util.summary["val"] == 9
+    assert ctx_util.summary["extra"] == 3
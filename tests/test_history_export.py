@@ -0,0 +1,138 @@
+"""
+history export tests.
+"""
+
+import json
+import math
+
+import pytest
+from wandb.apis import history_export
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+HISTORY_KEYS = {
+    "keys": {
+        "_step": {"typeCounts": [{"type": "number", "count": 4}]},
+        "loss": {"typeCounts": [{"type": "number", "count": 3}]},
+        "phase": {"typeCounts": [{"type": "string", "count": 4}]},
+        "img": {"typeCounts": [{"type": "image-file", "count": 1}]},
+    },
+    "lastStep": 3,
+}
+
+ROWS = [
+    {"_step": 0, "loss": 1, "phase": "train"},
+    {"_step": 1, "loss": 0.5, "phase": "train", "img": {"_type": "image-file"}},
+    {"_step": 2, "phase": "eval"},
+    {"_step": 3, "loss": 0.25, "phase": "eval"},
+]
+
+
+class FakeResponse(object):
+    def __init__(self, data):
+        self.data = data
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def _history_bytes(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    def fn(data):
+        response = FakeResponse(data)
+        monkeypatch.setattr(
+            history_export.requests, "get", lambda *args, **kwargs: response
+        )
+        return response
+
+    yield fn
+
+
+def test_iter_blocks():
+    chunks = [b'{"a": 1}\n{"a"', b": 2}", b'\n{"a": 3}']
+    assert list(history_export.iter_blocks(chunks)) == [
+        b'{"a": 1}\n',
+        b'{"a": 2}\n',
+        b'{"a": 3}',
+    ]
+
+
+# without historyKeys the types are inferred from the first block
+@pytest.mark.parametrize("history_keys,chunk_size", [(HISTORY_KEYS, 40), (None, 1000)])
+def test_iter_record_batches(fake_get, history_keys, chunk_size):
+    response = fake_get(_history_bytes(ROWS))
+    batches = list(
+        history_export.iter_record_batches(
+            "url", "key", history_keys=history_keys, chunk_size=chunk_size
+        )
+    )
+    assert response.closed
+    assert len({batch.schema for batch in batches}) == 1
+    table = pa.Table.from_batches(batches)
+    assert table.schema.field("_step").type == pa.int64()
+    assert table.schema.field("loss").type == pa.float64()
+    assert table.column("_step").to_pylist() == [0, 1, 2, 3]
+    assert table.column("loss").to_pylist() == [1.0, 0.5, None, 0.25]
+    assert table.column("phase").to_pylist() == ["train", "train", "eval", "eval"]
+    assert table.column("img").to_pylist() == [
+        None,
+        '{"_type": "image-file"}',
+        None,
+        None,
+    ]
+
+
+def test_iter_record_batches_keys(fake_get):
+    # NaN is written by python's json module but is not valid JSON
+    data = _history_bytes(ROWS) + b'{"_step": 4, "loss": NaN, "phase": 7}\n'
+    fake_get(data)
+    batches = list(
+        history_export.iter_record_batches(
+            "url", "key", history_keys=HISTORY_KEYS, keys=["loss", "phase"]
+        )
+    )
+    table = pa.Table.from_batches(batches)
+    assert table.column_names == ["loss", "phase"]
+    loss = table.column("loss").to_pylist()
+    assert loss[:4] == [1.0, 0.5, None, 0.25]
+    assert math.isnan(loss[4])
+    # values that do not match the type of the key are dropped
+    assert table.column("phase").to_pylist()[4] is None
+
+
+def test_run_export_history(mock_server, api, fake_get, test_dir):
+    fake_get(_history_bytes(ROWS))
+    run = api.run("test/test/test")
+    run._attrs["historyKeys"] = HISTORY_KEYS
+    assert run.export_history("history.parquet", keys=["_step", "loss"]) == 4
+    table = pq.read_table("history.parquet")
+    assert table.to_pydict() == {"_step": [0, 1, 2, 3], "loss": [1.0, 0.5, None, 0.25]}
+
+
+def test_run_history_batches_client_auth(mock_server, api, monkeypatch):
+    requests_kwargs = {}
+
+    def get(url, **kwargs):
+        requests_kwargs.update(kwargs, url=url)
+        return FakeResponse(_history_bytes(ROWS))
+
+    monkeypatch.setattr(history_export.requests, "get", get)
+    run = api.run("test/test/test")
+    run.client._client.transport.auth = ("api", "client-key")
+    list(run.history_batches())
+    # the credentials of the client which fetched the run are used
+    assert requests_kwargs["auth"] == ("api", "client-key")
+    assert requests_kwargs["url"].startswith("http")
@@ -4,6 +4,7 @@ metric internal tests.
 
 from __future__ import print_function
 
+import json
 import math
 
 from wandb.proto import wandb_internal_pb2 as pb
@@ -408,3 +409,88 @@ def test_metric_dot_glob(publish_util):
         "nodots": {"min": 3},
         "this.has.dots": {"min": 2},
     }
+
+
+def _drain_summaries(q):
+    summaries = []
+    while not q.empty():
+        record = q.get()
+        if record.HasField("summary"):
+            summaries.append(record.summary)
+    return summaries
+
+
+def _history_record(**row):
+    record = pb.Record()
+    for k, v in row.items():
+        item = record.history.item.add()
+        item.key = k
+        item.value_json = json.dumps(v)
+    return record
+
+
+def test_metric_summary_delta(internal_hm, internal_sender_q):
+    m1 = pb.MetricRecord(name="v2")
+    m1.summary.max = True
+    m1.summary.mean = True
+    internal_hm.handle(pb.Record(metric=m1))
+    for row in _gen_history():
+        internal_hm.handle(_history_record(**row["data"]))
+
+    # summary updates are rate limited and only sent on debounce
+    assert _drain_summaries(internal_sender_q) == []
+    internal_hm.debounce()
+    (summary,) = _drain_summaries(internal_sender_q)
+    assert {item.key: json.loads(item.value_json) for item in summary.update} == {
+        "v1": 2,
+        "v2": {"max": 8, "mean": 13 / 3},
+        "v3": "pizza",
+        "mystep": 3,
+        "_step": 2,
+    }
+
+    # only the changed and removed keys are sent
+    internal_hm.handle(_history_record(v2=1, v3="pizza"))
+    record = pb.Record()
+    record.summary.remove.add().key = "v1"
+    internal_hm.handle(record)
+    internal_hm.debounce()
+    (summary,) = _drain_summaries(internal_sender_q)
+    assert {item.key: json.loads(item.value_json) for item in summary.update} == {
+        "v2": {"max": 8, "mean": 14 / 4},
+        "_step": 3,
+    }
+    assert [item.key for item in summary.remove] == ["v1"]
+
+    internal_hm.debounce()
+    assert _drain_summaries(internal_sender_q) == []
+
+
+def test_history_json_passthrough(internal_hm, internal_sender_q):
+    # values are passed on with the JSON they were logged with
+    values = {"v1": "1.50", "v2": '{"a":  [1,2]}', "v3": '"dog"', "v4": "NaN"}
+    record = pb.Record()
+    for k, v in values.items():
+        item = record.history.item.add()
+        item.key = k
+        item.value_json = v
+    internal_hm.handle(record)
+    internal_hm.debounce()
+
+    history, summary = [], []
+    while not internal_sender_q.empty():
+        record = internal_sender_q.get()
+        if record.HasField("history"):
+            history.append(record.history)
+        elif record.HasField("summary"):
+            summary.append(record.summary)
+    (history,) = history
+    (summary,) = summary
+    expected = dict(values, _step="0")
+    assert {item.key: item.value_json for item in history.item} == expected
+    assert {item.key: item.value_json for item in summary.update} == expected
+
+    # only numbers are sampled
+    sampled = dict(internal_hm._sampled_history.items())
+    assert sorted(sampled) == ["_step", "v1", "v4"]
+    assert sampled["v1"].get() == (1.5,)
@@ -0,0 +1,199 @@
+"""
+multipart upload tests.
+"""
+
+import hashlib
+import os
+import threading
+
+from six.moves import BaseHTTPServer
+from wandb.filesync import multipart
+from wandb.filesync.step_prepare import ResponsePrepare
+from wandb.sdk import wandb_artifacts
+from wandb.sdk.internal import internal_api
+
+
+class PartServer(object):
+    """Accepts part uploads, the first attempt of failing parts gets a 500."""
+
+    def __init__(self, fail_parts=()):
+        self.parts = {}
+        self.attempts = []
+        self.fail_parts = set(fail_parts)
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_PUT(self):  # noqa: N802
+                part_number = int(self.path.strip("/"))
+                data = self.rfile.read(int(self.headers["Content-Length"]))
+                server.attempts.append(part_number)
+                if part_number in server.fail_parts:
+                    server.fail_parts.remove(part_number)
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                server.parts[part_number] = data
+                self.send_response(200)
+                self.send_header("ETag", hashlib.md5(data).hexdigest())
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = BaseHTTPServer.HTTPServer(("localhost", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def url(self, part_number):
+        return "http://localhost:{}/{}".format(self._httpd.server_port, part_number)
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _write_file(path, size):
+    data = os.urandom(size)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data
+
+
+def test_part_size_for(monkeypatch):
+    assert multipart.part_size_for(10) == multipart.DEFAULT_PART_SIZE
+    assert multipart.part_size_for(10, 1) == multipart.MIN_PART_SIZE
+    big = multipart.MAX_PARTS * multipart.DEFAULT_PART_SIZE * 2
+    assert multipart.part_size_for(big) == 2 * multipart.DEFAULT_PART_SIZE
+    monkeypatch.setenv("WANDB_UPLOAD_PART_SIZE", str(8 * 1024 * 1024))
+    assert multipart.part_size_for(10) == 8 * 1024 * 1024
+
+
+def test_file_parts(test_dir):
+    data = _write_file("file.bin", 25)
+    parts = multipart.file_parts("file.bin", 10)
+    assert parts == [
+        {
+            "partNumber": i + 1,
+            "hexMD5": hashlib.md5(data[i * 10 : i * 10 + 10]).hexdigest(),
+        }
+        for i in range(3)
+    ]
+    _write_file("empty.bin", 0)
+    assert multipart.file_parts("empty.bin", 10) == []
+
+
+def test_file_part(test_dir):
+    data = _write_file("file.bin", 25)
+    with open("file.bin", "rb") as f:
+        part = multipart.FilePart(f, 10, 10)
+        assert len(part) == 10
+        assert part.read(4) == data[10:14]
+        assert part.tell() == 4
+        # reads stop at the end of the part
+        assert part.read(100) == data[14:20]
+        assert part.read() == b""
+        part.seek(0)
+        assert part.read() == data[10:20]
+
+
+def test_upload_parts_retry_and_resume(test_dir):
+    part_size = 1000
+    data = _write_file("file.bin", 4500)
+    parts = multipart.file_parts("file.bin", part_size)
+    server = PartServer(fail_parts=[3])
+    part_urls = {p["partNumber"]: server.url(p["partNumber"]) for p in parts}
+    api = internal_api.Api()
+
+    # a state file left over from an interrupted upload
+    state = multipart.UploadState("state.json", "upload-1", part_size)
+    state.add(1, hashlib.md5(data[:part_size]).hexdigest())
+    state = multipart.UploadState("state.json", "upload-1", part_size)
+    progress = []
+    completed = multipart.upload_parts(
+        api,
+        "file.bin",
+        parts,
+        part_urls,
+        part_size,
+        state,
+        progress_callback=lambda new, total: progress.append(total),
+    )
+    server.close()
+
+    # the part already uploaded is skipped and the failed part is retried
+    assert sorted(server.attempts) == [2, 3, 3, 4, 5]
+    assert b"".join(server.parts[n] for n in range(2, 6)) == data[part_size:]
+    assert completed == [
+        {
+            "partNumber": i + 1,
+            "hexMD5": hashlib.md5(data[i * 1000 : i * 1000 + 1000]).hexdigest(),
+        }
+        for i in range(5)
+    ]
+    assert progress[0] == part_size
+    assert progress[-1] == len(data)
+
+    # the state of another upload id is not reused
+    assert multipart.UploadState("state.json", "upload-2", part_size).etags == {}
+
+
+def test_store_file_multipart(test_dir, monkeypatch):
+    monkeypatch.setenv("WANDB_UPLOAD_PART_SIZE", "1")
+    monkeypatch.setattr(multipart, "MIN_PART_SIZE", 1000)
+    data = _write_file("file.bin", 2500)
+    server = PartServer()
+    completions = []
+
+    class FakeApi(object):
+        upload_multipart_file_chunk_retry = (
+            internal_api.Api().upload_multipart_file_chunk
+        )
+
+        def server_supports_multipart_upload(self):
+            return True
+
+        def complete_multipart_upload_artifact(self, *args):
+            completions.append(args)
+
+    class FakePreparer(object):
+        def prepare(self, prepare_fn):
+            spec = prepare_fn()
+            self.spec = spec
+            return ResponsePrepare(
+                upload_url=None,
+                upload_headers=[],
+                birth_artifact_id="art",
+                storage_path="path/to/file",
+                multipart_upload_urls={
+                    "uploadID": "upload-1",
+                    "uploadUrlParts": [
+                        {
+                            "partNumber": p["partNumber"],
+                            "uploadUrl": server.url(p["partNumber"]),
+                        }
+                        for p in spec["uploadPartsInput"]
+                    ],
+                },
+            )
+
+    policy = wandb_artifacts.WandbStoragePolicy()
+    policy._api = FakeApi()
+    entry = wandb_artifacts.ArtifactManifestEntry(
+        path="file.bin",
+        ref=None,
+        digest=wandb_artifacts.md5_file_b64("file.bin"),
+        size=len(data),
+        local_path="file.bin",
+    )
+    preparer = FakePreparer()
+    assert not policy.store_file("art", "manifest", entry, preparer)
+    server.close()
+
+    assert [p["partNumber"] for p in preparer.spec["uploadPartsInput"]] == [1, 2, 3]
+    assert b"".join(server.parts[n] for n in range(1, 4)) == data
+    ((artifact_id, storage_path, completed, upload_id),) = completions
+    assert (artifact_id, storage_path, upload_id) == ("art", "path/to/file", "upload-1")
+    assert [p["hexMD5"] for p in completed] == [
+        p["hexMD5"] for p in preparer.spec["uploadPartsInput"]
+    ]
@@ -10,9 +10,11 @@ import json
 import pytest
 import platform
 import requests
+import time
 
 import wandb
 from wandb import Api
+from wandb.apis import public
 from tests import utils
 
 
@@ -340,6 +342,29 @@ def test_runs_from_path_index(mock_server, api):
     assert len(runs.objects) == 4
 
 
+def test_runs_prefetch(mock_server, api):
+    mock_server.set_context("page_times", 4)
+    runs = api.runs("test/test").prefetch(depth=2)
+    assert [run.id for run in runs] == ["test"] * 4
+    assert len(runs.objects) == 4
+    assert len(runs) == 4
+    assert list(runs) == runs.objects
+
+
+def test_fan_out(mock_server, api):
+    runs = api.runs("test/test")
+    names = api.fan_out(lambda run: run.name, runs, max_workers=2)
+    assert names == [run.name for run in runs]
+
+
+def test_rate_limiter():
+    limiter = public.RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.08
+
+
 def test_projects(mock_server, api):
     projects = api.projects("test")
     # projects doesn't provide a length for now, so we iterate
@@ -544,6 +569,25 @@ def test_artifact_verify(runner, mock_server, api):
         art.verify()
 
 
+def test_artifact_verify_report(runner, mock_server, api):
+    with runner.isolated_filesystem():
+        art = api.artifact("entity/project/mnist:v0", type="dataset")
+        path = art.download()
+        with open(os.path.join(path, "bogus"), "w") as f:
+            f.write("not in the artifact")
+        with pytest.raises(ValueError) as e:
+            art.verify()
+        # every bad file is reported, not only the first one
+        assert "failed for 2 files" in str(e.value)
+        assert "bogus: not a member of artifact" in str(e.value)
+        assert "digits.h5: size mismatch" in str(e.value)
+
+        os.remove(os.path.join(path, "digits.h5"))
+        with pytest.raises(ValueError) as e:
+            art.verify(use_digest_cache=True)
+        assert "digits.h5: missing" in str(e.value)
+
+
 def test_artifact_save_norun(runner, mock_server, test_settings):
     test_folder = os.path.dirname(os.path.realpath(__file__))
     im_path = os.path.join(test_folder, "..", "assets", "2x2.png")
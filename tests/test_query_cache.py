@@ -0,0 +1,145 @@
+"""
+query cache tests.
+"""
+
+import time
+
+import pytest
+from wandb.apis import public
+from wandb.apis.query_cache import QueryCache
+from wandb_gql import gql
+
+RUN_QUERY = gql(
+    """
+query Run($name: String!) {
+    project(name: "test", entityName: "test") {
+        run(name: $name) { id state }
+    }
+}
+"""
+)
+
+UPDATE_MUTATION = gql(
+    """
+mutation UpsertBucket($id: String!) {
+    upsertBucket(input: {id: $id}) { bucket { id } }
+}
+"""
+)
+
+
+class CountingClient(object):
+    def __init__(self, state="running"):
+        self.state = state
+        self.calls = 0
+
+    def execute(self, document, variable_values=None):
+        self.calls += 1
+        return {"project": {"run": {"id": "storage-id", "state": self.state}}}
+
+
+@pytest.fixture
+def query_cache(tmp_path):
+    yield QueryCache(path=str(tmp_path / "queries.db"))
+
+
+def test_query_cache_ttl(query_cache, monkeypatch):
+    query_cache.set("mutable", {"a": 1})
+    query_cache.set("immutable", {"b": 2}, entity_id="id")
+    assert query_cache.get("mutable") == {"a": 1}
+    assert query_cache.get("immutable") == {"b": 2}
+    assert query_cache.get("missing") is None
+
+    now = time.time() + query_cache.ttl + 1
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert query_cache.get("mutable") is None
+    assert query_cache.get("immutable") == {"b": 2}
+
+
+def test_query_cache_invalidate(query_cache):
+    query_cache.set("mutable", 1)
+    query_cache.set("immutable", 2, entity_id="id")
+    query_cache.set("other", 3, entity_id="other-id")
+    query_cache.invalidate(["id"])
+    assert query_cache.get("mutable") is None
+    assert query_cache.get("immutable") is None
+    assert query_cache.get("other") == 3
+
+
+def test_query_cache_evicts_least_recently_used(tmp_path):
+    query_cache = QueryCache(path=str(tmp_path / "queries.db"), max_size=250)
+    query_cache.TOUCH_SECONDS = 0
+    query_cache.EVICT_BATCH = 1
+    for i in range(3):
+        query_cache.set(str(i), "x" * 100, entity_id="id")
+        time.sleep(0.01)
+    assert query_cache.get("0") is None
+    assert query_cache.get("1") is not None
+    assert query_cache.get("2") is not None
+
+
+def test_query_cache_size(query_cache):
+    def total():
+        (size,) = query_cache._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return size
+
+    query_cache.set("a", "x" * 10)
+    query_cache.set("b", "x" * 20, entity_id="id")
+    query_cache.set("a", "x" * 30)
+    assert query_cache._size() == total() == 32 + 22
+    query_cache.invalidate(["id"])
+    assert query_cache._size() == total() == 0
+    query_cache.set("c", "x")
+    query_cache.clear()
+    assert query_cache._size() == total() == 0
+
+
+def test_query_cache_keys(query_cache):
+    other = QueryCache(path=query_cache._path, namespace="other user")
+    assert query_cache.key("query", {"a": 1, "b": 2}) == query_cache.key(
+        "query", {"b": 2, "a": 1}
+    )
+    assert query_cache.key("query", {"a": 1}) != query_cache.key("query", {"a": 2})
+    assert query_cache.key("query", {"a": 1}) != other.key("query", {"a": 1})
+
+
+@pytest.mark.parametrize(
+    "state,ttl,calls", [("finished", 0, 1), ("running", 0, 2), ("running", 60, 1)]
+)
+def test_retrying_client_cache(query_cache, state, ttl, calls):
+    query_cache.ttl = ttl
+    client = CountingClient(state)
+    retrying_client = public.RetryingClient(client, cache=query_cache)
+    for _ in range(2):
+        response = retrying_client.execute(
+            RUN_QUERY,
+            variable_values={"name": "test"},
+            immutable_id=public.Run._finished_run_id,
+        )
+        assert response["project"]["run"]["state"] == state
+    assert client.calls == calls
+
+
+def test_retrying_client_mutation_invalidates(query_cache):
+    client = CountingClient("finished")
+    retrying_client = public.RetryingClient(client, cache=query_cache)
+    retrying_client.execute(
+        RUN_QUERY,
+        variable_values={"name": "test"},
+        immutable_id=public.Run._finished_run_id,
+    )
+    for _ in range(2):
+        retrying_client.execute(UPDATE_MUTATION, variable_values={"id": "storage-id"})
+    assert client.calls == 3
+    retrying_client.execute(RUN_QUERY, variable_values={"name": "test"})
+    assert client.calls == 4
+
+
+def test_api_cache(mock_server, runner, tmp_path):
+    api = public.Api(cache=QueryCache(path=str(tmp_path / "queries.db")))
+    assert api.run("test/test/test").state == "running"
+    assert api.client.cache.namespace.startswith(api.settings["base_url"])
+    runs = api.runs("test/test")
+    assert len(runs) == len(api.runs("test/test"))
@@ -0,0 +1,85 @@
+"""
+sock client tests.
+"""
+
+import socket
+import struct
+import threading
+
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.proto import wandb_server_pb2 as spb
+from wandb.sdk.lib.sock_client import SockClient
+
+
+def _make_request(size):
+    record = pb.Record()
+    record.output.line = "x" * size
+    sreq = spb.ServerRequest()
+    sreq.record_publish.CopyFrom(record)
+    return sreq
+
+
+def _client_pair():
+    s1, s2 = socket.socketpair()
+    writer = SockClient()
+    writer.set_socket(s1)
+    reader = SockClient()
+    reader.set_socket(s2)
+    return writer, reader
+
+
+def test_sock_client_small_and_large():
+    writer, reader = _client_pair()
+    large = 5 * 1024 * 1024
+    sizes = [0, 10, large, 100, 70 * 1024, 1, large]
+    sender = threading.Thread(
+        target=lambda: [writer.send_server_request(_make_request(n)) for n in sizes]
+    )
+    sender.start()
+    for n in sizes:
+        sreq = reader.read_server_request()
+        assert len(sreq.record_publish.output.line) == n
+    sender.join()
+    # the buffer is released once the last, large, record was drained
+    assert len(reader._buffer) == SockClient.INITIAL_BUFFER_SIZE
+    writer.close()
+    reader.close()
+
+
+def test_sock_client_fragmented_header():
+    writer, reader = _client_pair()
+    data = _make_request(20).SerializeToString()
+    raw = struct.pack("<BI", ord("W"), len(data)) + data
+    # fill the receive buffer so the next header straddles its end
+    reader._buffer_start = reader._buffer_end = len(reader._buffer) - 2
+    writer._sock.sendall(raw[:3])
+    writer._sock.sendall(raw[3:])
+    sreq = reader.read_server_request()
+    assert sreq.record_publish.output.line == "x" * 20
+    writer.close()
+    reader.close()
+
+
+class PartialSocket(object):
+    """Socket that sends at most a few bytes per sendmsg call"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.sent = bytearray()
+
+    def sendmsg(self, buffers):
+        sent = 0
+        for buf in buffers:
+            chunk = bytes(buf[: self.max_bytes - sent])
+            self.sent += chunk
+            sent += len(chunk)
+            if sent == self.max_bytes:
+                break
+        return sent
+
+
+def test_sock_client_partial_sendmsg():
+    client = SockClient()
+    client.set_socket(PartialSocket(3))
+    client._sendall_with_header(b"head", b"payload")
+    assert client._sock.sent == b"headpayload"
@@ -0,0 +1,73 @@
+"""
+step checksum tests.
+"""
+
+import os
+import queue
+import tempfile
+
+import wandb
+from wandb.filesync import stats
+from wandb.filesync import step_checksum
+from wandb.filesync import step_upload
+
+
+def test_copy_and_md5(test_dir):
+    with open("src.bin", "wb") as f:
+        f.write(os.urandom(3 * step_checksum.CHUNK_SIZE + 17))
+    digest = step_checksum.copy_and_md5("src.bin", "dst.bin")
+    assert digest == wandb.util.md5_file("src.bin")
+    with open("src.bin", "rb") as f1, open("dst.bin", "rb") as f2:
+        assert f1.read() == f2.read()
+    assert step_checksum.copy_and_md5("src.bin") == digest
+
+
+class CountingStats(stats.Stats):
+    def __init__(self):
+        super(CountingStats, self).__init__()
+        self.init_calls = 0
+
+    def init_file(self, *args, **kwargs):
+        self.init_calls += 1
+        super(CountingStats, self).init_file(*args, **kwargs)
+
+
+def test_step_checksum_parallel(test_dir):
+    tempdir = tempfile.TemporaryDirectory("wandb")
+    request_q = queue.Queue()
+    output_q = queue.Queue()
+    file_stats = CountingStats()
+    step = step_checksum.StepChecksum(None, tempdir, request_q, output_q, file_stats)
+    step.start()
+
+    names = ["file{}.bin".format(i) for i in range(20)]
+    for name in names:
+        with open(name, "wb") as f:
+            f.write(os.urandom(100000))
+        request_q.put(
+            step_checksum.RequestUpload(name, name, "art", True, True, None, None)
+        )
+    request_q.put(step_checksum.RequestCommitArtifact("art", True, None, None))
+    # a second version of a file is not passed on before the first one
+    with open(names[0], "wb") as f:
+        f.write(b"version 2")
+    request_q.put(
+        step_checksum.RequestUpload(names[0], names[0], None, True, True, None, None)
+    )
+    step.finish()
+    step._thread.join()
+
+    events = []
+    while not output_q.empty():
+        events.append(output_q.get())
+    assert isinstance(events[-1], step_upload.RequestFinish)
+    assert isinstance(events[-3], step_upload.RequestCommitArtifact)
+    uploads = events[:-3]
+    assert sorted(e.save_name for e in uploads) == sorted(names)
+    for event in uploads:
+        assert event.md5 == wandb.util.md5_file(event.path)
+    assert events[-2].save_name == names[0]
+    assert events[-2].md5 == wandb.util.md5_file(names[0])
+    # files are reported to the stats once
+    assert file_stats.init_calls == len(names) + 1
+    tempdir.cleanup()
@@ -0,0 +1,85 @@
+"""
+sync tests.
+"""
+
+import json
+import os
+
+import wandb
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.internal import datastore
+from wandb.sync import sync
+
+from .utils import first_filestream
+
+
+def _write_run(fname, steps):
+    wandb._set_internal_process()
+    ds = datastore.DataStore()
+    ds.open_for_write(fname)
+    record = pb.Record()
+    record.run.run_id = "test"
+    record.run.project = "test"
+    ds.write(record)
+    for step in range(steps):
+        record = pb.Record()
+        item = record.history.item.add()
+        item.key = "_step"
+        item.value_json = json.dumps(step)
+        ds.write(record)
+    ds.close()
+
+
+def _sync_thread():
+    return sync.SyncThread(sync_list=[], app_url="https://app.wandb.test")
+
+
+def test_sync_state_counts():
+    state = sync._SyncState("state")
+    record = pb.Record()
+    record.output.line = "partial"
+    assert state.count(record) == 0
+    record.output.line = " line\n"
+    assert state.count(record) == 0
+    assert state.count(record) == 1
+    assert state.counts == {"history": 0, "stats": 0, "output": 2}
+
+
+def test_sync_state_saved(runner, live_mock_server, test_dir, monkeypatch):
+    monkeypatch.setattr(sync, "SYNC_STATE_RECORDS", 5)
+    saved = []
+    monkeypatch.setattr(
+        sync._SyncState, "remove", lambda self: saved.append(json.load(open(self.path)))
+    )
+    _write_run("run-test.wandb", 12)
+    result = _sync_thread().sync(os.path.abspath("run-test.wandb"))
+    assert result.error is None
+    assert result.records == 13
+    assert saved == [{"history": 9, "stats": 0, "output": 0}]
+
+
+def test_sync_resume(runner, live_mock_server, test_dir):
+    # the server has 15 history lines of the run, more than the last saved
+    # state: the records sent after it was saved are not sent again
+    live_mock_server.set_ctx({"resume": True})
+    _write_run("run-test.wandb", 20)
+    with open("run-test.wandb" + sync.SYNC_STATE_SUFFIX, "w") as f:
+        json.dump({"history": 10}, f)
+
+    result = _sync_thread().sync(os.path.abspath("run-test.wandb"))
+    assert result.error is None
+    assert result.skipped == 15
+    assert result.records == 6
+    assert not os.path.exists("run-test.wandb" + sync.SYNC_STATE_SUFFIX)
+    history = first_filestream(live_mock_server.get_ctx())["files"][
+        "wandb-history.jsonl"
+    ]
+    assert history["offset"] == 15
+    assert json.loads(history["content"][0])["_step"] == 15
+
+
+def test_sync_error(test_dir):
+    with open("run-test.wandb", "w") as f:
+        f.write("not a run")
+    result = _sync_thread().sync(os.path.abspath("run-test.wandb"))
+    assert result.error
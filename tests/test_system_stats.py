@@ -0,0 +1,66 @@
+"""
+system stats tests.
+"""
+
+import time
+
+from wandb.sdk.internal import stats
+
+
+class CountingCollector(stats.Collector):
+    def __init__(self, name, interval):
+        super(CountingCollector, self).__init__(interval)
+        self.name = name
+        self.count = 0
+
+    def sample(self):
+        self.count += 1
+        return {self.name: self.count, self.name + ".dict": {"count": self.count}}
+
+
+def test_system_stats_collector_rates(fake_interface, test_settings):
+    test_settings.update(system_sample_seconds=1, system_sample=2)
+    fast = CountingCollector("fast", 0.1)
+    slow = CountingCollector("slow", 10)
+    system_stats = stats.SystemStats(
+        pid=1000,
+        interface=fake_interface,
+        settings=test_settings,
+        collectors=[fast, slow],
+    )
+    system_stats.start()
+    time.sleep(1)
+    system_stats.shutdown()
+
+    assert slow.count == 1
+    assert 5 <= fast.count <= 11
+    records = list(fake_interface.record_q.queue)
+    assert len(records) == 1
+    published = {item.key: item.value_json for item in records[0].stats.item}
+    # numbers are averaged, other stats are published as last sampled
+    assert float(published["fast"]) == round(
+        sum(range(1, fast.count + 1)) / fast.count, 2
+    )
+    assert published["fast.dict"] == '{"count": %d}' % fast.count
+    assert float(published["slow"]) == 1
+    assert float(published["proc.stats.samplerPercent"]) >= 0
+
+
+def test_system_stats_rates_setting(fake_interface, test_settings):
+    test_settings.update(_stats_sample_rates="gpu=5, disk=60")
+    assert test_settings._stats_sample_rates == {"gpu": 5.0, "disk": 60.0}
+    system_stats = stats.SystemStats(
+        pid=1000, interface=fake_interface, settings=test_settings
+    )
+    rates = {c.name: c.interval for c in system_stats.collectors}
+    assert rates["disk"] == 60
+    assert rates["cpu"] == system_stats.sample_rate_seconds == 2
+
+
+def test_process_tree_refresh(monkeypatch):
+    calls = []
+    monkeypatch.setattr(stats, "_our_pids", lambda: calls.append(1) or {1, 2})
+    tree = stats.ProcessTree(1000, refresh_seconds=60)
+    assert tree.pids() == {1, 2}
+    assert tree.pids() == {1, 2}
+    assert len(calls) == 1
@@ -247,3 +247,125 @@ def test_datetime_conversion():
         [975628800000, 975628800000, 975628800000, 1],
         [975715200000, 975715200000, 975715200000, 2],
     ]
+
+
+class _LocalEntry(object):
+    def __init__(self, path):
+        self.path = path
+
+    def download(self):
+        return self.path
+
+
+class _LocalSource(object):
+    """Reads back the files added to a local artifact"""
+
+    def __init__(self, artifact):
+        self.artifact = artifact
+
+    def get_path(self, name):
+        return _LocalEntry(self.artifact.manifest.entries[name].local_path)
+
+
+def _make_parquet_table(n, artifact_format="parquet"):
+    table = wandb.Table(
+        columns=["id", "num", "str", "dict", "opt", "arr", "emb"],
+        artifact_format=artifact_format,
+    )
+    for i in range(n):
+        table.add_data(
+            str(i),
+            i / 2,
+            "s%d" % i,
+            {"a": [i]},
+            None if i % 2 else i,
+            np.ones((2, 2)) * i,
+            np.arange(3) * i,
+        )
+    return table
+
+
+def test_table_parquet_roundtrip(monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(wandb.Table, "_PARQUET_ROW_GROUP_SIZE", 3)
+    art = wandb.Artifact("A", "B")
+    table = _make_parquet_table(7)
+    json_obj = table.to_json(art)
+    assert "data" not in json_obj
+    assert json_obj["nrows"] == 7
+    assert json_obj["data_file"]["json_columns"] == [3, 6]
+
+    loaded = wandb.Table.from_json(json_obj, _LocalSource(art))
+    assert loaded.artifact_format == "parquet"
+    assert loaded._column_types == table._column_types
+    for row, loaded_row in zip(table.data, loaded.data):
+        assert loaded_row[:5] == row[:5]
+        assert np.all(loaded_row[5] == row[5])
+        assert loaded_row[6] == list(row[6])
+
+    # the same types are loaded back from both formats
+    json_art = wandb.Artifact("A", "B")
+    json_table = _make_parquet_table(7, artifact_format="json")
+    json_loaded = wandb.Table.from_json(
+        json_table.to_json(json_art), _LocalSource(json_art)
+    )
+    assert json_loaded._column_types == loaded._column_types
+
+
+def test_table_parquet_numeric_columns():
+    pytest.importorskip("pyarrow")
+    art = wandb.Artifact("A", "B")
+    data = np.random.rand(10, 2)
+    table = wandb.Table(columns=["a", "b"], data=data, artifact_format="parquet")
+    loaded = wandb.Table.from_json(table.to_json(art), _LocalSource(art))
+    assert loaded._column_types == table._column_types
+    assert np.all(loaded.get_column("a", convert_to="numpy") == data[:, 0])
+
+    art = wandb.Artifact("A", "B")
+    empty = wandb.Table(columns=["a"], artifact_format="parquet")
+    loaded = wandb.Table.from_json(empty.to_json(art), _LocalSource(art))
+    assert loaded.data == [] and loaded.columns == ["a"]
+
+
+def test_table_parquet_mixed_numbers():
+    pytest.importorskip("pyarrow")
+    columns = ["mixed", "floats"]
+    data = [[1, 1.0], [2.5, 2.5], [None, None]]
+    art = wandb.Artifact("A", "B")
+    table = wandb.Table(columns=columns, data=data, artifact_format="parquet")
+    json_obj = table.to_json(art)
+    assert json_obj["data_file"]["json_columns"] == [0]
+    loaded = wandb.Table.from_json(json_obj, _LocalSource(art))
+    # ints and floats are loaded back like from the json format
+    json_art = wandb.Artifact("A", "B")
+    json_table = wandb.Table(columns=columns, data=data)
+    json_loaded = wandb.Table.from_json(
+        json_table.to_json(json_art), _LocalSource(json_art)
+    )
+    assert loaded.data == json_loaded.data == data
+    assert isinstance(loaded.data[0][0], int)
+
+
+def test_partitioned_table_parquet_parts(monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(wandb.Table, "_PARQUET_ROW_GROUP_SIZE", 2)
+    art = wandb.Artifact("A", "B")
+    source = _LocalSource(art)
+    parts = [
+        _make_parquet_table(3),
+        _make_parquet_table(4),
+        _make_parquet_table(2, artifact_format="json"),
+    ]
+    entries = [art.add(part, "parts/%d" % ndx) for ndx, part in enumerate(parts)]
+    partition_table = wandb.data_types.PartitionedTable("parts")
+    for entry in entries:
+        partition_table._add_part_entry(entry, source)
+    rows = [row for _, row in partition_table.iterrows()]
+    assert [row[0] for row in rows] == ["0", "1", "2", "0", "1", "2", "3", "0", "1"]
+    assert rows[4][3] == {"a": [1]}
+    assert rows[8][3] == {"a": [1]}
+
+
+def test_table_artifact_format_invalid():
+    with pytest.raises(ValueError):
+        wandb.Table(columns=["a"], artifact_format="csv")
@@ -0,0 +1,89 @@
+"""
+writer tests.
+"""
+
+import os
+import queue
+
+import pytest
+import wandb
+from wandb.proto import wandb_internal_pb2 as pb
+from wandb.sdk.internal import writer
+from wandb.sdk.internal.settings_static import SettingsStatic
+
+
+def _history_record(step):
+    record = pb.Record()
+    item = record.history.item.add()
+    item.key = "step"
+    item.value_json = str(step)
+    return record
+
+
+@pytest.fixture
+def write_manager(test_dir, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr(os, "fsync", lambda fd: fsyncs.append(fd))
+    wandb._set_internal_process()
+
+    def fn(durability, fsync_seconds=5):
+        settings = SettingsStatic(
+            dict(
+                sync_file="run.wandb",
+                _sync_file_compression="none",
+                _sync_file_durability=durability,
+                _sync_file_fsync_seconds=fsync_seconds,
+            )
+        )
+        writer_q = queue.Queue()
+        wm = writer.WriteManager(
+            settings=settings, record_q=None, result_q=None, writer_q=writer_q,
+        )
+        return wm, writer_q, fsyncs
+
+    yield fn
+
+
+@pytest.mark.parametrize("durability,expected", [("none", 0), ("flush", 1)])
+def test_write_manager_flush_request(write_manager, durability, expected):
+    wm, _, fsyncs = write_manager(durability)
+    wm.write(_history_record(0))
+    assert os.stat("run.wandb").st_size == 7
+    record = pb.Record()
+    record.request.defer.state = pb.DeferRequest.FLUSH_FS
+    wm.write(record)
+    # flush requests commit the buffered records
+    assert os.stat("run.wandb").st_size == wm._ds._index
+    assert len(fsyncs) == expected
+    wm.finish()
+    assert len(fsyncs) == expected
+
+
+@pytest.mark.parametrize("fsync_seconds,expected", [(0, 1), (60, 0)])
+def test_write_manager_periodic(write_manager, fsync_seconds, expected):
+    wm, _, fsyncs = write_manager("periodic", fsync_seconds)
+    wm.write(_history_record(0))
+    wm.debounce()
+    assert os.stat("run.wandb").st_size == wm._ds._index
+    assert len(fsyncs) == expected
+    # nothing written since the last fsync
+    wm.debounce()
+    assert len(fsyncs) == expected
+    wm.finish()
+    assert len(fsyncs) == 1
+
+
+def test_write_manager_stats(write_manager):
+    wm, writer_q, _ = write_manager("none")
+    for step in range(3):
+        writer_q.put(_history_record(step))
+    while len(wm):
+        wm.write(writer_q.get())
+    wm.commit()
+    stats = wm.stats()
+    assert stats["records"] == 3
+    assert stats["queue_depth_max"] == 2
+    assert stats["queue_depth"] == 0
+    assert stats["commits"] == 1
+    assert stats["write_seconds_max"] <= stats["write_seconds"]
+    wm.finish()
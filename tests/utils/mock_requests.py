@@ -1,3 +1,4 @@
+import gzip
 import json
 import requests
 import threading
@@ -163,9 +164,18 @@ class RequestsMock(object):
                     raise requests.exceptions.RetryError()
                 raise requests.exceptions.ConnectionError()
 
+    def _json_body(self, kwargs):
+        headers = kwargs.get("headers") or {}
+        if "json" in kwargs or headers.get("Content-Type") != "application/json":
+            return kwargs.get("json")
+        data = kwargs["data"]
+        if headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return json.loads(data)
+
     def post(self, url, **kwargs):
         self._inject("post", url, kwargs)
-        self._store_request(url, kwargs.get("json"))
+        self._store_request(url, self._json_body(kwargs))
         return ResponseMock(self.client.post(url, **self._clean_kwargs(kwargs)))
 
     def put(self, url, **kwargs):
@@ -1917,9 +1917,12 @@ index 30d74d2..9a2c773 100644
     def file_stream(entity, project, run):
         ctx = get_ctx()
         run_ctx = get_run_ctx(run)
+        data = request.get_data()
+        if request.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
         for c in ctx, run_ctx:
             c["file_stream"] = c.get("file_stream", [])
-            c["file_stream"].append(request.get_json())
+            c["file_stream"].append(json.loads(data))
         response = json.dumps({"exitcode": None, "limits": {}})
 
         inject = InjectRequestsParse(ctx).find(request=request)
@@ -1929,7 +1932,7 @@ index 30d74d2..9a2c773 100644
             if inject.http_status:
                 # print("INJECT", inject, inject.http_status)
                 raise HttpException("some error", status_code=inject.http_status)
-        return response
+        return response, 200, {"Accept-Encoding": "gzip"}
 
     @app.route("/api/v1/namespaces/default/pods/test")
     def k8s_pod():
@@ -118,3 +118,153 @@ def test_artifacts_cache_cleanup_tmp_files(runner):
         reclaimed_bytes = cache.cleanup(10000)
 
         assert reclaimed_bytes == 1000
+
+
+def _write_old_file(path, contents):
+    with open(path, "w") as f:
+        f.write(contents)
+    # files modified just now are not cached
+    mtime = time.time() - 60
+    os.utime(path, (mtime, mtime))
+
+
+def _digest_writer(args):
+    cache_path, path = args
+    cache = wandb_sdk.wandb_artifacts.ArtifactsCache(cache_path)
+    digest = cache.md5_file_b64(path)
+    cache.flush_digests()
+    return digest
+
+
+def test_digest_cache(runner, monkeypatch):
+    with runner.isolated_filesystem():
+        _write_old_file("file.txt", "hello")
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+        expected = wandb_sdk.wandb_artifacts.md5_file_b64("file.txt")
+        assert cache.md5_file_b64("file.txt") == expected
+        cache.flush_digests()
+
+        # a new cache reuses the digest without reading the file
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+        monkeypatch.setattr(
+            wandb_sdk.interface.artifacts, "md5_file_b64", lambda path: "hashed"
+        )
+        assert cache.md5_file_b64("file.txt") == expected
+
+        # a changed file is hashed again
+        _write_old_file("file.txt", "hello world")
+        assert cache.md5_file_b64("file.txt") == "hashed"
+
+        # recently modified files are not cached
+        with open("new.txt", "w") as f:
+            f.write("new")
+        assert cache.md5_file_b64("new.txt") == "hashed"
+        cache.flush_digests()
+        assert cache._digest_cache._get(os.path.abspath("new.txt")) is None
+
+        # the digest database is not reclaimed as a cached object
+        assert cache.cleanup(0) == 0
+        assert os.path.exists(os.path.join("cache", "digests.db"))
+
+
+def test_digest_cache_eviction(runner):
+    with runner.isolated_filesystem():
+        digest_cache = wandb_sdk.interface.artifacts.DigestCache(
+            "digests.db", max_entries=3
+        )
+        digest_cache._FLUSH_ROWS = 1
+        for i in range(5):
+            _write_old_file("file%d.txt" % i, str(i))
+            digest_cache.md5_file_b64("file%d.txt" % i)
+            time.sleep(0.01)
+        digest_cache.flush()
+        cached = [
+            i
+            for i in range(5)
+            if digest_cache._get(os.path.abspath("file%d.txt" % i)) is not None
+        ]
+        assert cached == [2, 3, 4]
+
+
+def test_digest_cache_parallel(runner):
+    with runner.isolated_filesystem() as t:
+        cache = os.path.join(t, "cache")
+        paths = []
+        for i in range(10):
+            paths.append(os.path.join(t, "file%d.txt" % i))
+            _write_old_file(paths[-1], str(i))
+
+        p = Pool(5)
+        digests = p.map(_digest_writer, [(cache, path) for path in paths])
+        p.close()
+        p.join()
+
+        assert digests == [
+            wandb_sdk.wandb_artifacts.md5_file_b64(path) for path in paths
+        ]
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache(cache)
+        for path in paths:
+            assert cache._digest_cache._get(path) is not None
+
+
+def _cache_object(cache, etag, size):
+    path, _, opener = cache.check_etag_obj_path(etag, size)
+    with opener() as f:
+        f.write("x" * size)
+    return path
+
+
+def test_artifacts_cache_cleanup_index(runner):
+    with runner.isolated_filesystem():
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+        path_1 = _cache_object(cache, "aardvark", 5000)
+        path_2 = _cache_object(cache, "absolute", 2000)
+        _cache_object(cache, "accelerate", 1000)
+        # new objects are written to the index in batches
+        assert len(cache._index._pending) == 3
+        # hits count as accesses, regardless of atime
+        time.sleep(0.01)
+        assert cache.check_etag_obj_path("aardvark", 5000)[1]
+        cache._index.flush()
+        assert cache._index.total_size() == 8000
+
+        # objects are evicted through the index, without a walk
+        with open(os.path.join("cache", "obj", "etag", "ab", "tmp_abc"), "w") as f:
+            f.truncate(100)
+        assert cache.cleanup(6500) == 2000
+        assert not os.path.exists(path_2)
+        assert os.path.exists(path_1)
+        assert cache._index.total_size() == 6000
+
+        # a rescan reclaims tmp files and picks up unknown objects
+        os.makedirs(os.path.join("cache", "obj", "md5", "aa"))
+        with open(os.path.join("cache", "obj", "md5", "aa", "bb"), "w") as f:
+            f.truncate(500)
+        assert cache.cleanup(10000, rescan=True) == 100
+        assert cache._index.total_size() == 6500
+
+
+def test_artifacts_cache_max_size(runner):
+    with runner.isolated_filesystem():
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache", max_size=2500)
+        paths = []
+        for i in range(3):
+            paths.append(_cache_object(cache, "etag%d" % i, 1000))
+            time.sleep(0.01)
+        for _ in range(100):
+            if not os.path.exists(paths[0]):
+                break
+            time.sleep(0.05)
+        # the oldest object is evicted in the background
+        assert not os.path.exists(paths[0])
+        assert os.path.exists(paths[1]) and os.path.exists(paths[2])
+        assert cache._index.total_size() == 2000
+
+
+def test_artifacts_cache_index_flushed_at_exit(runner):
+    with runner.isolated_filesystem():
+        cache = wandb_sdk.wandb_artifacts.ArtifactsCache("cache")
+        _cache_object(cache, "aardvark", 1000)
+        wandb_sdk.interface.artifacts._flush_cache_indexes()
+        assert not cache._index._pending
+        assert cache._index.total_size() == 1000
@@ -0,0 +1,215 @@
+"""Bulk export of run history as Arrow record batches.
+
+The history file of a run is streamed in large chunks and every chunk of
+complete lines is parsed at once by the pyarrow json reader.  The column types
+come from the historyKeys of the run, scalar columns are parsed by pyarrow
+while nested values (media, histograms, ...) are kept as JSON text.
+"""
+
+import io
+import json
+import numbers
+
+import requests
+from wandb import util
+
+# bytes read from the history file at a time, one record batch per chunk
+CHUNK_SIZE = 16 * 1024 * 1024
+
+_PYARROW_REQUIRED = (
+    "Exporting history requires pyarrow, install with `pip install pyarrow`"
+)
+
+
+def _pyarrow():
+    pa = util.get_module("pyarrow", required=_PYARROW_REQUIRED)
+    util.get_module("pyarrow.json", required=_PYARROW_REQUIRED)
+    return pa
+
+
+def _value_type(value):
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, numbers.Number):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "object"
+
+
+def history_schema(history_keys=None, rows=None, keys=None):
+    """Return the Arrow schema of the history and the names of its JSON columns.
+
+    Arguments:
+        history_keys: historyKeys of the run, with the types of every key
+        rows: history rows to infer the types from when there are no
+            historyKeys
+        keys: only include these keys, in this order
+    """
+    pa = _pyarrow()
+    types = {}
+    if history_keys and history_keys.get("keys"):
+        for key, info in history_keys["keys"].items():
+            types[key] = {t["type"] for t in info.get("typeCounts", [])}
+    else:
+        for row in rows or []:
+            for key, value in row.items():
+                types.setdefault(key, set()).add(_value_type(value))
+    if keys is None:
+        keys = sorted(types)
+
+    fields = []
+    json_columns = set()
+    for key in keys:
+        key_types = types.get(key, set()) - {"nil"}
+        if key == "_step" and key_types <= {"number"}:
+            arrow_type = pa.int64()
+        elif key_types == {"number"}:
+            arrow_type = pa.float64()
+        elif key_types == {"boolean"}:
+            arrow_type = pa.bool_()
+        elif key_types <= {"string"}:
+            arrow_type = pa.string()
+        else:
+            # media, nested dicts and columns with mixed types
+            arrow_type = pa.string()
+            json_columns.add(key)
+        fields.append(pa.field(key, arrow_type))
+    return pa.schema(fields), json_columns
+
+
+class HistoryParser(object):
+    """Parses blocks of history lines into record batches of one schema."""
+
+    def __init__(self, schema, json_columns=()):
+        self._pa = _pyarrow()
+        self._pa_json = util.get_module("pyarrow.json")
+        self.schema = schema
+        self._json_columns = set(json_columns)
+        self._scalar_schema = self._pa.schema(
+            [f for f in schema if f.name not in self._json_columns]
+        )
+
+    def parse(self, block):
+        """Return a record batch with one row per line of a block of bytes."""
+        block = block.strip()
+        if not block:
+            return self._pa.RecordBatch.from_pylist([], schema=self.schema)
+        try:
+            return self._parse_vectorized(block)
+        except self._pa.ArrowInvalid:
+            # NaN/Infinity are not valid JSON, and historyKeys can be out
+            # of date, these blocks are parsed row by row
+            return self._parse_rows(block)
+
+    def _parse_vectorized(self, block):
+        pa = self._pa
+        # unknown keys are skipped by the parser, which also projects the keys
+        table = self._pa_json.read_json(
+            io.BytesIO(block),
+            read_options=self._pa_json.ReadOptions(block_size=len(block) + 1),
+            parse_options=self._pa_json.ParseOptions(
+                explicit_schema=self._scalar_schema, unexpected_field_behavior="ignore",
+            ),
+        )
+        json_values = {}
+        if self._json_columns:
+            rows = [json.loads(line) for line in block.splitlines() if line.strip()]
+            if len(rows) != table.num_rows:
+                raise pa.ArrowInvalid("row count mismatch")
+            json_values = self._json_arrays(rows)
+        arrays = []
+        for field in self.schema:
+            if field.name in self._json_columns:
+                arrays.append(json_values[field.name])
+            else:
+                arrays.append(table.column(field.name).combine_chunks())
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def _json_arrays(self, rows):
+        return {
+            key: self._pa.array(
+                [
+                    json.dumps(row[key]) if row.get(key) is not None else None
+                    for row in rows
+                ],
+                type=self._pa.string(),
+            )
+            for key in self._json_columns
+        }
+
+    def _parse_rows(self, block):
+        pa = self._pa
+        rows = [json.loads(line) for line in block.splitlines() if line.strip()]
+        json_values = self._json_arrays(rows)
+        arrays = []
+        for field in self.schema:
+            if field.name in self._json_columns:
+                arrays.append(json_values[field.name])
+                continue
+            values = [row.get(field.name) for row in rows]
+            arrays.append(
+                pa.array(
+                    [v if _value_fits(v, field.type, pa) else None for v in values],
+                    type=field.type,
+                )
+            )
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def _value_fits(value, arrow_type, pa):
+    if value is None:
+        return False
+    if pa.types.is_boolean(arrow_type):
+        return isinstance(value, bool)
+    if pa.types.is_integer(arrow_type):
+        return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+    if pa.types.is_floating(arrow_type):
+        return isinstance(value, numbers.Real) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def iter_blocks(chunks):
+    """Regroup chunks of bytes into blocks of complete lines."""
+    remainder = b""
+    for chunk in chunks:
+        data = remainder + chunk
+        end = data.rfind(b"\n")
+        if end == -1:
+            remainder = data
+            continue
+        remainder = data[end + 1 :]
+        yield data[: end + 1]
+    if remainder.strip():
+        yield remainder
+
+
+def iter_record_batches(
+    url, api_key, history_keys=None, keys=None, chunk_size=CHUNK_SIZE
+):
+    """Stream a history file and yield its rows as Arrow record batches.
+
+    Arguments:
+        url: url of the history file of a run
+        api_key: api key to download the file with
+        history_keys: historyKeys of the run, the types of the keys are
+            inferred from the first block if it is missing
+        keys: only export these keys
+        chunk_size: bytes to read and parse at a time
+    """
+    response = requests.get(url, auth=("api", api_key), stream=True, timeout=30)
+    response.raise_for_status()
+    parser = None
+    try:
+        for block in iter_blocks(response.iter_content(chunk_size=chunk_size)):
+            if parser is None:
+                rows = None
+                if not history_keys or not history_keys.get("keys"):
+                    lines = block.splitlines()[:1000]
+                    rows = [json.loads(line) for line in lines if line.strip()]
+                parser = HistoryParser(*history_schema(history_keys, rows, keys))
+            yield parser.parse(block)
+    finally:
+        response.close()
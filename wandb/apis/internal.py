@@ -137,6 +137,15 @@ class Api(object):
     def upload_file_retry(self, *args, **kwargs):
         return self.api.upload_file_retry(*args, **kwargs)
 
+    def upload_multipart_file_chunk_retry(self, *args, **kwargs):
+        return self.api.upload_multipart_file_chunk_retry(*args, **kwargs)
+
+    def complete_multipart_upload_artifact(self, *args, **kwargs):
+        return self.api.complete_multipart_upload_artifact(*args, **kwargs)
+
+    def server_supports_multipart_upload(self):
+        return self.api.server_supports_multipart_upload()
+
     def get_run_info(self, *args, **kwargs):
         return self.api.get_run_info(*args, **kwargs)
 
@@ -10,7 +10,8 @@ You might use the Public API to
 
 For more on using the Public API, check out [our guide](https://docs.wandb.com/guides/track/public-api-guide).
 """
-from collections import namedtuple
+from collections import deque, namedtuple
+import concurrent.futures
 import datetime
 from functools import partial
 import json
@@ -18,8 +19,8 @@ import logging
 import os
 import platform
 import re
-import shutil
 import tempfile
+import threading
 import time
 from typing import Optional
 
@@ -29,6 +30,7 @@ import six
 from six.moves import urllib
 import wandb
 from wandb import __version__, env, util
+from wandb.apis import history_export
 from wandb.apis.internal import Api as InternalApi
 from wandb.apis.normalize import normalize_exceptions
 from wandb.data_types import WBValue
@@ -36,17 +38,25 @@ from wandb.errors import LaunchError
 from wandb.errors.term import termlog
 from wandb.old.summary import HTTPSummary
 from wandb.sdk.interface import artifacts
-from wandb.sdk.lib import ipython, retry
+from wandb.sdk.lib import filenames, ipython, retry
 from wandb_gql import Client, gql
 from wandb_gql.client import RetryError
 from wandb_gql.transport.requests import RequestsHTTPTransport
+from wandb_graphql.execution import ExecutionResult
+from wandb_graphql.language.printer import print_ast
 
 
 logger = logging.getLogger(__name__)
 
 # Only retry requests for 20 seconds in the public api
 RETRY_TIMEDELTA = datetime.timedelta(seconds=20)
+# runs in these states don't change anymore
+RUN_FINISHED_STATES = ("finished", "crashed", "failed")
 WANDB_INTERNAL_KEYS = {"_wandb", "wandb_version"}
+# connections kept open to the api, shared by prefetching and fan_out
+HTTP_POOL_MAXSIZE = 16
+# threads loading the pages of prefetching paginators
+PREFETCH_WORKERS = 4
 PROJECT_FRAGMENT = """fragment ProjectFragment on Project {
     id
     name
@@ -188,20 +198,138 @@ SWEEP_FRAGMENT = """fragment SweepFragment on Sweep {
 """
 
 
+class PooledHTTPTransport(RequestsHTTPTransport):
+    """RequestsHTTPTransport sending all queries through one pooled session."""
+
+    def __init__(self, url, pool_maxsize=HTTP_POOL_MAXSIZE, **kwargs):
+        super(PooledHTTPTransport, self).__init__(url, **kwargs)
+        self._pool_maxsize = pool_maxsize
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self._pool_maxsize,
+                    pool_maxsize=self._pool_maxsize,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def execute(self, document, variable_values=None, timeout=None):
+        payload = {"query": print_ast(document), "variables": variable_values or {}}
+        data_key = "json" if self.use_json else "data"
+        post_args = {
+            "headers": self.headers,
+            "auth": self.auth,
+            "cookies": self.cookies,
+            "timeout": timeout or self.default_timeout,
+            data_key: payload,
+        }
+        request = self.session.post(self.url, **post_args)
+        request.raise_for_status()
+
+        result = request.json()
+        assert (
+            "errors" in result or "data" in result
+        ), 'Received non-compatible response "{}"'.format(result)
+        return ExecutionResult(errors=result.get("errors"), data=result.get("data"))
+
+
+class RateLimiter(object):
+    """Spaces out calls to at most max_per_second, shared by threads."""
+
+    def __init__(self, max_per_second):
+        self._interval = 1.0 / max_per_second
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(self._next, now) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=PREFETCH_WORKERS, thread_name_prefix="PaginatorPrefetch"
+            )
+        return _prefetch_executor
+
+
 class RetryingClient(object):
-    def __init__(self, client):
+    def __init__(self, client, cache=None):
         self._client = client
+        self.cache = cache
 
     @property
     def app_url(self):
-        return util.app_url(self._client.transport.url.replace("/graphql", "")) + "/"
+        return util.app_url(self.base_url) + "/"
+
+    @property
+    def base_url(self):
+        return self._client.transport.url.replace("/graphql", "")
+
+    @property
+    def api_key(self):
+        auth = self._client.transport.auth
+        return auth[1] if auth else None
+
+    def execute(self, document, variable_values=None, immutable_id=None, **kwargs):
+        """Execute a query, through the query cache if there is one.
+
+        Arguments:
+            document: the parsed query
+            variable_values: (dict) the variables of the query
+            immutable_id: id of the immutable entity the query is about, or a
+                function returning it from the response, or None when the
+                entity is still mutable.  Responses with an id are cached
+                until evicted, others only for the TTL of the cache.
+        """
+        if self.cache is None or kwargs:
+            return self._execute(document, variable_values, **kwargs)
+
+        operations = [
+            d.operation for d in document.definitions if hasattr(d, "operation")
+        ]
+        if "query" not in operations or len(set(operations)) > 1:
+            response = self._execute(document, variable_values)
+            # a mutation can change any entity it was passed the id of
+            values = (variable_values or {}).values()
+            self.cache.invalidate(v for v in values if isinstance(v, str))
+            return response
+
+        key = self.cache.key(print_ast(document), variable_values)
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+        response = self._execute(document, variable_values)
+        if callable(immutable_id):
+            immutable_id = immutable_id(response)
+        self.cache.set(key, response, entity_id=immutable_id)
+        return response
 
     @retry.retriable(
         retry_timedelta=RETRY_TIMEDELTA,
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def execute(self, *args, **kwargs):
+    def _execute(self, *args, **kwargs):
         try:
             return self._client.execute(*args, **kwargs)
         except requests.exceptions.ReadTimeout:
@@ -227,6 +355,10 @@ class Api(object):
         overrides: (dict) You can set `base_url` if you are using a wandb server
             other than https://api.wandb.ai.
             You can also set defaults for `entity`, `project`, and `run`.
+        timeout: (int, optional) timeout of the graphql requests, in seconds
+        cache: (bool or QueryCache, optional) cache query responses on disk.
+            Responses about finished runs and committed artifacts are reused
+            across sessions, others for `QueryCache.TTL` seconds.
     """
 
     _HTTP_TIMEOUT = env.get_http_timeout(9)
@@ -287,7 +419,7 @@ class Api(object):
         """
     )
 
-    def __init__(self, overrides={}, timeout: Optional[int] = None):
+    def __init__(self, overrides={}, timeout: Optional[int] = None, cache=False):
         self.settings = InternalApi().settings()
         if self.api_key is None:
             wandb.login()
@@ -307,7 +439,7 @@ class Api(object):
         self._default_entity = None
         self._timeout = timeout if timeout is not None else self._HTTP_TIMEOUT
         self._base_client = Client(
-            transport=RequestsHTTPTransport(
+            transport=PooledHTTPTransport(
                 headers={"User-Agent": self.user_agent, "Use-Admin-Privileges": "true"},
                 use_json=True,
                 # this timeout won't apply when the DNS lookup fails. in that case, it will be 60s
@@ -317,7 +449,45 @@ class Api(object):
                 url="%s/graphql" % self.settings["base_url"],
             )
         )
-        self._client = RetryingClient(self._base_client)
+        if cache is True:
+            from wandb.apis.query_cache import QueryCache
+
+            cache = QueryCache()
+        if cache:
+            cache.namespace = "%s %s" % (self.settings["base_url"], self.api_key)
+        self._client = RetryingClient(self._base_client, cache=cache or None)
+
+    def fan_out(self, fn, objects, max_workers=8, max_per_second=None):
+        """
+        Call a function on every object in parallel, e.g. to run follow up queries
+        for every run returned by `Api.runs`.
+
+        Example:
+            ```python
+            runs = api.runs("my_entity/my_project").prefetch()
+            files = api.fan_out(lambda run: list(run.files()), runs, max_per_second=20)
+            ```
+
+        Arguments:
+            fn: (callable) function called with every object
+            objects: (iterable) the objects, consumed as the workers free up
+            max_workers: (int) number of concurrent calls
+            max_per_second: (float, optional) maximum number of calls started
+                per second
+
+        Returns:
+            A list with the result of every call, in the order of the objects.
+            The first exception raised by a call is re-raised.
+        """
+        limiter = RateLimiter(max_per_second) if max_per_second else None
+
+        def call(obj):
+            if limiter:
+                limiter.wait()
+            return fn(obj)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(call, objects))
 
     def create_run(self, **kwargs):
         """Create a new run"""
@@ -830,11 +1000,28 @@ class Paginator(object):
         self.objects = []
         self.index = -1
         self.last_response = None
+        self._prefetch_depth = 0
+        # loaded pages not added to objects yet, None marks the last page
+        self._prefetched = deque()
+        self._prefetching = False
+        self._prefetch_cond = threading.Condition()
 
     def __iter__(self):
         self.index = -1
         return self
 
+    def prefetch(self, depth=2):
+        """Load up to `depth` pages ahead in the background while iterating.
+
+        Pages are still loaded one after the other since every page needs the
+        cursor of the previous one, but the caller doesn't wait for them.
+
+        Returns:
+            The paginator, e.g. `for run in api.runs(path).prefetch(): ...`
+        """
+        self._prefetch_depth = depth
+        return self
+
     def __len__(self):
         if self.length is None:
             self._load_page()
@@ -861,6 +1048,8 @@ class Paginator(object):
         self.variables.update({"perPage": self.per_page, "cursor": self.cursor})
 
     def _load_page(self):
+        if self._prefetch_depth:
+            return self._load_prefetched_page()
         if not self.more:
             return False
         self.update_variables()
@@ -870,6 +1059,49 @@ class Paginator(object):
         self.objects.extend(self.convert_objects())
         return True
 
+    def _prefetch_next(self):
+        # called with _prefetch_cond held, only one page is loaded at a time
+        if self._prefetching or len(self._prefetched) >= self._prefetch_depth:
+            return
+        if self._prefetched and self._prefetched[-1] is None:
+            return
+        self._prefetching = True
+        _get_prefetch_executor().submit(self._prefetch_page)
+
+    def _prefetch_page(self):
+        try:
+            page = None
+            if self.more:
+                self.update_variables()
+                self.last_response = self.client.execute(
+                    self.QUERY, variable_values=self.variables
+                )
+                page = self.convert_objects()
+        except Exception as e:
+            page = e
+        with self._prefetch_cond:
+            self._prefetched.append(page)
+            self._prefetching = False
+            if isinstance(page, list):
+                self._prefetch_next()
+            self._prefetch_cond.notify_all()
+
+    def _load_prefetched_page(self):
+        with self._prefetch_cond:
+            self._prefetch_next()
+            while not self._prefetched:
+                self._prefetch_cond.wait()
+            page = self._prefetched[0]
+            if page is None:
+                return False
+            self._prefetched.popleft()
+            if isinstance(page, Exception):
+                # the failed page is loaded again on the next call
+                raise page
+            self._prefetch_next()
+            self.objects.extend(page)
+        return True
+
     def __getitem__(self, index):
         loaded = True
         while loaded and index > len(self.objects) - 1:
@@ -1645,7 +1877,7 @@ class Run(Attrs):
             % RUN_FRAGMENT
         )
         if force or not self._attrs:
-            response = self._exec(query)
+            response = self._exec(query, immutable_id=self._finished_run_id)
             if (
                 response is None
                 or response.get("project") is None
@@ -1706,7 +1938,7 @@ class Run(Attrs):
         while True:
             res = self._exec(query)
             state = res["project"]["run"]["state"]
-            if state in ["finished", "crashed", "failed"]:
+            if state in RUN_FINISHED_STATES:
                 print("Run finished with status: {}".format(state))
                 self._attrs["state"] = state
                 self._state = state
@@ -1789,11 +2021,25 @@ class Run(Attrs):
             config[k] = {"value": v, "desc": None}
         return json.dumps(config)
 
-    def _exec(self, query, **kwargs):
+    def _exec(self, query, immutable_id=None, **kwargs):
         """Execute a query against the cloud backend"""
         variables = {"entity": self.entity, "project": self.project, "name": self.id}
         variables.update(kwargs)
-        return self.client.execute(query, variable_values=variables)
+        return self.client.execute(
+            query, variable_values=variables, immutable_id=immutable_id
+        )
+
+    @staticmethod
+    def _finished_run_id(response):
+        run = (response.get("project") or {}).get("run") or {}
+        if run.get("state") in RUN_FINISHED_STATES:
+            return run.get("id")
+        return None
+
+    @property
+    def _history_immutable_id(self):
+        """Storage id of the run when its history can't change anymore."""
+        return self.storage_id if self.state in RUN_FINISHED_STATES else None
 
     def _sampled_history(self, keys, x_axis="_step", samples=500):
         spec = {"keys": [x_axis] + keys, "samples": samples}
@@ -1807,7 +2053,9 @@ class Run(Attrs):
         """
         )
 
-        response = self._exec(query, specs=[json.dumps(spec)])
+        response = self._exec(
+            query, immutable_id=self._history_immutable_id, specs=[json.dumps(spec)]
+        )
         # sampledHistory returns one list per spec, we only send one spec
         return response["project"]["run"]["sampledHistory"][0]
 
@@ -1824,7 +2072,9 @@ class Run(Attrs):
             % node
         )
 
-        response = self._exec(query, samples=samples)
+        response = self._exec(
+            query, immutable_id=self._history_immutable_id, samples=samples
+        )
         return [json.loads(line) for line in response["project"]["run"][node]]
 
     @normalize_exceptions
@@ -1970,6 +2220,77 @@ class Run(Attrs):
                 max_step=max_step,
             )
 
+    @normalize_exceptions
+    def history_batches(self, keys=None, stream="default", chunk_size=None):
+        """
+        Returns an iterator over the full history of a run as Arrow record batches.
+
+        The history file of the run is streamed in large chunks which are
+        parsed by pyarrow, this is much faster than `scan_history` for
+        exporting the complete history of many runs.  Requires pyarrow.
+
+        Example:
+            ```python
+            run = api.run("l2k2/examples-numpy-boston/i0wt6xua")
+            table = pyarrow.Table.from_batches(run.history_batches(keys=["_step", "Loss"]))
+            ```
+
+        Arguments:
+            keys ([str], optional): only export these keys, rows are not filtered
+                and keys missing from a row are null.
+            stream (str, optional): "default" for metrics, "system" for machine metrics
+            chunk_size (int, optional): bytes of history to parse at a time
+
+        Returns:
+            An iterator over `pyarrow.RecordBatch` objects which all have the same
+            schema. Nested values like media are exported as JSON strings.
+        """
+        if keys is not None and not isinstance(keys, list):
+            raise ValueError("keys must be specified in a list")
+        name = (
+            filenames.HISTORY_FNAME if stream == "default" else filenames.EVENTS_FNAME
+        )
+        history_file = self.file(name)
+        return history_export.iter_record_batches(
+            urllib.parse.urljoin(self.client.base_url + "/", history_file.url),
+            self.client.api_key,
+            history_keys=self._attrs.get("historyKeys")
+            if stream == "default"
+            else None,
+            keys=keys,
+            chunk_size=chunk_size or history_export.CHUNK_SIZE,
+        )
+
+    @normalize_exceptions
+    def export_history(self, path, keys=None, stream="default"):
+        """
+        Writes the full history of a run to a Parquet file.
+
+        Arguments:
+            path (str): path of the Parquet file to write
+            keys ([str], optional): only export these keys
+            stream (str, optional): "default" for metrics, "system" for machine metrics
+
+        Returns:
+            The number of rows written.
+        """
+        pa = util.get_module("pyarrow", required=history_export._PYARROW_REQUIRED)
+        pq = util.get_module(
+            "pyarrow.parquet", required=history_export._PYARROW_REQUIRED
+        )
+        rows = 0
+        writer = None
+        try:
+            for batch in self.history_batches(keys=keys, stream=stream):
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema)
+                writer.write_table(pa.Table.from_batches([batch]))
+                rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
     @normalize_exceptions
     def logged_artifacts(self, per_page=100):
         return RunArtifacts(self.client, self, mode="logged", per_page=per_page)
@@ -2783,7 +3104,11 @@ class HistoryScan(object):
             "pageSize": int(self.page_size),
         }
 
-        res = self.client.execute(self.QUERY, variable_values=variables)
+        res = self.client.execute(
+            self.QUERY,
+            variable_values=variables,
+            immutable_id=self.run._history_immutable_id,
+        )
         res = res["project"]["run"]["history"]
         self.rows = [json.loads(row) for row in res]
         self.page_offset += self.page_size
@@ -2855,7 +3180,11 @@ class SampledHistoryScan(object):
             ),
         }
 
-        res = self.client.execute(self.QUERY, variable_values=variables)
+        res = self.client.execute(
+            self.QUERY,
+            variable_values=variables,
+            immutable_id=self.run._history_immutable_id,
+        )
         res = res["project"]["run"]["sampledHistory"]
         self.rows = res[0]
         self.page_offset += self.page_size
@@ -3304,17 +3633,29 @@ class _DownloadedArtifactEntry(artifacts.ArtifactEntry):
             head, tail = os.path.splitdrive(target_path)
             target_path = head + tail.replace(":", "-")
 
-        need_copy = (
-            not os.path.isfile(target_path)
-            or os.stat(cache_path).st_mtime != os.stat(target_path).st_mtime
-        )
-        if need_copy:
+        if not self._target_matches(cache_path, target_path):
             util.mkdir_exists_ok(os.path.dirname(target_path))
-            # We use copy2, which preserves file metadata including modified
-            # time (which we use above to check whether we should do the copy).
-            shutil.copy2(cache_path, target_path)
+            artifacts.place_file(cache_path, target_path)
         return target_path
 
+    def _target_matches(self, cache_path, target_path):
+        if not os.path.isfile(target_path):
+            return False
+        if os.path.samefile(cache_path, target_path):
+            return True
+        cache_stat = os.stat(cache_path)
+        target_stat = os.stat(target_path)
+        if cache_stat.st_size != target_stat.st_size:
+            return False
+        # copies keep the modified time of the cached file
+        if cache_stat.st_mtime == target_stat.st_mtime:
+            return True
+        # the digest of a reference is not always an md5
+        if self.entry.ref is not None:
+            return False
+        cache = artifacts.get_artifacts_cache()
+        return cache.md5_file_b64(target_path) == self.digest
+
     def download(self, root=None):
         root = root or self._parent_artifact._default_root()
         self._parent_artifact._add_download_root(root)
@@ -3832,10 +4173,14 @@ class Artifact(artifacts.Artifact):
 
     def download(self, root=None, recursive=False):
         dirpath = root or self._default_root()
+        manifest = self._load_manifest()
+        return self._download_entries(dirpath, manifest.entries, recursive=recursive)
+
+    def _download_entries(self, dirpath, names, recursive=False):
         self._add_download_root(dirpath)
         manifest = self._load_manifest()
-        nfiles = len(manifest.entries)
-        size = sum(e.size for e in manifest.entries.values())
+        nfiles = len(names)
+        size = sum(manifest.entries[name].size or 0 for name in names)
         log = False
         if nfiles > 5000 or size > 50 * 1024 * 1024:
             log = True
@@ -3851,7 +4196,7 @@ class Artifact(artifacts.Artifact):
         import multiprocessing.dummy  # this uses threads
 
         pool = multiprocessing.dummy.Pool(32)
-        pool.map(partial(self._download_file, root=dirpath), manifest.entries)
+        pool.map(partial(self._download_file, root=dirpath), names)
         if recursive:
             pool.map(lambda artifact: artifact.download(), self._dependent_artifacts)
         pool.close()
@@ -3869,52 +4214,103 @@ class Artifact(artifacts.Artifact):
 
     def checkout(self, root=None):
         dirpath = root or self._default_root(include_version=False)
+        manifest = self._load_manifest()
 
-        for root, _, files in os.walk(dirpath):
-            for file in files:
-                full_path = os.path.join(root, file)
-                artifact_path = util.to_forward_slash_path(
-                    os.path.relpath(full_path, start=dirpath)
-                )
-                try:
-                    self.get_path(artifact_path)
-                except KeyError:
-                    # File is not part of the artifact, remove it.
-                    os.remove(full_path)
+        for path in self._extra_files(dirpath):
+            # File is not part of the artifact, remove it.
+            os.remove(path)
+
+        # only download the files which differ from the artifact
+        entries = [e for e in manifest.entries.values() if e.ref is None]
+        mismatches = self._mismatched_entries(dirpath, entries, use_digest_cache=True)
+        names = [
+            name
+            for name, entry in manifest.entries.items()
+            if entry.ref is not None or entry.path in mismatches
+        ]
+        return self._download_entries(dirpath, names)
+
+    def verify(self, root=None, use_digest_cache=False):
+        """Verify that the files in a directory match the artifact.
 
-        return self.download(root=dirpath)
+        All files are checked, in parallel, and every file that doesn't match
+        is reported.
 
-    def verify(self, root=None):
+        Arguments:
+            root: (str, optional) The directory to verify. Defaults to './artifacts/<self.name>/'.
+            use_digest_cache: (bool, optional) Reuse the digests of files that
+                were not modified since they were last hashed.
+
+        Raises:
+            ValueError: if the directory has files which are not in the artifact,
+                or files which are missing or differ from the artifact.
+        """
         dirpath = root or self._default_root()
         manifest = self._load_manifest()
-        ref_count = 0
 
+        errors = [
+            "{}: not a member of artifact {}".format(path, self.name)
+            for path in self._extra_files(dirpath)
+        ]
+        entries = [e for e in manifest.entries.values() if e.ref is None]
+        mismatches = self._mismatched_entries(dirpath, entries, use_digest_cache)
+        errors.extend(
+            "{}: {}".format(path, reason) for path, reason in sorted(mismatches.items())
+        )
+        ref_count = len(manifest.entries) - len(entries)
+        if ref_count > 0:
+            print("Warning: skipped verification of %s refs" % ref_count)
+        if errors:
+            raise ValueError(
+                "Verification of {} failed for {} files:\n{}".format(
+                    dirpath, len(errors), "\n".join(errors)
+                )
+            )
+
+    def _extra_files(self, dirpath):
+        manifest = self._load_manifest()
+        extra = []
         for root, _, files in os.walk(dirpath):
             for file in files:
                 full_path = os.path.join(root, file)
                 artifact_path = util.to_forward_slash_path(
                     os.path.relpath(full_path, start=dirpath)
                 )
+                if artifact_path in manifest.entries:
+                    continue
                 try:
                     self.get_path(artifact_path)
                 except KeyError:
-                    raise ValueError(
-                        "Found file {} which is not a member of artifact {}".format(
-                            full_path, self.name
-                        )
-                    )
+                    extra.append(full_path)
+        return extra
+
+    def _mismatched_entries(self, dirpath, entries, use_digest_cache):
+        """Return why files in dirpath don't match their entries, by entry path."""
+        cache = artifacts.get_artifacts_cache()
+
+        def mismatch(entry):
+            path = os.path.join(dirpath, entry.path)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return "missing"
+            # the size tells most modified files apart without reading them
+            if entry.size is not None and size != entry.size:
+                return "size mismatch"
+            digest = (
+                cache.md5_file_b64(path)
+                if use_digest_cache
+                else artifacts.md5_file_b64(path)
+            )
+            if digest != entry.digest:
+                return "digest mismatch"
+            return None
 
-        for entry in manifest.entries.values():
-            if entry.ref is None:
-                if (
-                    artifacts.md5_file_b64(os.path.join(dirpath, entry.path))
-                    != entry.digest
-                ):
-                    raise ValueError("Digest mismatch for file: %s" % entry.path)
-            else:
-                ref_count += 1
-        if ref_count > 0:
-            print("Warning: skipped verification of %s refs" % ref_count)
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            reasons = list(executor.map(mismatch, entries))
+        if use_digest_cache:
+            cache.flush_digests()
+        return {entry.path: reason for entry, reason in zip(entries, reasons) if reason}
 
     def file(self, root=None):
         """Download a single file artifact to dir specified by the <root>
@@ -4061,6 +4457,19 @@ class Artifact(artifacts.Artifact):
 
     def _load_manifest(self):
         if self._manifest is None:
+            cache = self.client.cache
+            # the manifest of a committed artifact never changes
+            cache_key = None
+            if cache is not None and self.state == "COMMITTED":
+                cache_key = cache.key("manifest", self.id)
+                manifest_json = cache.get(cache_key)
+                if manifest_json is not None:
+                    self._manifest = artifacts.ArtifactManifest.from_manifest_json(
+                        self, manifest_json
+                    )
+                    self._load_dependent_manifests()
+                    return self._manifest
+
             query = gql(
                 """
             query ArtifactManifest(
@@ -4096,9 +4505,12 @@ class Artifact(artifacts.Artifact):
             ]
             with requests.get(index_file_url) as req:
                 req.raise_for_status()
-                self._manifest = artifacts.ArtifactManifest.from_manifest_json(
-                    self, json.loads(six.ensure_text(req.content))
-                )
+                manifest_json = json.loads(six.ensure_text(req.content))
+            self._manifest = artifacts.ArtifactManifest.from_manifest_json(
+                self, manifest_json
+            )
+            if cache_key is not None:
+                cache.set(cache_key, manifest_json, entity_id=self.id)
 
             self._load_dependent_manifests()
 
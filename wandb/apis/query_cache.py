@@ -0,0 +1,202 @@
+"""Persistent cache of public API query responses.
+
+Responses are stored in a sqlite database in the wandb cache dir, keyed by
+the query and its variables.  Responses about immutable entities (finished
+runs, committed artifacts) are kept until they are evicted, other responses
+expire after a TTL.  The least recently used responses are evicted once the
+cache grows past its maximum size.  The total size of the responses is kept
+up to date by triggers, so checking it does not scan the cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Iterable, Optional
+
+from wandb import env
+from wandb.sdk.interface.artifacts import _SqliteStore
+
+try:
+    import sqlite3
+except ImportError:  # pragma: no cover
+    sqlite3 = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache(_SqliteStore):
+    """Cache of query responses shared between processes.
+
+    Arguments:
+        path: path of the database, defaults to `queries.db` in the wandb
+            cache dir
+        ttl: seconds responses about mutable entities are served for
+        max_size: maximum total size of the cached responses, in bytes
+        namespace: kept apart from the caches of other servers and users
+    """
+
+    TTL = 60
+    MAX_SIZE = 256 * 1024 * 1024
+    # last_used is only refreshed when it is older than this
+    TOUCH_SECONDS = 60
+    # responses deleted at a time by eviction
+    EVICT_BATCH = 100
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY,"
+        " value TEXT, size INTEGER, entity_id TEXT, expires REAL, last_used REAL)",
+        "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)",
+        "CREATE INDEX IF NOT EXISTS responses_entity_id ON responses (entity_id)",
+        "CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)",
+        "CREATE TABLE IF NOT EXISTS responses_size"
+        " (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER)",
+        "INSERT OR IGNORE INTO responses_size"
+        " SELECT 0, COALESCE(SUM(size), 0) FROM responses",
+        "CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses"
+        " BEGIN UPDATE responses_size SET size = size + NEW.size; END",
+        "CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses"
+        " BEGIN UPDATE responses_size SET size = size - OLD.size; END",
+    )
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_size: Optional[int] = None,
+        namespace: str = "",
+    ) -> None:
+        if path is None:
+            cache_dir = env.get_cache_dir()
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError:
+                pass
+            path = os.path.join(cache_dir, "queries.db")
+        super(QueryCache, self).__init__(path)
+        self.ttl = self.TTL if ttl is None else ttl
+        self._max_size = max_size or self.MAX_SIZE
+        self.namespace = namespace
+
+    def key(self, *parts: Any) -> str:
+        """Return the cache key of a query, from its text and variables."""
+        data = json.dumps([self.namespace] + list(parts), sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value of a key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            if self._connect() is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT value, expires, last_used FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires, last_used = row
+                if expires is not None and expires <= now:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                if now - last_used > self.TOUCH_SECONDS:
+                    self._conn.execute(
+                        "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                    )
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, entity_id: Optional[str] = None) -> None:
+        """Cache a value.
+
+        Arguments:
+            key: key of the value
+            value: JSON serializable value
+            entity_id: id of the immutable entity the value is about, the
+                value then never expires.  Values without one expire after
+                the TTL of the cache.
+        """
+        if entity_id is None and self.ttl <= 0:
+            return
+        data = json.dumps(value)
+        now = time.time()
+        expires = None if entity_id is not None else now + self.ttl
+        with self._lock:
+            if self._connect() is None:
+                return
+            try:
+                with self._transaction() as conn:
+                    # rows removed by INSERT OR REPLACE do not fire the
+                    # delete trigger, so the old response is deleted first
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.execute(
+                        "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, data, len(data), entity_id, expires, now),
+                    )
+                self._evict()
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def invalidate(self, entity_ids: Iterable[str] = ()) -> None:
+        """Drop the responses about mutable entities and about `entity_ids`.
+
+        Called after a mutation, which can change any mutable entity as well
+        as the entities it was called with.
+        """
+        entity_ids = list(entity_ids)
+        with self._lock:
+            if self._connect() is None:
+                return
+            try:
+                with self._transaction() as conn:
+                    conn.execute("DELETE FROM responses WHERE entity_id IS NULL")
+                    conn.executemany(
+                        "DELETE FROM responses WHERE entity_id = ?",
+                        [(entity_id,) for entity_id in entity_ids],
+                    )
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._connect() is None:
+                return
+            try:
+                with self._transaction() as conn:
+                    conn.execute("DELETE FROM responses")
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def _size(self) -> int:
+        (size,) = self._conn.execute("SELECT size FROM responses_size").fetchone()
+        return size
+
+    def _evict(self) -> None:
+        if self._size() <= self._max_size:
+            return
+        evicted = 0
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?",
+                (time.time(),),
+            )
+            size = self._size()
+            while size > self._max_size:
+                rows = conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_used LIMIT ?",
+                    (self.EVICT_BATCH,),
+                ).fetchall()
+                if not rows:
+                    break
+                evict = []
+                for key, row_size in rows:
+                    if size <= self._max_size:
+                        break
+                    evict.append((key,))
+                    size -= row_size
+                conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+                evicted += len(evict)
+        logger.debug("Evicted %d responses from %s", evicted, self._path)
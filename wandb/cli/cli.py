@@ -461,6 +461,13 @@ def init(ctx, project, entity, reset, mode):
     help="Mark runs as synced",
 )
 @click.option("--sync-all", is_flag=True, default=False, help="Sync all runs")
+@click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=int,
+    help="Number of runs to sync in parallel, each in its own process.",
+)
 @click.option("--clean", is_flag=True, default=False, help="Delete synced runs")
 @click.option(
     "--clean-old-hours",
@@ -493,6 +500,7 @@ def sync(
     include_synced=None,
     mark_synced=None,
     sync_all=None,
+    jobs=1,
     ignore=None,
     show=None,
     clean=None,
@@ -569,6 +577,7 @@ def sync(
             view=view,
             verbose=verbose,
             sync_tensorboard=sync_tensorboard,
+            jobs=jobs,
         )
         for p in path:
             sm.add(p)
@@ -576,6 +585,8 @@ def sync(
         while not sm.is_done():
             _ = sm.poll()
             # print(status)
+        if sm.status()["failed"]:
+            sys.exit(1)
 
     def _sync_all():
         sync_items = get_runs(
@@ -1656,11 +1667,17 @@ def cache():
     help="Clean up less frequently used files from the artifacts cache",
 )
 @click.argument("target_size")
+@click.option(
+    "--rescan",
+    is_flag=True,
+    default=False,
+    help="Rebuild the cache index from the files in the cache directory",
+)
 @display_error
-def cleanup(target_size):
+def cleanup(target_size, rescan):
     target_size = util.from_human_size(target_size)
     cache = wandb_sdk.wandb_artifacts.get_artifacts_cache()
-    reclaimed_bytes = cache.cleanup(target_size)
+    reclaimed_bytes = cache.cleanup(target_size, rescan=rescan)
     print("Reclaimed {} of space".format(util.to_human_size(reclaimed_bytes)))
 
 
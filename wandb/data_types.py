@@ -44,7 +44,7 @@ from .sdk.data_types.helper_types.classes import Classes
 from .sdk.data_types.helper_types.image_mask import ImageMask
 from .sdk.data_types.histogram import Histogram
 from .sdk.data_types.html import Html
-from .sdk.data_types.image import Image
+from .sdk.data_types.image import Image, ImageEncoder
 from .sdk.data_types.molecule import Molecule
 from .sdk.data_types.object_3d import Object3D
 from .sdk.data_types.plotly import Plotly
@@ -64,6 +64,7 @@ __all__ = [
     "Histogram",
     "Html",
     "Image",
+    "ImageEncoder",
     "Molecule",
     "Object3D",
     "Plotly",
@@ -97,9 +98,7 @@ class _TableIndex(int, _TableLinkMixin):
     def get_row(self):
         row = {}
         if self._table:
-            row = {
-                c: self._table.data[self][i] for i, c in enumerate(self._table.columns)
-            }
+            row = dict(zip(self._table.columns, self._table._get_row(self)))
 
         return row
 
@@ -144,6 +143,126 @@ def _json_helper(val, artifact):
         return util.json_friendly(val)[0]
 
 
+def _has_const_type(wb_type):
+    if isinstance(wb_type, _dtypes.ConstType):
+        return True
+    if isinstance(wb_type, _dtypes.UnionType):
+        return any(_has_const_type(t) for t in wb_type.params["allowed_types"])
+    return False
+
+
+def _class_typed(val):
+    """Returns a key for values whose type only depends on their class, else None."""
+    cls = val.__class__
+    if cls == float:
+        # nan is typed as None
+        return cls, val != val
+    if cls in _CLASS_TYPED:
+        return cls
+    return None
+
+
+_CLASS_TYPED = (
+    {str, int, bool, type(None)}
+    | set(_dtypes.NumberType.types)
+    | set(_dtypes.BooleanType.types)
+)
+
+
+def _assign_column(wb_type, values):
+    """Assigns the values of a column to a type.
+
+    Values of numpy arrays (other than object arrays) all have the same class
+    and shape, so only the first one is assigned.  Other values are assigned
+    once per class when their type only depends on their class.
+
+    Returns:
+        (Type, int): the resulting type and the index of the first value
+            which is not assignable, or None.  When a value is not assignable
+            the type is the one assigned from the values before it.
+    """
+    if _has_const_type(wb_type):
+        seen = None
+    else:
+        seen = set()
+        if util.is_numpy_array(values) and values.dtype.kind != "O":
+            values = values[:1]
+    for ndx, val in enumerate(values):
+        key = _class_typed(val) if seen is not None else None
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        result_type = wb_type.assign(val)
+        if isinstance(result_type, _dtypes.InvalidType):
+            return wb_type, ndx
+        wb_type = result_type
+    return wb_type, None
+
+
+def _concat_columns(col, other):
+    if (
+        util.is_numpy_array(col)
+        and util.is_numpy_array(other)
+        and col.dtype == other.dtype
+        and col.shape[1:] == other.shape[1:]
+    ):
+        np = util.get_module("numpy")
+        return np.concatenate([col, other])
+    return list(col) + list(other)
+
+
+_PYARROW_REQUIRED = (
+    "Storing tables as parquet requires pyarrow, install with `pip install pyarrow`"
+)
+
+
+def _pyarrow():
+    pa = util.get_module("pyarrow", required=_PYARROW_REQUIRED)
+    pq = util.get_module("pyarrow.parquet", required=_PYARROW_REQUIRED)
+    return pa, pq
+
+
+def _arrow_column(values, pa):
+    """Converts the values of a column, as returned by `_json_helper`, to an Arrow array.
+
+    Columns of numbers, booleans or strings keep their type, other columns
+    (media, dicts, lists and mixed types) are stored as JSON text.  Columns
+    mixing ints and floats are mixed types too, Arrow would load the ints
+    back as floats.
+
+    Returns:
+        (pyarrow.Array, bool): the array and whether it holds JSON text
+    """
+    try:
+        array = pa.array(values)
+    except (pa.ArrowException, OverflowError):
+        array = None
+    if array is not None and pa.types.is_floating(array.type):
+        if any(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            array = None
+    if array is not None and (
+        pa.types.is_integer(array.type)
+        or pa.types.is_floating(array.type)
+        or pa.types.is_boolean(array.type)
+        or pa.types.is_string(array.type)
+        or pa.types.is_null(array.type)
+    ):
+        return array, False
+    array = pa.array(
+        [json.dumps(v) if v is not None else None for v in values], type=pa.string()
+    )
+    return array, True
+
+
+def _cell_from_json(item, source_artifact):
+    if isinstance(item, dict) and "_type" in item:
+        obj = WBValue.init_from_json(item, source_artifact)
+        if obj is not None:
+            return obj
+    return item
+
+
 class Table(Media):
     """The Table class is used to display and analyze tabular data.
 
@@ -190,6 +309,10 @@ class Table(Media):
     assert tbl.get_column("feature_01") == [5, 7, 3]
     ```
 
+    Many rows can be added at once with `add_data_many`, which (like constructing
+    a Table from a numpy array or a DataFrame) stores and type checks the data
+    column by column instead of row by row.
+
     Tables can be logged directly to runs using `run.log({"my_table": table})`
     or added to artifacts using `artifact.add(table, "my_table")`:
     <!--yeadoc-test:table-logging-direct-->
@@ -234,10 +357,18 @@ class Table(Media):
             applies to all columns. A list of bool values applies to each respective column.
         allow_mixed_types: (bool) Determines if columns are allowed to have mixed types
             (disables type validation). Defaults to False
+        artifact_format: (str) How the data is stored when the table is added to an artifact.
+            - "json": the rows are stored in the JSON file of the table, truncated to
+            `MAX_ARTIFACT_ROWS` rows. This is the default.
+            - "parquet": the columns are stored in a compressed parquet file next to the
+            JSON file, without a row limit, and read one row group at a time.
+            Requires pyarrow.
     """
 
     MAX_ROWS = 10000
     MAX_ARTIFACT_ROWS = 200000
+    _ARTIFACT_FORMATS = ("json", "parquet")
+    _PARQUET_ROW_GROUP_SIZE = 50000
     _MAX_EMBEDDING_DIMENSIONS = 150
     _log_type = "table"
 
@@ -250,11 +381,23 @@ class Table(Media):
         dtype=None,
         optional=True,
         allow_mixed_types=False,
+        artifact_format="json",
     ):
         """rows is kept for legacy reasons, we use data to mimic the Pandas api"""
         super(Table, self).__init__()
+        if artifact_format not in Table._ARTIFACT_FORMATS:
+            raise ValueError(
+                "artifact_format must be one of {}, found {}".format(
+                    Table._ARTIFACT_FORMATS, artifact_format
+                )
+            )
+        self.artifact_format = artifact_format
         self._pk_col = None
         self._fk_cols = set()
+        # The data is stored either as rows or as columns, rows are only
+        # materialized from the columns when `data` is accessed
+        self._rows = []
+        self._cols = None
         if allow_mixed_types:
             dtype = _dtypes.AnyType
 
@@ -310,8 +453,7 @@ class Table(Media):
         self._assert_valid_columns(columns)
         self.columns = columns
         self._make_column_types(dtype, optional)
-        for row in ndarray:
-            self.add_data(*row)
+        self.add_data_many(ndarray)
 
     def _init_from_dataframe(self, dataframe, columns, optional=True, dtype=None):
         assert util.is_pandas_data_frame(
@@ -322,8 +464,50 @@ class Table(Media):
         self._assert_valid_columns(columns)
         self.columns = columns
         self._make_column_types(dtype, optional)
-        for row in range(len(dataframe)):
-            self.add_data(*tuple(dataframe[col].values[row] for col in self.columns))
+        self.add_data_many(dataframe)
+
+    @property
+    def data(self):
+        """(List[List[any]]) Row-oriented data of the table"""
+        if self._rows is None:
+            self._rows = self._get_rows()
+            self._cols = None
+        return self._rows
+
+    @data.setter
+    def data(self, data):
+        self._rows = data
+        self._cols = None
+
+    def _num_rows(self):
+        if self._rows is not None:
+            return len(self._rows)
+        return len(self._cols[0]) if self._cols else 0
+
+    def _get_rows(self, max_rows=None):
+        """Returns the rows of the table without changing how they are stored"""
+        if self._rows is not None:
+            return self._rows[:max_rows]
+        return [list(row) for row in zip(*(col[:max_rows] for col in self._cols))]
+
+    def _get_row(self, ndx):
+        if self._rows is not None:
+            return self._rows[ndx]
+        return [col[ndx] for col in self._cols]
+
+    def _get_column_data(self, col_ndx):
+        if self._cols is not None:
+            return self._cols[col_ndx]
+        return [row[col_ndx] for row in self._rows]
+
+    def _get_columns_data(self):
+        """Returns the columns of the table, storing the table as columns"""
+        if self._cols is None:
+            self._cols = [
+                self._get_column_data(col_ndx) for col_ndx in range(len(self.columns))
+            ]
+            self._rows = None
+        return self._cols
 
     def _make_column_types(self, dtype=None, optional=True):
         if dtype is None:
@@ -355,19 +539,19 @@ class Table(Media):
         if optional:
             wbtype = _dtypes.OptionalType(wbtype)
 
-        # Cast each value in the row, raising an error if there are invalid entries.
+        # Cast each value in the column, raising an error if there are invalid entries.
         col_ndx = self.columns.index(col_name)
-        for row in self.data:
-            result_type = wbtype.assign(row[col_ndx])
-            if isinstance(result_type, _dtypes.InvalidType):
-                raise TypeError(
-                    "Existing data {}, of type {} cannot be cast to {}".format(
-                        row[col_ndx],
-                        _dtypes.TypeRegistry.type_of(row[col_ndx]),
-                        wbtype,
-                    )
+        values = self._get_column_data(col_ndx)
+        result_type, invalid_ndx = _assign_column(wbtype, values)
+        if invalid_ndx is not None:
+            raise TypeError(
+                "Existing data {}, of type {} cannot be cast to {}".format(
+                    values[invalid_ndx],
+                    _dtypes.TypeRegistry.type_of(values[invalid_ndx]),
+                    wbtype,
                 )
-            wbtype = result_type
+            )
+        wbtype = result_type
 
         # Assert valid options
         is_pk = isinstance(wbtype, _PrimaryKeyType)
@@ -403,9 +587,9 @@ class Table(Media):
         assert not should_assert or eq, "Found type {}, expected {}".format(
             other.__class__, Table
         )
-        eq = eq and len(self.data) == len(other.data)
+        eq = eq and self._num_rows() == other._num_rows()
         assert not should_assert or eq, "Found {} rows, expected {}".format(
-            len(other.data), len(self.data)
+            other._num_rows(), self._num_rows()
         )
         eq = eq and self.columns == other.columns
         assert not should_assert or eq, "Found columns {}, expected {}".format(
@@ -418,9 +602,11 @@ class Table(Media):
             other._column_types, self._column_types
         )
         if eq:
-            for row_ndx in range(len(self.data)):
-                for col_ndx in range(len(self.data[row_ndx])):
-                    _eq = self.data[row_ndx][col_ndx] == other.data[row_ndx][col_ndx]
+            data = self._get_rows()
+            other_data = other._get_rows()
+            for row_ndx in range(len(data)):
+                for col_ndx in range(len(data[row_ndx])):
+                    _eq = data[row_ndx][col_ndx] == other_data[row_ndx][col_ndx]
                     # equal if all are equal
                     if util.is_numpy_array(_eq):
                         _eq = ((_eq * -1) + 1).sum() == 0
@@ -430,8 +616,8 @@ class Table(Media):
                     ), "Unequal data at row_ndx {} col_ndx {}: found {}, expected {}".format(
                         row_ndx,
                         col_ndx,
-                        other.data[row_ndx][col_ndx],
-                        self.data[row_ndx][col_ndx],
+                        other_data[row_ndx][col_ndx],
+                        data[row_ndx][col_ndx],
                     )
                     if not eq:
                         return eq
@@ -492,13 +678,98 @@ class Table(Media):
             )
         return result_type
 
+    def add_data_many(self, data):
+        """Add many rows of data to the table at once.
+
+        The rows are added column by column and the type of each column is
+        only updated once, which is much faster than calling `add_data` for
+        every row.
+
+        Arguments:
+            data: (List[List[any]] | np.ndarray | pandas.DataFrame) - 2D row-oriented
+                data, each row should match the columns of the table
+        """
+        if util.is_pandas_data_frame(data):
+            width = data.shape[1]
+            columns = [data.iloc[:, ndx].values.copy() for ndx in range(width)]
+        elif util.is_numpy_array(data):
+            if data.ndim < 2:
+                raise ValueError("Expected 2D data, found shape {}".format(data.shape))
+            width = data.shape[1]
+            columns = [data[:, ndx].copy() for ndx in range(width)]
+        else:
+            rows = list(data)
+            for row in rows:
+                if len(row) != len(self.columns):
+                    width = len(row)
+                    break
+            else:
+                width = len(self.columns)
+            columns = [[row[ndx] for row in rows] for ndx in range(width)]
+        if width != len(self.columns):
+            raise ValueError(
+                "This table expects {} columns: {}, found {}".format(
+                    len(self.columns), self.columns, width
+                )
+            )
+        self._add_columns(columns)
+
+    def _add_columns(self, columns):
+        if not columns or len(columns[0]) == 0:
+            return
+
+        # Special case to pre-emptively cast a column as a key.
+        # Needed as String.assign(Key) is invalid
+        for col_name, values in zip(self.columns, columns):
+            if util.is_numpy_array(values) and values.dtype.kind != "O":
+                continue
+            for item in values:
+                if isinstance(item, _TableLinkMixin):
+                    self.cast(
+                        col_name, _dtypes.TypeRegistry.type_of(item), optional=False
+                    )
+                    break
+
+        # Update the table's column types, once per column
+        type_map = dict(self._column_types.params["type_map"])
+        for col_name, values in zip(self.columns, columns):
+            result_type, invalid_ndx = _assign_column(type_map[col_name], values)
+            if invalid_ndx is not None:
+                raise TypeError(
+                    "Data row {} contained incompatible types:\nKey '{}':\n{}".format(
+                        invalid_ndx,
+                        col_name,
+                        result_type.explain(values[invalid_ndx], depth=1),
+                    )
+                )
+            type_map[col_name] = result_type
+        self._column_types = _dtypes.TypedDictType(type_map)
+
+        # Add the new data
+        start = self._num_rows()
+        if self._rows is not None and start > 0:
+            self._rows.extend(list(row) for row in zip(*columns))
+        elif start == 0:
+            self._cols = columns
+            self._rows = None
+        else:
+            self._cols = [
+                _concat_columns(col, other)
+                for col, other in zip(self._get_columns_data(), columns)
+            ]
+
+        # Update the wrapper values if needed
+        self._update_keys()
+        if self._pk_col is not None or self._fk_cols:
+            self._apply_key_updates(start=start)
+
     def _to_table_json(self, max_rows=None, warn=True):
         # separate this method for easier testing
         if max_rows is None:
             max_rows = Table.MAX_ROWS
-        if len(self.data) > max_rows and warn:
+        if self._num_rows() > max_rows and warn:
             logging.warning("Truncating wandb.Table object to %i rows." % max_rows)
-        return {"columns": self.columns, "data": self.data[:max_rows]}
+        return {"columns": self.columns, "data": self._get_rows(max_rows)}
 
     def bind_to_run(self, *args, **kwargs):
         # We set `warn=False` since Tables will now always be logged to both
@@ -517,9 +788,9 @@ class Table(Media):
     def get_media_subdir(cls):
         return os.path.join("media", "table")
 
-    @classmethod
-    def from_json(cls, json_obj, source_artifact):
-        data = []
+    @staticmethod
+    def _load_ndarray_columns(json_obj, source_artifact):
+        """Returns the column types of a serialized table and its numpy columns by index"""
         column_types = None
         np_deserialized_columns = {}
         if json_obj.get("column_types") is not None:
@@ -551,19 +822,57 @@ class Table(Media):
                         json_obj["columns"].index(col_name)
                     ] = deserialized[serialization_path["key"]]
                     ndarray_type._clear_serialization_path()
+        return column_types, np_deserialized_columns
 
-        for r_ndx, row in enumerate(json_obj["data"]):
-            row_data = []
-            for c_ndx, item in enumerate(row):
-                cell = item
-                if c_ndx in np_deserialized_columns:
-                    cell = np_deserialized_columns[c_ndx][r_ndx]
-                elif isinstance(item, dict) and "_type" in item:
-                    obj = WBValue.init_from_json(item, source_artifact)
-                    if obj is not None:
-                        cell = obj
-                row_data.append(cell)
-            data.append(row_data)
+    @staticmethod
+    def _iter_data_file(json_obj, source_artifact, np_deserialized_columns):
+        """Yields the columns of a table stored as parquet, one row group at a time.
+
+        Numeric columns without missing values are yielded as numpy arrays.
+        """
+        pa, pq = _pyarrow()
+        data_file = json_obj["data_file"]
+        json_columns = set(data_file.get("json_columns", []))
+        path = source_artifact.get_path(data_file["path"]).download()
+        offset = 0
+        with open(path, "rb") as f:
+            parquet_file = pq.ParquetFile(f)
+            for batch in parquet_file.iter_batches(
+                batch_size=Table._PARQUET_ROW_GROUP_SIZE
+            ):
+                columns = []
+                for c_ndx in range(batch.num_columns):
+                    if c_ndx in np_deserialized_columns:
+                        values = list(
+                            np_deserialized_columns[c_ndx][
+                                offset : offset + batch.num_rows
+                            ]
+                        )
+                    elif c_ndx in json_columns:
+                        values = [
+                            _cell_from_json(json.loads(item), source_artifact)
+                            if item is not None
+                            else None
+                            for item in batch.column(c_ndx).to_pylist()
+                        ]
+                    else:
+                        column = batch.column(c_ndx)
+                        if column.null_count == 0 and (
+                            pa.types.is_integer(column.type)
+                            or pa.types.is_floating(column.type)
+                        ):
+                            values = column.to_numpy()
+                        else:
+                            values = column.to_pylist()
+                    columns.append(values)
+                offset += batch.num_rows
+                yield columns
+
+    @classmethod
+    def from_json(cls, json_obj, source_artifact):
+        column_types, np_deserialized_columns = cls._load_ndarray_columns(
+            json_obj, source_artifact
+        )
 
         # construct Table with dtypes for each column if type information exists
         dtypes = None
@@ -572,7 +881,36 @@ class Table(Media):
                 column_types.params["type_map"][col] for col in json_obj["columns"]
             ]
 
-        new_obj = cls(columns=json_obj["columns"], data=data, dtype=dtypes)
+        if json_obj.get("data_file") is not None:
+            new_obj = cls(
+                columns=json_obj["columns"], dtype=dtypes, artifact_format="parquet"
+            )
+            column_parts = [[] for _ in json_obj["columns"]]
+            for batch in cls._iter_data_file(
+                json_obj, source_artifact, np_deserialized_columns
+            ):
+                for parts, values in zip(column_parts, batch):
+                    parts.append(values)
+            columns = []
+            for parts in column_parts:
+                if parts and all(util.is_numpy_array(part) for part in parts):
+                    np = util.get_module("numpy")
+                    columns.append(np.concatenate(parts))
+                else:
+                    columns.append([value for part in parts for value in part])
+            new_obj._add_columns(columns)
+        else:
+            data = []
+            for r_ndx, row in enumerate(json_obj["data"]):
+                row_data = []
+                for c_ndx, item in enumerate(row):
+                    if c_ndx in np_deserialized_columns:
+                        cell = np_deserialized_columns[c_ndx][r_ndx]
+                    else:
+                        cell = _cell_from_json(item, source_artifact)
+                    row_data.append(cell)
+                data.append(row_data)
+            new_obj = cls(columns=json_obj["columns"], data=data, dtype=dtypes)
 
         if column_types is not None:
             new_obj._column_types = column_types
@@ -588,77 +926,38 @@ class Table(Media):
                 {
                     "_type": "table-file",
                     "ncols": len(self.columns),
-                    "nrows": len(self.data),
+                    "nrows": self._num_rows(),
                 }
             )
 
         elif isinstance(run_or_artifact, wandb.wandb_sdk.wandb_artifacts.Artifact):
             artifact = run_or_artifact
-            mapped_data = []
-            data = self._to_table_json(Table.MAX_ARTIFACT_ROWS)["data"]
-
-            ndarray_col_ndxs = set()
-            for col_ndx, col_name in enumerate(self.columns):
-                col_type = self._column_types.params["type_map"][col_name]
-                ndarray_type = None
-                if isinstance(col_type, _dtypes.NDArrayType):
-                    ndarray_type = col_type
-                elif isinstance(col_type, _dtypes.UnionType):
-                    for t in col_type.params["allowed_types"]:
-                        if isinstance(t, _dtypes.NDArrayType):
-                            ndarray_type = t
-
-                # Do not serialize 1d arrays - these are likely embeddings and
-                # will not have the some cost as higher dimensional arrays
-                is_1d_array = (
-                    ndarray_type is not None
-                    and "shape" in ndarray_type._params
-                    and type(ndarray_type._params["shape"]) == list
-                    and len(ndarray_type._params["shape"]) == 1
-                    and ndarray_type._params["shape"][0]
-                    <= self._MAX_EMBEDDING_DIMENSIONS
+            ndarray_col_ndxs = self._serialize_ndarray_columns(artifact)
+            if self.artifact_format == "parquet":
+                json_dict.update(
+                    {
+                        "data_file": self._write_data_file(artifact, ndarray_col_ndxs),
+                        "nrows": self._num_rows(),
+                    }
                 )
-                if is_1d_array:
-                    self._column_types.params["type_map"][col_name] = _dtypes.ListType(
-                        _dtypes.NumberType, ndarray_type._params["shape"][0]
-                    )
-                elif ndarray_type is not None:
-                    np = util.get_module(
-                        "numpy",
-                        required="Serializing numpy requires numpy to be installed",
-                    )
-                    file_name = "{}_{}.npz".format(
-                        str(col_name), str(util.generate_id())
-                    )
-                    npz_file_name = os.path.join(MEDIA_TMP.name, file_name)
-                    np.savez_compressed(
-                        npz_file_name,
-                        **{
-                            str(col_name): self.get_column(col_name, convert_to="numpy")
-                        },
-                    )
-                    entry = artifact.add_file(
-                        npz_file_name, "media/serialized_data/" + file_name, is_tmp=True
-                    )
-                    ndarray_type._set_serialization_path(entry.path, str(col_name))
-                    ndarray_col_ndxs.add(col_ndx)
-
-            for row in data:
-                mapped_row = []
-                for ndx, v in enumerate(row):
-                    if ndx in ndarray_col_ndxs:
-                        mapped_row.append(None)
-                    else:
-                        mapped_row.append(_json_helper(v, artifact))
-                mapped_data.append(mapped_row)
+            else:
+                mapped_data = []
+                data = self._to_table_json(Table.MAX_ARTIFACT_ROWS)["data"]
+                for row in data:
+                    mapped_row = []
+                    for ndx, v in enumerate(row):
+                        if ndx in ndarray_col_ndxs:
+                            mapped_row.append(None)
+                        else:
+                            mapped_row.append(_json_helper(v, artifact))
+                    mapped_data.append(mapped_row)
+                json_dict.update({"data": mapped_data, "nrows": len(mapped_data)})
 
             json_dict.update(
                 {
                     "_type": Table._log_type,
                     "columns": self.columns,
-                    "data": mapped_data,
                     "ncols": len(self.columns),
-                    "nrows": len(mapped_data),
                     "column_types": self._column_types.to_json(artifact),
                 }
             )
@@ -667,6 +966,93 @@ class Table(Media):
 
         return json_dict
 
+    def _serialize_ndarray_columns(self, artifact):
+        """Adds the numpy columns of the table to an artifact as npz files.
+
+        Returns:
+            (Set[int]): the indexes of the columns which were serialized
+        """
+        ndarray_col_ndxs = set()
+        for col_ndx, col_name in enumerate(self.columns):
+            col_type = self._column_types.params["type_map"][col_name]
+            ndarray_type = None
+            if isinstance(col_type, _dtypes.NDArrayType):
+                ndarray_type = col_type
+            elif isinstance(col_type, _dtypes.UnionType):
+                for t in col_type.params["allowed_types"]:
+                    if isinstance(t, _dtypes.NDArrayType):
+                        ndarray_type = t
+
+            # Do not serialize 1d arrays - these are likely embeddings and
+            # will not have the some cost as higher dimensional arrays
+            is_1d_array = (
+                ndarray_type is not None
+                and "shape" in ndarray_type._params
+                and type(ndarray_type._params["shape"]) == list
+                and len(ndarray_type._params["shape"]) == 1
+                and ndarray_type._params["shape"][0] <= self._MAX_EMBEDDING_DIMENSIONS
+            )
+            if is_1d_array:
+                self._column_types.params["type_map"][col_name] = _dtypes.ListType(
+                    _dtypes.NumberType, ndarray_type._params["shape"][0]
+                )
+            elif ndarray_type is not None:
+                np = util.get_module(
+                    "numpy",
+                    required="Serializing numpy requires numpy to be installed",
+                )
+                file_name = "{}_{}.npz".format(str(col_name), str(util.generate_id()))
+                npz_file_name = os.path.join(MEDIA_TMP.name, file_name)
+                np.savez_compressed(
+                    npz_file_name,
+                    **{str(col_name): self.get_column(col_name, convert_to="numpy")},
+                )
+                entry = artifact.add_file(
+                    npz_file_name, "media/serialized_data/" + file_name, is_tmp=True
+                )
+                ndarray_type._set_serialization_path(entry.path, str(col_name))
+                ndarray_col_ndxs.add(col_ndx)
+        return ndarray_col_ndxs
+
+    def _write_data_file(self, artifact, ndarray_col_ndxs):
+        """Adds the data of the table to an artifact as a parquet file.
+
+        Returns:
+            (dict): the path of the file and the indexes of its JSON columns
+        """
+        pa, pq = _pyarrow()
+        nrows = self._num_rows()
+        arrays = []
+        json_columns = []
+        for col_ndx in range(len(self.columns)):
+            values = self._get_column_data(col_ndx)
+            if col_ndx in ndarray_col_ndxs:
+                arrays.append(pa.nulls(nrows))
+                continue
+            if util.is_numpy_array(values) and values.dtype.kind in "biuf":
+                array, is_json = pa.array(values), False
+            else:
+                array, is_json = _arrow_column(
+                    [_json_helper(v, artifact) for v in values], pa
+                )
+            if is_json:
+                json_columns.append(col_ndx)
+            arrays.append(array)
+
+        table = pa.Table.from_arrays(arrays, names=[str(c) for c in self.columns])
+        file_name = "{}.parquet".format(util.generate_id())
+        file_path = os.path.join(MEDIA_TMP.name, file_name)
+        pq.write_table(
+            table,
+            file_path,
+            row_group_size=Table._PARQUET_ROW_GROUP_SIZE,
+            compression="zstd",
+        )
+        entry = artifact.add_file(
+            file_path, "media/serialized_data/" + file_name, is_tmp=True
+        )
+        return {"path": entry.path, "format": "parquet", "json_columns": json_columns}
+
     def iterrows(self):
         """Iterate over rows as (ndx, row)
         Yields
@@ -677,10 +1063,14 @@ class Table(Media):
         row : List[any]
             The data of the row
         """
-        for ndx in range(len(self.data)):
+        rows = self._rows
+        if rows is None:
+            # rows of a table stored as columns are built as they are iterated
+            rows = (list(row) for row in zip(*self._cols))
+        for ndx, row in enumerate(rows):
             index = _TableIndex(ndx)
             index.set_table(self)
-            yield index, self.data[ndx]
+            yield index, row
 
     def set_pk(self, col_name):
         # TODO: Docs
@@ -739,54 +1129,69 @@ class Table(Media):
         if has_update or force_last:
             self._apply_key_updates(not has_update)
 
-    def _apply_key_updates(self, only_last=False):
+    def _apply_key_updates(self, only_last=False, start=0):
         """Appropriately wraps the underlying data in special key classes.
 
         Arguments:
             only_last: only apply the updates to the last row (used for performance when
             the caller knows that the only new data is the last row and no updates were
             applied to the column types)
+            start: only apply the updates to the rows from this index on
         """
         c_types = self._column_types.params["type_map"]
+        if only_last:
+            start = self._num_rows() - 1
 
-        # Define a helper function which will wrap the data of a single row
+        # Define a helper function which will wrap the values of a single column
         # in the appropriate class wrapper.
-        def update_row(row_ndx):
-            for fk_col in self._fk_cols:
-                col_ndx = self.columns.index(fk_col)
+        def update_column(col_name, wrap):
+            col_ndx = self.columns.index(col_name)
+            if self._rows is not None:
+                for row in self._rows[start:]:
+                    row[col_ndx] = wrap(row[col_ndx])
+            else:
+                col = self._cols[col_ndx]
+                if not isinstance(col, list):
+                    col = self._cols[col_ndx] = list(col)
+                for row_ndx in range(start, len(col)):
+                    col[row_ndx] = wrap(col[row_ndx])
 
-                # Wrap the Foreign Keys
-                if isinstance(c_types[fk_col], _ForeignKeyType) and not isinstance(
-                    self.data[row_ndx][col_ndx], _TableKey
-                ):
-                    self.data[row_ndx][col_ndx] = _TableKey(self.data[row_ndx][col_ndx])
-                    self.data[row_ndx][col_ndx].set_table(
-                        c_types[fk_col].params["table"],
-                        c_types[fk_col].params["col_name"],
-                    )
+        for fk_col in self._fk_cols:
+            c_type = c_types[fk_col]
 
-                # Wrap the Foreign Indexes
-                elif isinstance(c_types[fk_col], _ForeignIndexType) and not isinstance(
-                    self.data[row_ndx][col_ndx], _TableIndex
-                ):
-                    self.data[row_ndx][col_ndx] = _TableIndex(
-                        self.data[row_ndx][col_ndx]
-                    )
-                    self.data[row_ndx][col_ndx].set_table(
-                        c_types[fk_col].params["table"]
-                    )
+            # Wrap the Foreign Keys
+            if isinstance(c_type, _ForeignKeyType):
 
-            # Wrap the Primary Key
-            if self._pk_col is not None:
-                col_ndx = self.columns.index(self._pk_col)
-                self.data[row_ndx][col_ndx] = _TableKey(self.data[row_ndx][col_ndx])
-                self.data[row_ndx][col_ndx].set_table(self, self._pk_col)
+                def wrap_fk(val, c_type=c_type):
+                    if isinstance(val, _TableKey):
+                        return val
+                    val = _TableKey(val)
+                    val.set_table(c_type.params["table"], c_type.params["col_name"])
+                    return val
 
-        if only_last:
-            update_row(len(self.data) - 1)
-        else:
-            for row_ndx in range(len(self.data)):
-                update_row(row_ndx)
+                update_column(fk_col, wrap_fk)
+
+            # Wrap the Foreign Indexes
+            elif isinstance(c_type, _ForeignIndexType):
+
+                def wrap_fi(val, c_type=c_type):
+                    if isinstance(val, _TableIndex):
+                        return val
+                    val = _TableIndex(val)
+                    val.set_table(c_type.params["table"])
+                    return val
+
+                update_column(fk_col, wrap_fi)
+
+        # Wrap the Primary Key
+        if self._pk_col is not None:
+
+            def wrap_pk(val):
+                val = _TableKey(val)
+                val.set_table(self, self._pk_col)
+                return val
+
+            update_column(self._pk_col, wrap_pk)
 
     def add_column(self, name, data, optional=False):
         """Add a column of data to the table.
@@ -801,18 +1206,20 @@ class Table(Media):
         assert isinstance(data, list) or is_np
         assert isinstance(optional, bool)
         is_first_col = len(self.columns) == 0
-        assert is_first_col or len(data) == len(
-            self.data
-        ), "Expected length {}, found {}".format(len(self.data), len(data))
-
-        # Add the new data
-        for ndx in range(max(len(data), len(self.data))):
-            if is_first_col:
-                self.data.append([])
-            if is_np:
-                self.data[ndx].append(data[ndx])
-            else:
-                self.data[ndx].append(data[ndx])
+        num_rows = self._num_rows()
+        assert (
+            is_first_col or len(data) == num_rows
+        ), "Expected length {}, found {}".format(num_rows, len(data))
+
+        # Add the new data, tables stored as rows stay stored as rows
+        is_rows = self._rows is not None and num_rows > 0 and not is_first_col
+        if is_rows:
+            for ndx in range(num_rows):
+                self._rows[ndx].append(data[ndx])
+        else:
+            cols = [] if is_first_col else self._get_columns_data()
+            self._cols = cols + [data if is_np else list(data)]
+            self._rows = None
         # add the column
         self.columns.append(name)
 
@@ -824,8 +1231,11 @@ class Table(Media):
                 self.data = []
                 self.columns = []
             else:
-                for ndx in range(len(self.data)):
-                    self.data[ndx] = self.data[ndx][:-1]
+                if is_rows:
+                    for ndx in range(num_rows):
+                        self._rows[ndx] = self._rows[ndx][:-1]
+                else:
+                    self._cols = self._cols[:-1]
                 self.columns = self.columns[:-1]
             raise err
 
@@ -843,21 +1253,22 @@ class Table(Media):
             np = util.get_module(
                 "numpy", required="Converting to numpy requires installing numpy"
             )
+        values = self._get_column_data(self.columns.index(name))
+        if convert_to is None:
+            return list(values)
+        if util.is_numpy_array(values) and values.dtype.kind != "O":
+            return np.array(values)
         col = []
-        col_ndx = self.columns.index(name)
-        for row in self.data:
-            item = row[col_ndx]
-            if convert_to is not None and isinstance(item, WBValue):
+        for item in values:
+            if isinstance(item, WBValue):
                 item = item.to_data_array()
             col.append(item)
-        if convert_to == "numpy":
-            col = np.array(col)
-        return col
+        return np.array(col)
 
     def get_index(self):
         """Returns an array of row indexes which can be used in other tables to create links"""
         ndxs = []
-        for ndx in range(len(self.data)):
+        for ndx in range(self._num_rows()):
             index = _TableIndex(ndx)
             index.set_table(self)
             ndxs.append(index)
@@ -865,7 +1276,7 @@ class Table(Media):
 
     def index_ref(self, index):
         """Get a reference to a particular row index in the table"""
-        assert index < len(self.data)
+        assert index < self._num_rows()
         _index = _TableIndex(index)
         _index.set_table(self)
         return _index
@@ -908,6 +1319,11 @@ class _PartitionTablePartEntry:
             self._part = self.source_artifact.get(self.entry.path)
         return self._part
 
+    def get_json(self):
+        path = self.source_artifact.get_path(self.entry.path).download()
+        with open(path, "r") as fp:
+            return json.load(fp)
+
     def free(self):
         self._part = None
 
@@ -966,20 +1382,41 @@ class PartitionedTable(Media):
         columns = None
         ndx = 0
         for entry_path in self._loaded_part_entries:
-            part = self._loaded_part_entries[entry_path].get_part()
+            part_entry = self._loaded_part_entries[entry_path]
+            # parts stored as parquet are read one row group at a time
+            json_obj = part_entry.get_json()
+            if json_obj.get("data_file") is not None:
+                part_columns = json_obj["columns"]
+                rows = self._iter_data_file_rows(json_obj, part_entry.source_artifact)
+            else:
+                # build the part from the json already read
+                part = Table.from_json(json_obj, part_entry.source_artifact)
+                part_columns = part.columns
+                rows = (row for _, row in part.iterrows())
             if columns is None:
-                columns = part.columns
-            elif columns != part.columns:
+                columns = part_columns
+            elif columns != part_columns:
                 raise ValueError(
                     "Table parts have non-matching columns. {} != {}".format(
-                        columns, part.columns
+                        columns, part_columns
                     )
                 )
-            for _, row in part.iterrows():
+            for row in rows:
                 yield ndx, row
                 ndx += 1
 
-            self._loaded_part_entries[entry_path].free()
+            part_entry.free()
+
+    @staticmethod
+    def _iter_data_file_rows(json_obj, source_artifact):
+        _, np_deserialized_columns = Table._load_ndarray_columns(
+            json_obj, source_artifact
+        )
+        for batch in Table._iter_data_file(
+            json_obj, source_artifact, np_deserialized_columns
+        ):
+            for row in zip(*batch):
+                yield list(row)
 
     def _add_part_entry(self, entry, source_artifact):
         self._loaded_part_entries[entry.path] = _PartitionTablePartEntry(
@@ -66,6 +66,9 @@ ANONYMOUS = "WANDB_ANONYMOUS"
 JUPYTER = "WANDB_JUPYTER"
 CONFIG_DIR = "WANDB_CONFIG_DIR"
 CACHE_DIR = "WANDB_CACHE_DIR"
+UPLOAD_PART_SIZE = "WANDB_UPLOAD_PART_SIZE"
+ARTIFACT_LINK_TYPE = "WANDB_ARTIFACT_LINK_TYPE"
+ARTIFACT_CACHE_MAX_SIZE = "WANDB_ARTIFACT_CACHE_MAX_SIZE"
 DISABLE_SSL = "WANDB_INSECURE_DISABLE_SSL"
 SERVICE = "WANDB_SERVICE"
 SENTRY_DSN = "WANDB_SENTRY_DSN"
@@ -306,6 +309,25 @@ def get_cache_dir(env=None):
     return val
 
 
+def get_upload_part_size(default=None, env=None):
+    if env is None:
+        env = os.environ
+    val = env.get(UPLOAD_PART_SIZE)
+    return int(val) if val else default
+
+
+def get_artifact_link_type(default="auto", env=None):
+    if env is None:
+        env = os.environ
+    return env.get(ARTIFACT_LINK_TYPE, default)
+
+
+def get_artifact_cache_max_size(default=None, env=None):
+    if env is None:
+        env = os.environ
+    return env.get(ARTIFACT_CACHE_MAX_SIZE, default)
+
+
 def get_use_v1_artifacts(env=None):
     if env is None:
         env = os.environ
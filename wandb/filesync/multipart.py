@@ -0,0 +1,219 @@
+"""Multipart uploads of large files.
+
+A file is split in parts of a fixed size which are uploaded in parallel to
+their own signed urls.  Each part is retried on its own, and the ETags of the
+uploaded parts are kept in a state file so that an interrupted upload, even
+across process restarts, only sends the missing parts when the backend hands
+out the same upload id again.
+"""
+
+import base64
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from wandb import env
+from wandb import util
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+# limits of S3 compatible stores
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+MAX_CONCURRENT_PARTS = 4
+# read size when hashing parts
+CHUNK_SIZE = 1024 * 1024
+
+
+def part_size_for(size, part_size=None):
+    """Return the part size to use for a file of the given size.
+
+    The part size defaults to WANDB_UPLOAD_PART_SIZE, and is raised to stay
+    within the minimum part size and the maximum number of parts.
+    """
+    if part_size is None:
+        part_size = env.get_upload_part_size(DEFAULT_PART_SIZE)
+    part_size = max(part_size, MIN_PART_SIZE)
+    return max(part_size, -(-size // MAX_PARTS))
+
+
+def file_parts(path, part_size):
+    """Return the partNumber and hexMD5 of every part of a file."""
+    parts = []
+    with open(path, "rb") as f:
+        while True:
+            hash_md5 = hashlib.md5()
+            remaining = part_size
+            while remaining:
+                data = f.read(min(remaining, CHUNK_SIZE))
+                if not data:
+                    break
+                hash_md5.update(data)
+                remaining -= len(data)
+            if remaining == part_size:
+                break
+            parts.append({"partNumber": len(parts) + 1, "hexMD5": hash_md5.hexdigest()})
+    return parts
+
+
+class FilePart(object):
+    """Reads one part of an open file, used as the body of a part upload.
+
+    The part is streamed from the file rather than read in memory.  seek()
+    and tell() are relative to the start of the part so that a retried
+    request can rewind it.
+    """
+
+    def __init__(self, f, offset, length):
+        self._file = f
+        self._offset = offset
+        self._len = length
+        self._pos = 0
+        f.seek(offset)
+
+    def __len__(self):
+        return self._len
+
+    def read(self, size=-1):
+        remaining = self._len - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        data = self._file.read(size)
+        self._pos += len(data)
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._len
+        self._pos = min(max(offset, 0), self._len)
+        self._file.seek(self._offset + self._pos)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+class UploadState(object):
+    """ETags of the parts uploaded so far, persisted after every part."""
+
+    def __init__(self, path, upload_id, part_size):
+        self._path = path
+        self._upload_id = upload_id
+        self._part_size = part_size
+        self._lock = threading.Lock()
+        self.etags = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # parts of an earlier upload id are gone, start over
+        if data.get("uploadID") == upload_id and data.get("partSize") == part_size:
+            self.etags = {int(k): v for k, v in data.get("etags", {}).items()}
+
+    @classmethod
+    def for_storage_path(cls, storage_path, upload_id, part_size):
+        dirname = os.path.join(env.get_cache_dir(), "uploads")
+        util.mkdir_exists_ok(dirname)
+        name = hashlib.md5(storage_path.encode("utf-8")).hexdigest()
+        return cls(os.path.join(dirname, name + ".json"), upload_id, part_size)
+
+    def add(self, part_number, etag):
+        with self._lock:
+            self.etags[part_number] = etag
+            data = {
+                "uploadID": self._upload_id,
+                "partSize": self._part_size,
+                "etags": self.etags,
+            }
+            tmp_path = self._path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path)
+
+    def remove(self):
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+
+def upload_parts(
+    api,
+    path,
+    parts,
+    part_urls,
+    part_size,
+    state,
+    progress_callback=None,
+    max_concurrency=MAX_CONCURRENT_PARTS,
+):
+    """Upload the parts of a file which are not in the upload state yet.
+
+    Arguments:
+        api: InternalApi used to upload the parts
+        path: path of the file to upload
+        parts: partNumber and hexMD5 of every part, see file_parts()
+        part_urls: dict of part number to the signed url of the part
+        part_size: size of every part but the last one
+        state: UploadState of the upload
+        progress_callback: called with the number of new bytes and the total
+            number of bytes uploaded
+
+    Returns:
+        The completed parts, dicts with the partNumber and ETag (as hexMD5)
+        of every part, in order.
+    """
+    lock = threading.Lock()
+    size = os.path.getsize(path)
+    uploaded = [
+        min(part_size, size - (n - 1) * part_size)
+        for n in state.etags
+        if n in part_urls
+    ]
+    total = [sum(uploaded)]
+    if total[0] and progress_callback:
+        progress_callback(total[0], total[0])
+
+    def upload_part(part):
+        part_number = part["partNumber"]
+        offset = (part_number - 1) * part_size
+        length = min(part_size, size - offset)
+        headers = {
+            "Content-MD5": base64.b64encode(bytes.fromhex(part["hexMD5"])).decode(
+                "ascii"
+            )
+        }
+        with open(path, "rb") as f:
+            response = api.upload_multipart_file_chunk_retry(
+                part_urls[part_number],
+                FilePart(f, offset, length),
+                extra_headers=headers,
+            )
+        state.add(part_number, response.headers["ETag"])
+        with lock:
+            total[0] += length
+            if progress_callback:
+                progress_callback(length, total[0])
+
+    missing = [p for p in parts if p["partNumber"] not in state.etags]
+    if len(missing) != len(parts):
+        logger.info(
+            "Resuming upload of %s, %d of %d parts left",
+            path,
+            len(missing),
+            len(parts),
+        )
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        # list() re-raises the first failed part
+        list(pool.map(upload_part, missing))
+    return [
+        {"partNumber": p["partNumber"], "hexMD5": state.etags[p["partNumber"]]}
+        for p in parts
+    ]
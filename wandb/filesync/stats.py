@@ -6,6 +6,8 @@ import wandb
 class Stats(object):
     def __init__(self):
         self._stats = {}
+        self._file_stream_raw_bytes = 0
+        self._file_stream_sent_bytes = 0
         self._lock = threading.Lock()
 
     def init_file(self, save_name, size, is_artifact_file=False):
@@ -30,15 +32,24 @@ class Stats(object):
         self._stats[save_name]["uploaded"] = 0
         self._stats[save_name]["failed"] = True
 
+    def update_file_stream_bytes(self, raw_bytes, sent_bytes):
+        with self._lock:
+            self._file_stream_raw_bytes += raw_bytes
+            self._file_stream_sent_bytes += sent_bytes
+
     def summary(self):
         # Need to use list to ensure we get a copy, since other threads may
         # modify this while we iterate
         with self._lock:
             stats = list(self._stats.values())
+            file_stream_raw_bytes = self._file_stream_raw_bytes
+            file_stream_sent_bytes = self._file_stream_sent_bytes
         return {
             "uploaded_bytes": sum(f["uploaded"] for f in stats),
             "total_bytes": sum(f["total"] for f in stats),
             "deduped_bytes": sum(f["total"] for f in stats if f["deduped"]),
+            "file_stream_raw_bytes": file_stream_raw_bytes,
+            "file_stream_sent_bytes": file_stream_sent_bytes,
         }
 
     def file_counts_by_category(self):
@@ -1,7 +1,11 @@
 """Batching file prepare requests to our API."""
 
+import base64
 import collections
+import hashlib
+import logging
 import os
+import queue
 import shutil
 import threading
 import wandb.util
@@ -29,8 +33,50 @@ RequestCommitArtifact = collections.namedtuple(
 )
 RequestFinish = collections.namedtuple("RequestFinish", ("callback"))
 
+logger = logging.getLogger(__name__)
+
+
+# read size for copying and hashing files
+CHUNK_SIZE = 1024 * 1024
+
+
+def copy_and_md5(src, dst=None):
+    """Hash a file with a single read pass, copying it to dst on the way.
+
+    Returns:
+        The base64 encoded md5 digest of the file.
+    """
+    hash_md5 = hashlib.md5()
+    buf = bytearray(CHUNK_SIZE)
+    view = memoryview(buf)
+    out = open(dst, "wb") if dst else None
+    try:
+        with open(src, "rb") as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hash_md5.update(view[:n])
+                if out:
+                    out.write(view[:n])
+    finally:
+        if out:
+            out.close()
+    if dst:
+        shutil.copystat(src, dst)
+    return base64.b64encode(hash_md5.digest()).decode("ascii")
+
 
 class StepChecksum(object):
+    """Copies and hashes files before handing them to the upload step.
+
+    Files are copied and hashed by a pool of MAX_CHECKSUM_JOBS worker threads,
+    each upload request is passed on to the upload step as soon as its file is
+    ready.  Artifact commits and finish requests wait for all earlier files.
+    """
+
+    MAX_CHECKSUM_JOBS = min(8, os.cpu_count() or 1)
+
     def __init__(self, api, tempdir, request_queue, output_queue, stats):
         self._api = api
         self._tempdir = tempdir
@@ -41,44 +87,85 @@ class StepChecksum(object):
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
 
+        self._job_queue = queue.Queue()
+        self._job_threads = []
+        self._pending_jobs = 0
+        self._pending_names = set()
+        self._pending_cond = threading.Condition()
+
+    def _checksum_job(self, req):
+        path = req.path
+        if req.copy:
+            path = os.path.join(
+                self._tempdir.name, "%s-%s" % (wandb.util.generate_id(), req.save_name),
+            )
+            wandb.util.mkdir_exists_ok(os.path.dirname(path))
+        checksum = None
+        if req.use_prepare_flow:
+            # passing a checksum through indicates that we'd like to use the
+            # "prepare" file upload flow, in which we prepare the files in
+            # the database before uploading them. This is currently only
+            # used for artifact manifests
+            checksum = copy_and_md5(req.path, path if req.copy else None)
+        elif req.copy:
+            try:
+                # certain linux distros throw an exception when copying
+                # large files: https://bugs.python.org/issue43743
+                shutil.copy2(req.path, path)
+            except OSError:
+                shutil._USE_CP_SENDFILE = False
+                shutil.copy2(req.path, path)
+        self._output_queue.put(
+            step_upload.RequestUpload(
+                path,
+                req.save_name,
+                req.artifact_id,
+                checksum,
+                req.copy,
+                req.save_fn,
+                req.digest,
+            )
+        )
+
+    def _job_thread_body(self):
+        while True:
+            req = self._job_queue.get()
+            if req is None:
+                return
+            try:
+                self._checksum_job(req)
+            except Exception:
+                logger.exception("failed to prepare %s for upload", req.path)
+                self._stats.update_failed_file(req.save_name)
+            finally:
+                with self._pending_cond:
+                    self._pending_jobs -= 1
+                    self._pending_names.discard(req.save_name)
+                    self._pending_cond.notify_all()
+
+    def _wait_for_jobs(self):
+        with self._pending_cond:
+            self._pending_cond.wait_for(lambda: self._pending_jobs == 0)
+
     def _thread_body(self):
         finished = False
         while True:
             req = self._request_queue.get()
             if isinstance(req, RequestUpload):
-                path = req.path
-                if req.copy:
-                    path = os.path.join(
-                        self._tempdir.name,
-                        "%s-%s" % (wandb.util.generate_id(), req.save_name),
-                    )
-                    wandb.util.mkdir_exists_ok(os.path.dirname(path))
-                    try:
-                        # certain linux distros throw an exception when copying
-                        # large files: https://bugs.python.org/issue43743
-                        shutil.copy2(req.path, path)
-                    except OSError:
-                        shutil._USE_CP_SENDFILE = False
-                        shutil.copy2(req.path, path)
-                checksum = None
-                if req.use_prepare_flow:
-                    # passing a checksum through indicates that we'd like to use the
-                    # "prepare" file upload flow, in which we prepare the files in
-                    # the database before uploading them. This is currently only
-                    # used for artifact manifests
-                    checksum = wandb.util.md5_file(path)
-                self._stats.init_file(req.save_name, os.path.getsize(path))
-                self._output_queue.put(
-                    step_upload.RequestUpload(
-                        path,
-                        req.save_name,
-                        req.artifact_id,
-                        checksum,
-                        req.copy,
-                        req.save_fn,
-                        req.digest,
+                # report the file right away so that progress includes files
+                # which are still being copied or hashed
+                try:
+                    self._stats.init_file(req.save_name, os.path.getsize(req.path))
+                except OSError:
+                    self._stats.init_file(req.save_name, 0)
+                with self._pending_cond:
+                    # a newer version of a file must not overtake the older one
+                    self._pending_cond.wait_for(
+                        lambda: req.save_name not in self._pending_names
                     )
-                )
+                    self._pending_jobs += 1
+                    self._pending_names.add(req.save_name)
+                self._job_queue.put(req)
             elif isinstance(req, RequestStoreManifestFiles):
                 for entry in req.manifest.entries.values():
                     if entry.local_path:
@@ -103,6 +190,8 @@ class StepChecksum(object):
                             )
                         )
             elif isinstance(req, RequestCommitArtifact):
+                # the upload step must see all files of the artifact first
+                self._wait_for_jobs()
                 self._output_queue.put(
                     step_upload.RequestCommitArtifact(
                         req.artifact_id, req.finalize, req.before_commit, req.on_commit
@@ -113,9 +202,18 @@ class StepChecksum(object):
             else:
                 raise Exception("internal error")
 
+        self._wait_for_jobs()
+        for _ in self._job_threads:
+            self._job_queue.put(None)
         self._output_queue.put(step_upload.RequestFinish(req.callback))
 
     def start(self):
+        for i in range(self.MAX_CHECKSUM_JOBS):
+            thread = threading.Thread(target=self._job_thread_body)
+            thread.name = "ChecksumThr{}".format(i)
+            thread.daemon = True
+            thread.start()
+            self._job_threads.append(thread)
         self._thread.start()
 
     def is_alive(self):
@@ -13,7 +13,14 @@ RequestPrepare = collections.namedtuple(
 RequestFinish = collections.namedtuple("RequestFinish", ())
 
 ResponsePrepare = collections.namedtuple(
-    "ResponsePrepare", ("upload_url", "upload_headers", "birth_artifact_id")
+    "ResponsePrepare",
+    (
+        "upload_url",
+        "upload_headers",
+        "birth_artifact_id",
+        "storage_path",
+        "multipart_upload_urls",
+    ),
 )
 
 
@@ -47,12 +54,21 @@ class StepPrepare(object):
                 upload_url = response_file["uploadUrl"]
                 upload_headers = response_file["uploadHeaders"]
                 birth_artifact_id = response_file["artifact"]["id"]
+                # only set for files which asked for a multipart upload
+                storage_path = response_file.get("storagePath")
+                multipart_upload_urls = response_file.get("uploadMultipartUrls")
                 if prepare_request.on_prepare:
                     prepare_request.on_prepare(
                         upload_url, upload_headers, birth_artifact_id
                     )
                 prepare_request.response_queue.put(
-                    ResponsePrepare(upload_url, upload_headers, birth_artifact_id)
+                    ResponsePrepare(
+                        upload_url,
+                        upload_headers,
+                        birth_artifact_id,
+                        storage_path,
+                        multipart_upload_urls,
+                    )
                 )
             if finish:
                 break
@@ -1217,6 +1217,7 @@ class Request(google.protobuf.message.Message):
     ARTIFACT_SEND_FIELD_NUMBER: builtins.int
     ARTIFACT_POLL_FIELD_NUMBER: builtins.int
     ARTIFACT_DONE_FIELD_NUMBER: builtins.int
+    PARTIAL_HISTORY_BATCH_FIELD_NUMBER: builtins.int
     SHUTDOWN_FIELD_NUMBER: builtins.int
     ATTACH_FIELD_NUMBER: builtins.int
     STATUS_FIELD_NUMBER: builtins.int
@@ -1270,6 +1271,9 @@ class Request(google.protobuf.message.Message):
     @property
     def artifact_done(self) -> global___ArtifactDoneRequest: ...
 
+    @property
+    def partial_history_batch(self) -> global___PartialHistoryBatchRequest: ...
+
     @property
     def shutdown(self) -> global___ShutdownRequest: ...
 
@@ -1300,14 +1304,15 @@ class Request(google.protobuf.message.Message):
         artifact_send : typing.Optional[global___ArtifactSendRequest] = ...,
         artifact_poll : typing.Optional[global___ArtifactPollRequest] = ...,
         artifact_done : typing.Optional[global___ArtifactDoneRequest] = ...,
+        partial_history_batch : typing.Optional[global___PartialHistoryBatchRequest] = ...,
         shutdown : typing.Optional[global___ShutdownRequest] = ...,
         attach : typing.Optional[global___AttachRequest] = ...,
         status : typing.Optional[global___StatusRequest] = ...,
         test_inject : typing.Optional[global___TestInjectRequest] = ...,
         ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal[u"artifact_done",b"artifact_done",u"artifact_poll",b"artifact_poll",u"artifact_send",b"artifact_send",u"attach",b"attach",u"check_version",b"check_version",u"defer",b"defer",u"get_summary",b"get_summary",u"log_artifact",b"log_artifact",u"login",b"login",u"network_status",b"network_status",u"partial_history",b"partial_history",u"pause",b"pause",u"poll_exit",b"poll_exit",u"request_type",b"request_type",u"resume",b"resume",u"run_start",b"run_start",u"sampled_history",b"sampled_history",u"shutdown",b"shutdown",u"status",b"status",u"stop_status",b"stop_status",u"test_inject",b"test_inject"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"artifact_done",b"artifact_done",u"artifact_poll",b"artifact_poll",u"artifact_send",b"artifact_send",u"attach",b"attach",u"check_version",b"check_version",u"defer",b"defer",u"get_summary",b"get_summary",u"log_artifact",b"log_artifact",u"login",b"login",u"network_status",b"network_status",u"partial_history",b"partial_history",u"pause",b"pause",u"poll_exit",b"poll_exit",u"request_type",b"request_type",u"resume",b"resume",u"run_start",b"run_start",u"sampled_history",b"sampled_history",u"shutdown",b"shutdown",u"status",b"status",u"stop_status",b"stop_status",u"test_inject",b"test_inject"]) -> None: ...
-    def WhichOneof(self, oneof_group: typing_extensions.Literal[u"request_type",b"request_type"]) -> typing_extensions.Literal["stop_status","network_status","defer","get_summary","login","pause","resume","poll_exit","sampled_history","partial_history","run_start","check_version","log_artifact","artifact_send","artifact_poll","artifact_done","shutdown","attach","status","test_inject"]: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"artifact_done",b"artifact_done",u"artifact_poll",b"artifact_poll",u"artifact_send",b"artifact_send",u"attach",b"attach",u"check_version",b"check_version",u"defer",b"defer",u"get_summary",b"get_summary",u"log_artifact",b"log_artifact",u"login",b"login",u"network_status",b"network_status",u"partial_history",b"partial_history",u"partial_history_batch",b"partial_history_batch",u"pause",b"pause",u"poll_exit",b"poll_exit",u"request_type",b"request_type",u"resume",b"resume",u"run_start",b"run_start",u"sampled_history",b"sampled_history",u"shutdown",b"shutdown",u"status",b"status",u"stop_status",b"stop_status",u"test_inject",b"test_inject"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"artifact_done",b"artifact_done",u"artifact_poll",b"artifact_poll",u"artifact_send",b"artifact_send",u"attach",b"attach",u"check_version",b"check_version",u"defer",b"defer",u"get_summary",b"get_summary",u"log_artifact",b"log_artifact",u"login",b"login",u"network_status",b"network_status",u"partial_history",b"partial_history",u"partial_history_batch",b"partial_history_batch",u"pause",b"pause",u"poll_exit",b"poll_exit",u"request_type",b"request_type",u"resume",b"resume",u"run_start",b"run_start",u"sampled_history",b"sampled_history",u"shutdown",b"shutdown",u"status",b"status",u"stop_status",b"stop_status",u"test_inject",b"test_inject"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal[u"request_type",b"request_type"]) -> typing_extensions.Literal["stop_status","network_status","defer","get_summary","login","pause","resume","poll_exit","sampled_history","partial_history","run_start","check_version","log_artifact","artifact_send","artifact_poll","artifact_done","partial_history_batch","shutdown","attach","status","test_inject"]: ...
 global___Request = Request
 
 class Response(google.protobuf.message.Message):
@@ -1610,15 +1615,21 @@ global___NetworkStatusRequest = NetworkStatusRequest
 class NetworkStatusResponse(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     NETWORK_RESPONSES_FIELD_NUMBER: builtins.int
+    FILE_STREAM_STATS_FIELD_NUMBER: builtins.int
 
     @property
     def network_responses(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___HttpResponse]: ...
 
+    @property
+    def file_stream_stats(self) -> global___FileStreamStats: ...
+
     def __init__(self,
         *,
         network_responses : typing.Optional[typing.Iterable[global___HttpResponse]] = ...,
+        file_stream_stats : typing.Optional[global___FileStreamStats] = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"network_responses",b"network_responses"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"file_stream_stats",b"file_stream_stats"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"file_stream_stats",b"file_stream_stats",u"network_responses",b"network_responses"]) -> None: ...
 global___NetworkStatusResponse = NetworkStatusResponse
 
 class HttpResponse(google.protobuf.message.Message):
@@ -1658,6 +1669,7 @@ class PollExitResponse(google.protobuf.message.Message):
     FILE_COUNTS_FIELD_NUMBER: builtins.int
     PUSHER_STATS_FIELD_NUMBER: builtins.int
     LOCAL_INFO_FIELD_NUMBER: builtins.int
+    FILE_STREAM_STATS_FIELD_NUMBER: builtins.int
     done: builtins.bool = ...
 
     @property
@@ -1672,6 +1684,9 @@ class PollExitResponse(google.protobuf.message.Message):
     @property
     def local_info(self) -> global___LocalInfo: ...
 
+    @property
+    def file_stream_stats(self) -> global___FileStreamStats: ...
+
     def __init__(self,
         *,
         done : builtins.bool = ...,
@@ -1679,9 +1694,10 @@ class PollExitResponse(google.protobuf.message.Message):
         file_counts : typing.Optional[global___FileCounts] = ...,
         pusher_stats : typing.Optional[global___FilePusherStats] = ...,
         local_info : typing.Optional[global___LocalInfo] = ...,
+        file_stream_stats : typing.Optional[global___FileStreamStats] = ...,
         ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal[u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"local_info",b"local_info",u"pusher_stats",b"pusher_stats"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"done",b"done",u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"local_info",b"local_info",u"pusher_stats",b"pusher_stats"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"file_stream_stats",b"file_stream_stats",u"local_info",b"local_info",u"pusher_stats",b"pusher_stats"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"done",b"done",u"exit_result",b"exit_result",u"file_counts",b"file_counts",u"file_stream_stats",b"file_stream_stats",u"local_info",b"local_info",u"pusher_stats",b"pusher_stats"]) -> None: ...
 global___PollExitResponse = PollExitResponse
 
 class FileCounts(google.protobuf.message.Message):
@@ -1710,19 +1726,52 @@ class FilePusherStats(google.protobuf.message.Message):
     UPLOADED_BYTES_FIELD_NUMBER: builtins.int
     TOTAL_BYTES_FIELD_NUMBER: builtins.int
     DEDUPED_BYTES_FIELD_NUMBER: builtins.int
+    FILE_STREAM_RAW_BYTES_FIELD_NUMBER: builtins.int
+    FILE_STREAM_SENT_BYTES_FIELD_NUMBER: builtins.int
     uploaded_bytes: builtins.int = ...
     total_bytes: builtins.int = ...
     deduped_bytes: builtins.int = ...
+    file_stream_raw_bytes: builtins.int = ...
+    file_stream_sent_bytes: builtins.int = ...
 
     def __init__(self,
         *,
         uploaded_bytes : builtins.int = ...,
         total_bytes : builtins.int = ...,
         deduped_bytes : builtins.int = ...,
+        file_stream_raw_bytes : builtins.int = ...,
+        file_stream_sent_bytes : builtins.int = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"deduped_bytes",b"deduped_bytes",u"total_bytes",b"total_bytes",u"uploaded_bytes",b"uploaded_bytes"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"deduped_bytes",b"deduped_bytes",u"file_stream_raw_bytes",b"file_stream_raw_bytes",u"file_stream_sent_bytes",b"file_stream_sent_bytes",u"total_bytes",b"total_bytes",u"uploaded_bytes",b"uploaded_bytes"]) -> None: ...
 global___FilePusherStats = FilePusherStats
 
+class FileStreamStats(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    PENDING_CHUNKS_FIELD_NUMBER: builtins.int
+    INFLIGHT_REQUESTS_FIELD_NUMBER: builtins.int
+    SENT_CHUNKS_FIELD_NUMBER: builtins.int
+    DROPPED_CHUNKS_FIELD_NUMBER: builtins.int
+    LAG_SECONDS_FIELD_NUMBER: builtins.int
+    SPOOLED_BYTES_FIELD_NUMBER: builtins.int
+    pending_chunks: builtins.int = ...
+    inflight_requests: builtins.int = ...
+    sent_chunks: builtins.int = ...
+    dropped_chunks: builtins.int = ...
+    lag_seconds: builtins.float = ...
+    spooled_bytes: builtins.int = ...
+
+    def __init__(self,
+        *,
+        pending_chunks : builtins.int = ...,
+        inflight_requests : builtins.int = ...,
+        sent_chunks : builtins.int = ...,
+        dropped_chunks : builtins.int = ...,
+        lag_seconds : builtins.float = ...,
+        spooled_bytes : builtins.int = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"dropped_chunks",b"dropped_chunks",u"inflight_requests",b"inflight_requests",u"lag_seconds",b"lag_seconds",u"pending_chunks",b"pending_chunks",u"sent_chunks",b"sent_chunks",u"spooled_bytes",b"spooled_bytes"]) -> None: ...
+global___FileStreamStats = FileStreamStats
+
 class LocalInfo(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     VERSION_FIELD_NUMBER: builtins.int
@@ -1911,6 +1960,50 @@ class PartialHistoryResponse(google.protobuf.message.Message):
         ) -> None: ...
 global___PartialHistoryResponse = PartialHistoryResponse
 
+class HistoryColumn(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    KEY_FIELD_NUMBER: builtins.int
+    ROW_FIELD_NUMBER: builtins.int
+    VALUES_FLOAT_FIELD_NUMBER: builtins.int
+    VALUES_INT_FIELD_NUMBER: builtins.int
+    key: typing.Text = ...
+    row: google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int] = ...
+    values_float: google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.float] = ...
+    values_int: google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int] = ...
+
+    def __init__(self,
+        *,
+        key : typing.Text = ...,
+        row : typing.Optional[typing.Iterable[builtins.int]] = ...,
+        values_float : typing.Optional[typing.Iterable[builtins.float]] = ...,
+        values_int : typing.Optional[typing.Iterable[builtins.int]] = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"key",b"key",u"row",b"row",u"values_float",b"values_float",u"values_int",b"values_int"]) -> None: ...
+global___HistoryColumn = HistoryColumn
+
+class PartialHistoryBatchRequest(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    NUM_ROWS_FIELD_NUMBER: builtins.int
+    COLUMN_FIELD_NUMBER: builtins.int
+    _INFO_FIELD_NUMBER: builtins.int
+    num_rows: builtins.int = ...
+
+    @property
+    def column(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___HistoryColumn]: ...
+
+    @property
+    def _info(self) -> wandb.proto.wandb_base_pb2._RequestInfo: ...
+
+    def __init__(self,
+        *,
+        num_rows : builtins.int = ...,
+        column : typing.Optional[typing.Iterable[global___HistoryColumn]] = ...,
+        _info : typing.Optional[wandb.proto.wandb_base_pb2._RequestInfo] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"_info",b"_info"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"column",b"column",u"num_rows",b"num_rows"]) -> None: ...
+global___PartialHistoryBatchRequest = PartialHistoryBatchRequest
+
 class SampledHistoryRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     _INFO_FIELD_NUMBER: builtins.int
@@ -76,6 +76,11 @@ class InternalServiceStub(object):
                 request_serializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryRequest.SerializeToString,
                 response_deserializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryResponse.FromString,
                 )
+        self.PartialLogBatch = channel.unary_unary(
+                '/wandb_internal.InternalService/PartialLogBatch',
+                request_serializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryBatchRequest.SerializeToString,
+                response_deserializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryResponse.FromString,
+                )
         self.Log = channel.unary_unary(
                 '/wandb_internal.InternalService/Log',
                 request_serializer=wandb_dot_proto_dot_wandb__internal__pb2.HistoryRecord.SerializeToString,
@@ -268,6 +273,12 @@ class InternalServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PartialLogBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Log(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -470,6 +481,11 @@ def add_InternalServiceServicer_to_server(servicer, server):
                     request_deserializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryRequest.FromString,
                     response_serializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryResponse.SerializeToString,
             ),
+            'PartialLogBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PartialLogBatch,
+                    request_deserializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryBatchRequest.FromString,
+                    response_serializer=wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryResponse.SerializeToString,
+            ),
             'Log': grpc.unary_unary_rpc_method_handler(
                     servicer.Log,
                     request_deserializer=wandb_dot_proto_dot_wandb__internal__pb2.HistoryRecord.FromString,
@@ -799,6 +815,23 @@ class InternalService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def PartialLogBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/wandb_internal.InternalService/PartialLogBatch',
+            wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryBatchRequest.SerializeToString,
+            wandb_dot_proto_dot_wandb__internal__pb2.PartialHistoryResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Log(request,
             target,
@@ -58,6 +58,10 @@ class InternalServiceStub:
         request: wandb.proto.wandb_internal_pb2.PartialHistoryRequest,
     ) -> wandb.proto.wandb_internal_pb2.PartialHistoryResponse: ...
 
+    def PartialLogBatch(self,
+        request: wandb.proto.wandb_internal_pb2.PartialHistoryBatchRequest,
+    ) -> wandb.proto.wandb_internal_pb2.PartialHistoryResponse: ...
+
     def Log(self,
         request: wandb.proto.wandb_internal_pb2.HistoryRecord,
     ) -> wandb.proto.wandb_internal_pb2.HistoryResult: ...
@@ -224,6 +228,12 @@ class InternalServiceServicer(metaclass=abc.ABCMeta):
         context: grpc.ServicerContext,
     ) -> wandb.proto.wandb_internal_pb2.PartialHistoryResponse: ...
 
+    @abc.abstractmethod
+    def PartialLogBatch(self,
+        request: wandb.proto.wandb_internal_pb2.PartialHistoryBatchRequest,
+        context: grpc.ServicerContext,
+    ) -> wandb.proto.wandb_internal_pb2.PartialHistoryResponse: ...
+
     @abc.abstractmethod
     def Log(self,
         request: wandb.proto.wandb_internal_pb2.HistoryRecord,
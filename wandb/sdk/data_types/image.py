@@ -1,8 +1,21 @@
+import concurrent.futures
 import hashlib
 from io import BytesIO
 import logging
 import os
-from typing import Any, cast, Dict, List, Optional, Sequence, Type, TYPE_CHECKING, Union
+import threading
+from typing import (
+    Any,
+    cast,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+    Union,
+)
 
 from pkg_resources import parse_version
 import wandb
@@ -40,6 +53,89 @@ def _server_accepts_image_filenames() -> bool:
     return parse_version("0.12.10") <= parse_version(max_cli_version)
 
 
+class ImageEncoder(object):
+    """Encodes images to files in the media staging dir on worker threads.
+
+    Arguments:
+        format: (string) file format of the images, one of "png", "jpg" or
+            "webp".
+        quality: (int) quality of jpg and webp images, from 1 to 100.
+        compress_level: (int) zlib compression level of png images, from 0
+            to 9.  Lower levels encode faster into larger files.
+        max_workers: (int) number of threads encoding images.
+
+    Examples:
+        ### Log jpg images
+        ```python
+        wandb.Image.encoder = wandb.data_types.ImageEncoder("jpg", quality=90)
+        ```
+    """
+
+    FORMATS = {"png": "PNG", "jpg": "JPEG", "jpeg": "JPEG", "webp": "WEBP"}
+    # modes that can be saved as jpg without conversion
+    JPEG_MODES = ("1", "L", "RGB", "CMYK")
+
+    def __init__(
+        self,
+        format: str = "png",
+        quality: Optional[int] = None,
+        compress_level: Optional[int] = None,
+        max_workers: int = 4,
+    ) -> None:
+        format = format.lower()
+        if format not in self.FORMATS:
+            raise ValueError(
+                "Unsupported image format %s, must be one of %s"
+                % (format, ", ".join(self.FORMATS))
+            )
+        self.format = format
+        self.quality = quality
+        self.compress_level = compress_level
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def encode(self, image: "PIL.Image") -> Tuple[str, str, int]:
+        """Write an image to a new file, returns its path, sha256 and size."""
+        pil_format = self.FORMATS[self.format]
+        kwargs: Dict[str, Any] = {}
+        if pil_format == "PNG":
+            kwargs["transparency"] = None
+            if self.compress_level is not None:
+                kwargs["compress_level"] = self.compress_level
+        elif self.quality is not None:
+            kwargs["quality"] = self.quality
+        if pil_format == "JPEG" and image.mode not in self.JPEG_MODES:
+            image = image.convert("RGB")
+
+        buf = BytesIO()
+        image.save(buf, format=pil_format, **kwargs)
+        data = buf.getvalue()
+        path = os.path.join(MEDIA_TMP.name, str(util.generate_id()) + "." + self.format)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path, hashlib.sha256(data).hexdigest(), len(data)
+
+    def submit(self, image: "PIL.Image") -> "concurrent.futures.Future":
+        """Encode an image on a worker thread."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="wandb-image"
+                )
+        return self._executor.submit(self.encode, image)
+
+
+class _Uint8Image(object):
+    """Image data already converted by `Image.to_uint8`."""
+
+    __slots__ = ("data", "mode")
+
+    def __init__(self, data: "np.ndarray", mode: Optional[str] = None) -> None:
+        self.data = data
+        self.mode = mode
+
+
 class Image(BatchableMedia):
     """Format images for logging to W&B.
 
@@ -50,6 +146,9 @@ class Image(BatchableMedia):
         mode: (string) The PIL mode for an image. Most common are "L", "RGB",
             "RGBA". Full explanation at https://pillow.readthedocs.io/en/4.2.x/handbook/concepts.html#concept-modes.
         caption: (string) Label for display of image.
+        encoder: (ImageEncoder) encoder of the image file, defaults to
+            `Image.encoder`. Images from arrays and tensors are encoded on
+            the worker threads of the encoder.
 
     Examples:
         ### Create a wandb.Image from a numpy array
@@ -87,6 +186,8 @@ class Image(BatchableMedia):
 
     MAX_ITEMS = 108
 
+    encoder = ImageEncoder()
+
     # PIL limit
     MAX_DIMENSION = 65500
 
@@ -101,6 +202,7 @@ class Image(BatchableMedia):
     _classes: Optional["Classes"]
     _boxes: Optional[Dict[str, "BoundingBoxes2D"]]
     _masks: Optional[Dict[str, "ImageMask"]]
+    _encoding: Optional["concurrent.futures.Future"]
 
     def __init__(
         self,
@@ -111,6 +213,7 @@ class Image(BatchableMedia):
         classes: Optional[Union["Classes", Sequence[dict]]] = None,
         boxes: Optional[Union[Dict[str, "BoundingBoxes2D"], Dict[str, dict]]] = None,
         masks: Optional[Union[Dict[str, "ImageMask"], Dict[str, dict]]] = None,
+        encoder: Optional[ImageEncoder] = None,
     ) -> None:
         super(Image, self).__init__()
         # TODO: We should remove grouping, it's a terrible name and I don't
@@ -124,6 +227,7 @@ class Image(BatchableMedia):
         self._classes = None
         self._boxes = None
         self._masks = None
+        self._encoding = None
 
         # Allows the user to pass an Image object as the first parameter and have a perfect copy,
         # only overriding additional metdata passed in. If this pattern is compelling, we can generalize.
@@ -132,7 +236,7 @@ class Image(BatchableMedia):
         elif isinstance(data_or_path, str):
             self._initialize_from_path(data_or_path)
         else:
-            self._initialize_from_data(data_or_path, mode)
+            self._initialize_from_data(data_or_path, mode, encoder or self.encoder)
 
         self._set_initialization_meta(grouping, caption, classes, boxes, masks)
 
@@ -200,6 +304,7 @@ class Image(BatchableMedia):
         self._free_ram()
 
     def _initialize_from_wbimage(self, wbimage: "Image") -> None:
+        wbimage._finish_encoding()
         self._grouping = wbimage._grouping
         self._caption = wbimage._caption
         self._width = wbimage._width
@@ -230,17 +335,30 @@ class Image(BatchableMedia):
         ext = os.path.splitext(path)[1][1:]
         self.format = ext
 
-    def _initialize_from_data(self, data: "ImageDataType", mode: str = None,) -> None:
+    def _initialize_from_data(
+        self,
+        data: Union["ImageDataType", _Uint8Image],
+        mode: str = None,
+        encoder: Optional[ImageEncoder] = None,
+    ) -> None:
         pil_image = util.get_module(
             "PIL.Image",
             required='wandb.Image needs the PIL package. To get it, run "pip install pillow".',
         )
-        if util.is_matplotlib_typename(util.get_full_typename(data)):
+        encoder = encoder or self.encoder
+        if isinstance(data, _Uint8Image):
+            self._image = pil_image.fromarray(
+                data.data, mode=data.mode or self.guess_mode(data.data)
+            )
+        elif util.is_matplotlib_typename(util.get_full_typename(data)):
             buf = BytesIO()
             util.ensure_matplotlib_figure(data).savefig(buf)
             self._image = pil_image.open(buf)
         elif isinstance(data, pil_image.Image):
+            # the caller can still modify its image, it is encoded right away
             self._image = data
+            self._set_encoded_file(*encoder.encode(data), encoder.format)
+            return
         elif util.is_pytorch_tensor_typename(util.get_full_typename(data)):
             vis_util = util.get_module(
                 "torchvision.utils", "torchvision is required to render images"
@@ -260,10 +378,89 @@ class Image(BatchableMedia):
                 self.to_uint8(data), mode=mode or self.guess_mode(data)
             )
 
-        tmp_path = os.path.join(MEDIA_TMP.name, str(util.generate_id()) + ".png")
-        self.format = "png"
-        self._image.save(tmp_path, transparency=None)
-        self._set_file(tmp_path, is_tmp=True)
+        # nothing else holds on to the image, it can be encoded in the background
+        self.format = encoder.format
+        self._encoding = encoder.submit(self._image)
+
+    def _set_encoded_file(self, path: str, sha256: str, size: int, format: str) -> None:
+        self._path = path
+        self._is_tmp = True
+        self._extension = None
+        self._sha256 = sha256
+        self._size = size
+        self.format = format
+
+    def _finish_encoding(self) -> None:
+        """Wait for the file of the image to be encoded."""
+        if self._encoding is None:
+            return
+        encoding = self._encoding
+        self._encoding = None
+        self._set_encoded_file(*encoding.result(), self.format)
+        self._free_ram()
+
+    def file_is_set(self) -> bool:
+        self._finish_encoding()
+        return super(Image, self).file_is_set()
+
+    @classmethod
+    def from_batch(
+        cls: Type["Image"],
+        data: Union["np.ndarray", "TorchTensorType", Sequence["np.ndarray"]],
+        mode: Optional[str] = None,
+        captions: Optional[Sequence[str]] = None,
+        encoder: Optional[ImageEncoder] = None,
+        **kwargs: Any,
+    ) -> List["Image"]:
+        """Create an Image for every image of a batch.
+
+        The whole batch is converted to uint8 at once, and the images are
+        encoded on the worker threads of the encoder.
+
+        Arguments:
+            data: (numpy array, torch tensor or list of arrays) batch of
+                images, with the batch on the first axis. Torch tensors can
+                have their channels first.
+            mode: (string) The PIL mode of the images.
+            captions: (list) caption of every image.
+            encoder: (ImageEncoder) encoder of the image files.
+            **kwargs: passed to every Image.
+        """
+        np = util.get_module(
+            "numpy",
+            required="wandb.Image requires numpy if not supplying PIL Images: pip install numpy",
+        )
+        if util.is_pytorch_tensor_typename(util.get_full_typename(data)):
+            if hasattr(data, "requires_grad") and data.requires_grad:
+                data = data.detach()
+            data = data.cpu().numpy()
+            if (
+                data.ndim == 4
+                and data.shape[1] in (1, 3, 4)
+                and data.shape[-1] not in (1, 3, 4)
+            ):
+                data = data.transpose(0, 2, 3, 1)
+        elif hasattr(data, "numpy"):  # TF data eager tensors
+            data = data.numpy()
+        data = np.asarray(data)
+        if captions is not None and len(captions) != len(data):
+            raise ValueError("from_batch needs one caption per image")
+        if data.ndim > 3:
+            # get rid of trivial dimensions as a convenience, but keep the batch
+            data = data.reshape(
+                (len(data),) + tuple(d for d in data.shape[1:] if d != 1)
+            )
+
+        batch = cls.batch_to_uint8(data)
+        return [
+            cls(
+                _Uint8Image(image, mode),  # type: ignore
+                caption=captions[i] if captions is not None else None,
+                encoder=encoder,
+                **kwargs,
+            )
+            for i, image in enumerate(batch)
+        ]
 
     @classmethod
     def from_json(
@@ -327,6 +524,7 @@ class Image(BatchableMedia):
                 )
 
     def to_json(self, run_or_artifact: Union["LocalRun", "LocalArtifact"]) -> dict:
+        self._finish_encoding()
         json_dict = super(Image, self).to_json(run_or_artifact)
         json_dict["_type"] = Image._log_type
         json_dict["format"] = self.format
@@ -414,6 +612,34 @@ class Image(BatchableMedia):
         # assert issubclass(data.dtype.type, np.integer), 'Illegal image format.'
         return data.clip(0, 255).astype(np.uint8)
 
+    @classmethod
+    def batch_to_uint8(cls, data: "np.ndarray") -> "np.ndarray":
+        """
+        Converts a batch of images to uint8 like `to_uint8` does, with the
+        range of every image checked on its own.
+        """
+        np = util.get_module(
+            "numpy",
+            required="wandb.Image requires numpy if not supplying PIL Images: pip install numpy",
+        )
+        if data.dtype == np.uint8:
+            # only images in the range 0...1 are rescaled
+            scale = data.reshape(len(data), -1).max(axis=1) <= 1
+            if not scale.any():
+                # the images are encoded later, the caller may reuse its buffer
+                return data.copy()
+            data = data.astype(np.int32)
+        axes = tuple(range(1, data.ndim))
+        shape = (len(data),) + (1,) * (data.ndim - 1)
+
+        dmin = data.min(axis=axes).reshape(shape)
+        if (dmin < 0).any():
+            ptp = data.max(axis=axes).reshape(shape) - dmin
+            data = np.where(dmin < 0, (data - dmin) / np.where(ptp == 0, 1, ptp), data)
+        dmax = data.max(axis=axes).reshape(shape)
+        data = np.where(dmax <= 1.0, data * 255, data)
+        return data.clip(0, 255).astype(np.uint8)
+
     @classmethod
     def seq_to_json(
         cls: Type["Image"],
@@ -573,7 +799,7 @@ class Image(BatchableMedia):
         return res
 
     def _free_ram(self) -> None:
-        if self._path is not None:
+        if self._path is not None and self._encoding is None:
             self._image = None
 
     @property
@@ -1,10 +1,17 @@
+import atexit
 import base64
 import binascii
 import codecs
 import contextlib
 import hashlib
+import logging
 import os
+import platform
 import random
+import shutil
+import threading
+import time
+import weakref
 from typing import (
     Callable,
     Dict,
@@ -25,6 +32,18 @@ from wandb.data_types import WBValue
 if TYPE_CHECKING:
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
 
+try:
+    import sqlite3
+except ImportError:  # python built without sqlite
+    sqlite3 = None  # type: ignore
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
 
 def md5_string(string: str) -> str:
     hash_md5 = hashlib.md5()
@@ -851,11 +870,410 @@ class StorageHandler(object):
         pass
 
 
+class _SqliteStore(object):
+    """A sqlite database in the artifacts cache dir, shared between processes.
+
+    Writes are buffered in `_pending` by subclasses. Any error with the
+    database turns the store off, and callers carry on without it.
+    """
+
+    _SCHEMA: Sequence[str] = ()
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disabled = sqlite3 is None
+        self._pending: Dict[str, Tuple] = {}
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _connect(self):
+        if self._conn is None and not self._disabled:
+            try:
+                conn = sqlite3.connect(
+                    self._path,
+                    timeout=30,
+                    check_same_thread=False,
+                    isolation_level=None,
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                for statement in self._SCHEMA:
+                    conn.execute(statement)
+                self._conn = conn
+            except sqlite3.Error as e:
+                self._disable(e)
+        return self._conn
+
+    def _disable(self, error: Exception) -> None:
+        logger.warning("Disabling %s: %s", self._path, error)
+        self._disabled = True
+        self._pending = {}
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class DigestCache(_SqliteStore):
+    """Persistent cache of file digests, keyed by the stat signature of a file.
+
+    A file is hashed again only when its inode, size or mtime changed. The
+    least recently used entries are evicted past `max_entries`. When the
+    database can't be used files are always hashed.
+    """
+
+    MAX_ENTRIES = 1000000
+    # files modified this recently may still change within the same mtime tick
+    RACY_SECONDS = 2
+    # last_used is only refreshed when it is older than this
+    TOUCH_SECONDS = 24 * 60 * 60
+    _FLUSH_ROWS = 1000
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS digests (path TEXT PRIMARY KEY,"
+        " inode INTEGER, size INTEGER, mtime_ns INTEGER, digest TEXT, last_used REAL)",
+        "CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used)",
+    )
+
+    def __init__(self, path: str, max_entries: Optional[int] = None) -> None:
+        super(DigestCache, self).__init__(path)
+        self._max_entries = max_entries or self.MAX_ENTRIES
+        self._rows_since_evict = 0
+
+    def md5_file_b64(self, path: str) -> str:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        now = time.time()
+        row = self._get(path)
+        if row is not None and tuple(row[:3]) == signature:
+            if now - row[4] > self.TOUCH_SECONDS:
+                self._put(path, signature, row[3], now)
+            return row[3]
+
+        digest = md5_file_b64(path)
+        if now - stat.st_mtime > self.RACY_SECONDS:
+            self._put(path, signature, digest, now)
+        return digest
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending or self._connect() is None:
+                return
+            rows = [(path,) + row for path, row in self._pending.items()]
+            self._pending = {}
+            try:
+                with self._transaction() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                self._rows_since_evict += len(rows)
+                if self._rows_since_evict >= self._FLUSH_ROWS:
+                    self._rows_since_evict = 0
+                    self._evict()
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def _get(self, path: str) -> Optional[Tuple]:
+        with self._lock:
+            if path in self._pending:
+                return self._pending[path]
+            if self._connect() is None:
+                return None
+            try:
+                return self._conn.execute(
+                    "SELECT inode, size, mtime_ns, digest, last_used FROM digests"
+                    " WHERE path = ?",
+                    (path,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+
+    def _put(self, path: str, signature: Tuple, digest: str, now: float) -> None:
+        with self._lock:
+            if self._disabled:
+                return
+            self._pending[path] = signature + (digest, now)
+            if len(self._pending) < self._FLUSH_ROWS:
+                return
+        self.flush()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM digests").fetchone()
+        if count <= self._max_entries:
+            return
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM digests WHERE path IN"
+                " (SELECT path FROM digests ORDER BY last_used LIMIT ?)",
+                (count - self._max_entries,),
+            )
+
+
+# indexes with pending rows to flush when the process exits
+_cache_indexes: "weakref.WeakSet[CacheIndex]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_cache_indexes() -> None:
+    for index in list(_cache_indexes):
+        index.flush()
+
+
+class CacheIndex(_SqliteStore):
+    """Size and last access time of the objects in the artifacts cache.
+
+    The cache evicts its least recently used objects through the index, so it
+    doesn't have to walk the cache dir or rely on atime, which is often not
+    updated. Objects the index doesn't know about, written by older versions
+    of wandb, are picked up by `rescan`.
+    """
+
+    _FLUSH_ROWS = 1000
+    # objects removed per transaction, so other processes aren't held up
+    _EVICT_ROWS = 100
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS objects (path TEXT PRIMARY KEY,"
+        " size INTEGER, last_access REAL)",
+        "CREATE INDEX IF NOT EXISTS objects_last_access ON objects (last_access)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)",
+    )
+
+    def __init__(
+        self, cache_dir: str, path: str, max_size: Optional[int] = None
+    ) -> None:
+        super(CacheIndex, self).__init__(path)
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._evict_event = threading.Event()
+        self._evict_thread: Optional[threading.Thread] = None
+        # the index of a new cache has all its objects from the start
+        self._new_cache = not os.path.isdir(os.path.join(cache_dir, "obj"))
+        # size of the objects added since the last flush
+        self._pending_added = 0
+        _cache_indexes.add(self)
+
+    @property
+    def disabled(self) -> bool:
+        return self._connect() is None
+
+    def _connect(self):
+        if self._conn is None and not self._disabled:
+            conn = super(CacheIndex, self)._connect()
+            if conn is not None and self._new_cache:
+                try:
+                    conn.execute("INSERT OR IGNORE INTO meta VALUES ('rescanned', 1)")
+                except sqlite3.Error as e:
+                    self._disable(e)
+        return self._conn
+
+    def touch(self, path: str, size: int) -> None:
+        """Record an access to a cached object."""
+        with self._lock:
+            if self._disabled:
+                return
+            self._pending[os.path.relpath(path, self._cache_dir)] = (size, time.time())
+            if len(self._pending) < self._FLUSH_ROWS:
+                return
+        self.flush()
+
+    def add(self, path: str, size: int) -> None:
+        """Record a new cached object, evicting others past the max size.
+
+        New objects are written in batches like accesses, the index is only
+        flushed early when the cache may have grown past its max size.
+        """
+        self.touch(path, size)
+        if self._max_size is None:
+            return
+        with self._lock:
+            self._pending_added += size
+            pending_added = self._pending_added
+        if self.total_size() + pending_added < self._max_size:
+            return
+        self.flush()
+        if self.total_size() >= self._max_size:
+            self._start_eviction()
+
+    def total_size(self) -> int:
+        with self._lock:
+            if self._connect() is None:
+                return 0
+            try:
+                return self._get_meta("total_size")
+            except sqlite3.Error as e:
+                self._disable(e)
+                return 0
+
+    def needs_rescan(self) -> bool:
+        with self._lock:
+            if self._connect() is None:
+                return False
+            try:
+                return not self._get_meta("rescanned")
+            except sqlite3.Error as e:
+                self._disable(e)
+                return False
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending or self._connect() is None:
+                return
+            rows = self._pending
+            self._pending = {}
+            self._pending_added = 0
+            try:
+                with self._transaction() as conn:
+                    delta = 0
+                    for path, (size, last_access) in rows.items():
+                        row = conn.execute(
+                            "SELECT size FROM objects WHERE path = ?", (path,)
+                        ).fetchone()
+                        delta += size - (row[0] if row else 0)
+                        conn.execute(
+                            "INSERT OR REPLACE INTO objects VALUES (?, ?, ?)",
+                            (path, size, last_access),
+                        )
+                    self._set_meta("total_size", self._get_meta("total_size") + delta)
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def evict(self, target_size: int) -> int:
+        """Remove least recently used objects until the cache is below target_size.
+
+        Returns:
+            (int): The number of bytes reclaimed
+        """
+        self.flush()
+        bytes_reclaimed = 0
+        done = False
+        while not done:
+            with self._lock:
+                if self._connect() is None:
+                    break
+                try:
+                    with self._transaction() as conn:
+                        total_size = self._get_meta("total_size")
+                        rows = conn.execute(
+                            "SELECT path, size FROM objects"
+                            " ORDER BY last_access LIMIT ?",
+                            (self._EVICT_ROWS,),
+                        ).fetchall()
+                        done = len(rows) < self._EVICT_ROWS
+                        removed = []
+                        for path, size in rows:
+                            if total_size < target_size:
+                                done = True
+                                break
+                            try:
+                                os.remove(os.path.join(self._cache_dir, path))
+                                bytes_reclaimed += size
+                            except OSError:
+                                pass
+                            total_size -= size
+                            removed.append((path,))
+                        conn.executemany("DELETE FROM objects WHERE path = ?", removed)
+                        self._set_meta("total_size", total_size)
+                except sqlite3.Error as e:
+                    self._disable(e)
+                    break
+        return bytes_reclaimed
+
+    def rescan(self) -> int:
+        """Rebuild the index from the files in the cache dir.
+
+        Leftover temporary files are removed, and objects the index didn't
+        know about are added with their atime as last access.
+
+        Returns:
+            (int): The number of bytes reclaimed by removing temporary files
+        """
+        self.flush()
+        bytes_reclaimed = 0
+        found = {}
+        for root, _, files in os.walk(self._cache_dir):
+            # the databases of the cache are not cached objects
+            if root == self._cache_dir:
+                continue
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                    if file.startswith(ArtifactsCache._TMP_PREFIX):
+                        os.remove(path)
+                        bytes_reclaimed += stat.st_size
+                        continue
+                except OSError:
+                    continue
+                found[os.path.relpath(path, self._cache_dir)] = stat
+
+        with self._lock:
+            if self._connect() is None:
+                return bytes_reclaimed
+            try:
+                with self._transaction() as conn:
+                    last_access = dict(
+                        conn.execute("SELECT path, last_access FROM objects")
+                    )
+                    conn.execute("DELETE FROM objects")
+                    conn.executemany(
+                        "INSERT INTO objects VALUES (?, ?, ?)",
+                        (
+                            (path, stat.st_size, last_access.get(path, stat.st_atime),)
+                            for path, stat in found.items()
+                        ),
+                    )
+                    self._set_meta(
+                        "total_size", sum(stat.st_size for stat in found.values())
+                    )
+                    self._set_meta("rescanned", 1)
+            except sqlite3.Error as e:
+                self._disable(e)
+        return bytes_reclaimed
+
+    def _get_meta(self, key: str) -> int:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _set_meta(self, key: str, value: int) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def _start_eviction(self) -> None:
+        with self._lock:
+            if self._evict_thread is None:
+                self._evict_thread = threading.Thread(
+                    target=self._evict_thread_body, name="CacheEvictThr"
+                )
+                self._evict_thread.daemon = True
+                self._evict_thread.start()
+        self._evict_event.set()
+
+    def _evict_thread_body(self) -> None:
+        while True:
+            self._evict_event.wait()
+            self._evict_event.clear()
+            self.evict(self._max_size)
+
+
 class ArtifactsCache(object):
 
     _TMP_PREFIX = "tmp"
+    _DIGESTS_NAME = "digests.db"
+    _INDEX_NAME = "index.db"
 
-    def __init__(self, cache_dir):
+    def __init__(self, cache_dir, max_size=None):
         self._cache_dir = cache_dir
         util.mkdir_exists_ok(self._cache_dir)
         self._md5_obj_dir = os.path.join(self._cache_dir, "obj", "md5")
@@ -864,12 +1282,32 @@ class ArtifactsCache(object):
         self._random = random.Random()
         self._random.seed()
         self._artifacts_by_client_id = {}
+        self._digest_cache = DigestCache(
+            os.path.join(self._cache_dir, ArtifactsCache._DIGESTS_NAME)
+        )
+        self._index = CacheIndex(
+            self._cache_dir,
+            os.path.join(self._cache_dir, ArtifactsCache._INDEX_NAME),
+            max_size=max_size,
+        )
+
+    def md5_file_b64(self, path: str) -> str:
+        """Return the md5 of a file, reusing it if the file has not changed."""
+        return self._digest_cache.md5_file_b64(path)
+
+    def flush_digests(self) -> None:
+        self._digest_cache.flush()
+
+    def add_obj_path(self, path: str) -> None:
+        """Record an object written to the cache without the cache opener."""
+        self._index.add(path, os.path.getsize(path))
 
     def check_md5_obj_path(self, b64_md5: str, size: int) -> Tuple[str, bool, Callable]:
         hex_md5 = util.bytes_to_hex(base64.b64decode(b64_md5))
         path = os.path.join(self._cache_dir, "obj", "md5", hex_md5[:2], hex_md5[2:])
         opener = self._cache_opener(path)
         if os.path.isfile(path) and os.path.getsize(path) == size:
+            self._index.touch(path, size)
             return path, True, opener
         util.mkdir_exists_ok(os.path.dirname(path))
         return path, False, opener
@@ -878,6 +1316,7 @@ class ArtifactsCache(object):
         path = os.path.join(self._cache_dir, "obj", "etag", etag[:2], etag[2:])
         opener = self._cache_opener(path)
         if os.path.isfile(path) and os.path.getsize(path) == size:
+            self._index.touch(path, size)
             return path, True, opener
         util.mkdir_exists_ok(os.path.dirname(path))
         return path, False, opener
@@ -894,11 +1333,29 @@ class ArtifactsCache(object):
     def store_client_artifact(self, artifact):
         self._artifacts_by_client_id[artifact._client_id] = artifact
 
-    def cleanup(self, target_size: int) -> int:
+    def cleanup(self, target_size: int, rescan: bool = False) -> int:
+        """Remove the least recently used objects until the cache is below target_size.
+
+        The cache dir is only walked when the index is new, or with `rescan`.
+
+        Returns:
+            (int): The number of bytes reclaimed
+        """
+        if self._index.disabled:
+            return self._cleanup_walk(target_size)
+        bytes_reclaimed = 0
+        if rescan or self._index.needs_rescan():
+            bytes_reclaimed += self._index.rescan()
+        return bytes_reclaimed + self._index.evict(target_size)
+
+    def _cleanup_walk(self, target_size: int) -> int:
         bytes_reclaimed: int = 0
         paths: Dict[os.PathLike, os.stat_result] = {}
         total_size: int = 0
         for root, _, files in os.walk(self._cache_dir):
+            # the databases of the cache are not cached objects
+            if root == self._cache_dir:
+                continue
             for file in files:
                 path = os.path.join(root, file)
                 stat = os.stat(path)
@@ -963,10 +1420,67 @@ class ArtifactsCache(object):
                 os.replace(tmp_file, path)
             except AttributeError:
                 os.rename(tmp_file, path)
+            self.add_obj_path(path)
 
         return helper
 
 
+# ioctl cloning a file on filesystems with copy on write (btrfs, xfs)
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> None:
+    if fcntl is None or platform.system() != "Linux":
+        raise OSError("reflinks are not supported on this platform")
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+
+
+def place_file(src: str, dst: str) -> str:
+    """Place a file of the artifacts cache at dst without copying it if we can.
+
+    By default the file is cloned with a reflink where the filesystem supports
+    it, and copied otherwise. Either way writes to dst leave the cache alone.
+    Setting WANDB_ARTIFACT_LINK_TYPE to "hardlink" hardlinks the file instead,
+    dst then shares its contents with the cache and must not be modified.
+    "copy" always copies the file.
+
+    Returns:
+        (str): How the file was placed, "reflink", "hardlink" or "copy"
+    """
+    tmp_path = os.path.join(
+        os.path.dirname(dst),
+        ".%s.%s.tmp" % (os.path.basename(dst), util.rand_alphanumeric()),
+    )
+    link_type = env.get_artifact_link_type()
+    method = "copy"
+    try:
+        if link_type == "auto":
+            try:
+                _reflink(src, tmp_path)
+                shutil.copystat(src, tmp_path)
+                method = "reflink"
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        elif link_type == "hardlink":
+            try:
+                os.link(src, tmp_path)
+                method = "hardlink"
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        if method == "copy":
+            # copy2 keeps the modified time, used to tell if the file changed
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return method
+
+
 _artifacts_cache = None
 
 
@@ -974,5 +1488,8 @@ def get_artifacts_cache() -> ArtifactsCache:
     global _artifacts_cache
     if _artifacts_cache is None:
         cache_dir = os.path.join(env.get_cache_dir(), "artifacts")
-        _artifacts_cache = ArtifactsCache(cache_dir)
+        max_size = env.get_artifact_cache_max_size()
+        _artifacts_cache = ArtifactsCache(
+            cache_dir, max_size=util.from_human_size(max_size) if max_size else None
+        )
     return _artifacts_cache
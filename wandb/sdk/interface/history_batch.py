@@ -0,0 +1,118 @@
+#
+"""History Batch.
+
+This module implements a columnar buffer of scalar-only history rows.  Rows
+are accumulated per key in typed arrays and converted to a single
+PartialHistoryBatchRequest, which the internal process unpacks back into
+regular history rows.
+"""
+
+from array import array
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from wandb.proto import wandb_internal_pb2 as pb
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _typecode(v: Any) -> Optional[str]:
+    # bool is a subclass of int but must round trip as true/false, so
+    # compare exact types rather than isinstance()
+    t = type(v)
+    if t is float:
+        return "d"
+    if t is int and _INT64_MIN <= v <= _INT64_MAX:
+        return "q"
+    return None
+
+
+class HistoryBatch(object):
+    """Accumulates history rows made only of int and float values."""
+
+    _columns: Dict[str, Tuple[str, "array[int]", "array[Any]"]]
+    _num_rows: int
+
+    def __init__(self) -> None:
+        self._columns = {}
+        self._num_rows = 0
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def add(self, row: Dict[str, Any]) -> bool:
+        """Append a row, returns False if the row cannot be batched.
+
+        A row is rejected if it holds a non scalar value, or if a value has a
+        different type than earlier values of the same key in this batch.
+        """
+        if not row:
+            return False
+        columns = self._columns
+        typecodes = []
+        for k, v in row.items():
+            typecode = _typecode(v)
+            if typecode is None:
+                return False
+            column = columns.get(k)
+            if column is not None and column[0] != typecode:
+                return False
+            typecodes.append(typecode)
+
+        row_num = self._num_rows
+        for typecode, (k, v) in zip(typecodes, row.items()):
+            column = columns.get(k)
+            if column is None:
+                column = (typecode, array("i"), array(typecode))
+                columns[k] = column
+            column[1].append(row_num)
+            column[2].append(v)
+        self._num_rows += 1
+        return True
+
+    def clear(self) -> None:
+        self._columns = {}
+        self._num_rows = 0
+
+    def to_proto(self) -> pb.PartialHistoryBatchRequest:
+        batch = pb.PartialHistoryBatchRequest()
+        batch.num_rows = self._num_rows
+        for k, (typecode, rows, values) in self._columns.items():
+            column = batch.column.add()
+            column.key = k
+            # dense columns do not need row indexes
+            if len(rows) != self._num_rows:
+                column.row.extend(rows)
+            if typecode == "d":
+                column.values_float.extend(values)
+            else:
+                column.values_int.extend(values)
+        return batch
+
+
+def rows_from_proto(batch: pb.PartialHistoryBatchRequest) -> List[Dict[str, Any]]:
+    """Unpack a PartialHistoryBatchRequest into a list of history dicts."""
+    rows: List[Dict[str, Any]] = [{} for _ in range(batch.num_rows)]
+    for column in batch.column:
+        key = column.key
+        values = column.values_float or column.values_int
+        row_nums = column.row or range(batch.num_rows)
+        for row_num, v in zip(row_nums, values):
+            rows[row_num][key] = v
+    return rows
+
+
+def json_rows_from_proto(batch: pb.PartialHistoryBatchRequest) -> List[Dict[str, str]]:
+    """Unpack a PartialHistoryBatchRequest into history rows of JSON values."""
+    rows: List[Dict[str, str]] = [{} for _ in range(batch.num_rows)]
+    for column in batch.column:
+        key = column.key
+        if column.values_float:
+            values = [json.dumps(v) for v in column.values_float]
+        else:
+            values = [str(v) for v in column.values_int]
+        row_nums = column.row or range(batch.num_rows)
+        for row_num, v in zip(row_nums, values):
+            rows[row_num][key] = v
+    return rows
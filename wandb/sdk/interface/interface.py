@@ -30,6 +30,7 @@ from wandb.util import (
 )
 
 from . import summary_record as sr
+from .history_batch import HistoryBatch
 from .artifacts import ArtifactManifest
 from .message_future import MessageFuture
 from ..data_types.utils import history_dict_to_json, val_to_json
@@ -542,6 +543,15 @@ class InterfaceBase(object):
     def _publish_partial_history(self, history: pb.PartialHistoryRequest) -> None:
         raise NotImplementedError
 
+    def publish_partial_history_batch(self, batch: HistoryBatch) -> None:
+        self._publish_partial_history_batch(batch.to_proto())
+
+    @abstractmethod
+    def _publish_partial_history_batch(
+        self, batch: pb.PartialHistoryBatchRequest
+    ) -> None:
+        raise NotImplementedError
+
     def publish_history(
         self, data: dict, step: int = None, run: "Run" = None, publish_step: bool = True
     ) -> None:
@@ -117,6 +117,13 @@ class InterfaceGrpc(InterfaceBase):
         self._assign(partial_history)
         _ = self._stub.PartialLog(partial_history)
 
+    def _publish_partial_history_batch(
+        self, partial_history_batch: pb.PartialHistoryBatchRequest
+    ) -> None:
+        assert self._stub
+        self._assign(partial_history_batch)
+        _ = self._stub.PartialLogBatch(partial_history_batch)
+
     def _publish_history(self, history: pb.HistoryRecord) -> None:
         assert self._stub
         self._assign(history)
@@ -60,6 +60,12 @@ class InterfaceShared(InterfaceBase):
         rec = self._make_request(partial_history=partial_history)
         self._publish(rec)
 
+    def _publish_partial_history_batch(
+        self, partial_history_batch: pb.PartialHistoryBatchRequest
+    ) -> None:
+        rec = self._make_request(partial_history_batch=partial_history_batch)
+        self._publish(rec)
+
     def _publish_history(self, history: pb.HistoryRecord) -> None:
         rec = self._make_record(history=history)
         self._publish(rec)
@@ -99,6 +105,7 @@ class InterfaceShared(InterfaceBase):
         network_status: pb.NetworkStatusRequest = None,
         poll_exit: pb.PollExitRequest = None,
         partial_history: pb.PartialHistoryRequest = None,
+        partial_history_batch: pb.PartialHistoryBatchRequest = None,
         sampled_history: pb.SampledHistoryRequest = None,
         run_start: pb.RunStartRequest = None,
         check_version: pb.CheckVersionRequest = None,
@@ -128,6 +135,8 @@ class InterfaceShared(InterfaceBase):
             request.poll_exit.CopyFrom(poll_exit)
         elif partial_history:
             request.partial_history.CopyFrom(partial_history)
+        elif partial_history_batch:
+            request.partial_history_batch.CopyFrom(partial_history_batch)
         elif sampled_history:
             request.sampled_history.CopyFrom(sampled_history)
         elif run_start:
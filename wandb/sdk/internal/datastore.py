@@ -15,12 +15,46 @@ header :=
   ident: char[4]
   magic: uint16
   version: uint8
+
+Starting with version 1 the data of every (reassembled) record is prefixed
+with a codec byte, the rest of the data is stored as is or compressed.  Logs
+are only written as version 1 when compression is enabled, uncompressed logs
+keep the version 0 layout so that older clients can read them:
+
+data :=
+  codec: uint8         // One of NONE, ZLIB, ZSTD
+  payload: uint8[]
+
+Records are written through an in-memory buffer, whole blocks are written to
+the file as they fill up and the last partial block is only written by
+flush().  Whether and when written data is fsynced is up to the caller.
+
+Files opened for scanning are memory mapped.  An optional sidecar index
+(fname + ".idx") records the offset, record type and history step of every
+record so that readers can seek to a record number or a history step.
+An index whose check does not match the file, eg. because the file was
+replaced, is rebuilt:
+
+index :=
+  ident: char[4]
+  magic: uint16
+  version: uint8
+  count: uint64        // number of records indexed
+  end: uint64          // file offset where indexing stopped
+  check: uint32        // crc32 of the (at most one block of) data before end
+  offsets: uint64[count]
+  types: uint32[count] // Record oneof field number, 0 if unknown
+  steps: int64[count]  // history step, -1 if not a history record
 """
 from __future__ import print_function
 
+from array import array
+import bisect
 import logging
+import mmap
 import os
 import struct
+import sys
 import zlib
 
 import wandb
@@ -40,7 +74,31 @@ LEVELDBLOG_HEADER_IDENT = ":W&B"
 LEVELDBLOG_HEADER_MAGIC = (
     0xBEE1  # zlib.crc32(bytes("Weights & Biases", 'iso8859-1')) & 0xffff
 )
-LEVELDBLOG_HEADER_VERSION = 0
+LEVELDBLOG_HEADER_VERSION = 1
+# versions that can be read, version 0 records carry no codec byte
+LEVELDBLOG_HEADER_VERSIONS = (0, 1)
+
+LEVELDBLOG_CODEC_NONE = 0
+LEVELDBLOG_CODEC_ZLIB = 1
+LEVELDBLOG_CODEC_ZSTD = 2
+LEVELDBLOG_CODECS = {
+    "none": LEVELDBLOG_CODEC_NONE,
+    "zlib": LEVELDBLOG_CODEC_ZLIB,
+    "zstd": LEVELDBLOG_CODEC_ZSTD,
+}
+# smaller records are not worth compressing
+LEVELDBLOG_COMPRESS_MIN_LEN = 256
+
+LEVELDBLOG_INDEX_SUFFIX = ".idx"
+LEVELDBLOG_INDEX_IDENT = ":WBI"
+LEVELDBLOG_INDEX_VERSION = 1
+LEVELDBLOG_INDEX_HEADER = struct.Struct("<4sHBQQI")
+
+# field numbers of wandb_internal.Record which are not part of the record_type oneof
+_RECORD_NON_TYPE_FIELDS = frozenset((1, 16, 19, 200))
+_RECORD_HISTORY_FIELD = 2
+_HISTORY_STEP_FIELD = 2
+_HISTORY_STEP_NUM_FIELD = 1
 
 try:
     bytes("", "ascii")
@@ -57,12 +115,166 @@ except Exception:
     # bytestostr = str
 
 
+def _read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _scan_fields(data, pos, end):
+    """Iterate over (field number, value) of a serialized protobuf message.
+
+    Length delimited fields are returned as (start, end) offsets so nested
+    messages can be scanned without being copied or parsed.
+    """
+    while pos < end:
+        tag, pos = _read_varint(data, pos)
+        field, wire_type = tag >> 3, tag & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value = (pos, pos + length)
+            pos += length
+        elif wire_type == 1:
+            value = None
+            pos += 8
+        elif wire_type == 5:
+            value = None
+            pos += 4
+        else:
+            raise ValueError("unsupported wire type {}".format(wire_type))
+        yield field, value
+
+
+def _record_type_and_step(data):
+    """Return the record type field number and history step of a Record."""
+    record_type = 0
+    step = -1
+    for field, value in _scan_fields(data, 0, len(data)):
+        if field in _RECORD_NON_TYPE_FIELDS or not isinstance(value, tuple):
+            continue
+        record_type = field
+        if field != _RECORD_HISTORY_FIELD:
+            break
+        for hfield, hvalue in _scan_fields(data, *value):
+            if hfield != _HISTORY_STEP_FIELD:
+                continue
+            step = 0
+            for sfield, svalue in _scan_fields(data, *hvalue):
+                if sfield == _HISTORY_STEP_NUM_FIELD:
+                    # int64 is encoded as a two's complement varint
+                    step = svalue - (1 << 64) if svalue >= 1 << 63 else svalue
+        break
+    return record_type, step
+
+
+class DataStoreIndex(object):
+    """Offsets, record types and history steps of the records in a log."""
+
+    def __init__(self):
+        self.offsets = array("Q")
+        self.types = array("I")
+        self.steps = array("q")
+        self.end = 0
+        self.check = 0
+        self._history_steps = None
+        self._history_records = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, offset, record_type, step):
+        self.offsets.append(offset)
+        self.types.append(record_type)
+        self.steps.append(step)
+        self._history_steps = None
+
+    def find_step(self, step):
+        """Return the number of the first history record with a step >= step."""
+        if self._history_steps is None:
+            self._history_steps = array("q")
+            self._history_records = array("Q")
+            for num, (record_type, s) in enumerate(zip(self.types, self.steps)):
+                if record_type == _RECORD_HISTORY_FIELD:
+                    self._history_steps.append(s)
+                    self._history_records.append(num)
+        pos = bisect.bisect_left(self._history_steps, step)
+        if pos == len(self._history_steps):
+            return None
+        return self._history_records[pos]
+
+    def save(self, fname):
+        arrays = (self.offsets, self.types, self.steps)
+        if sys.byteorder != "little":
+            arrays = tuple(array(a.typecode, a) for a in arrays)
+            for a in arrays:
+                a.byteswap()
+        tmp_fname = fname + ".tmp"
+        with open(tmp_fname, "wb") as f:
+            f.write(
+                LEVELDBLOG_INDEX_HEADER.pack(
+                    strtobytes(LEVELDBLOG_INDEX_IDENT),
+                    LEVELDBLOG_HEADER_MAGIC,
+                    LEVELDBLOG_INDEX_VERSION,
+                    len(self),
+                    self.end,
+                    self.check,
+                )
+            )
+            for a in arrays:
+                a.tofile(f)
+        os.replace(tmp_fname, fname)
+
+    @classmethod
+    def load(cls, fname):
+        """Load a sidecar index, returns None if it is missing or invalid."""
+        index = cls()
+        try:
+            with open(fname, "rb") as f:
+                header = f.read(LEVELDBLOG_INDEX_HEADER.size)
+                if len(header) != LEVELDBLOG_INDEX_HEADER.size:
+                    return None
+                fields = LEVELDBLOG_INDEX_HEADER.unpack(header)
+                ident, magic, version, count, end, check = fields
+                if (
+                    ident != strtobytes(LEVELDBLOG_INDEX_IDENT)
+                    or magic != LEVELDBLOG_HEADER_MAGIC
+                    or version != LEVELDBLOG_INDEX_VERSION
+                ):
+                    return None
+                for a in (index.offsets, index.types, index.steps):
+                    a.fromfile(f, count)
+        except (OSError, EOFError):
+            return None
+        if sys.byteorder != "little":
+            for a in (index.offsets, index.types, index.steps):
+                a.byteswap()
+        index.end = end
+        index.check = check
+        return index
+
+
 class DataStore(object):
     def __init__(self):
         self._opened_for_scan = False
         self._fp = None
+        self._mm = None
+        self._ds_index = None
         self._index = 0
         self._size_bytes = 0
+        self._version = LEVELDBLOG_HEADER_VERSION
+        self._codec = LEVELDBLOG_CODEC_NONE
+        self._compressor = None
+        # encoded records not yet written, they start at file offset
+        # self._index - len(self._buf)
+        self._buf = bytearray()
 
         self._crc = [0] * (LEVELDBLOG_LAST + 1)
         for x in range(1, LEVELDBLOG_LAST + 1):
@@ -72,19 +284,88 @@ class DataStore(object):
             wandb._assert_is_internal_process
         ), "DataStore can only be used in the internal process"
 
-    def open_for_write(self, fname):
+    def open_for_write(self, fname, compression=None):
         self._fname = fname
         logger.info("open: %s", fname)
+        self._version = LEVELDBLOG_HEADER_VERSION
+        self._set_compression(compression)
         open_flags = "xb"
         self._fp = open(fname, open_flags)
         self._write_header()
 
-    def open_for_append(self, fname):
-        # TODO: implement
+    def _set_compression(self, compression):
+        codec = LEVELDBLOG_CODECS.get(compression or "none")
+        if codec is None:
+            raise ValueError("Unknown compression: {}".format(compression))
+        if codec == LEVELDBLOG_CODEC_ZSTD:
+            zstandard = wandb.util.get_module("zstandard")
+            if zstandard is None:
+                logger.warning("zstandard is not installed, using zlib compression")
+                codec = LEVELDBLOG_CODEC_ZLIB
+            else:
+                self._compressor = zstandard.ZstdCompressor()
+        if codec != LEVELDBLOG_CODEC_NONE and self._version < 1:
+            logger.warning("log version %d does not support compression", self._version)
+            codec = LEVELDBLOG_CODEC_NONE
+        self._codec = codec
+
+    def _encode(self, s):
+        codec = self._codec
+        if codec != LEVELDBLOG_CODEC_NONE and len(s) >= LEVELDBLOG_COMPRESS_MIN_LEN:
+            if codec == LEVELDBLOG_CODEC_ZLIB:
+                compressed = zlib.compress(s, 1)
+            else:
+                compressed = self._compressor.compress(s)
+            if len(compressed) < len(s):
+                return struct.pack("<B", codec) + compressed
+        return struct.pack("<B", LEVELDBLOG_CODEC_NONE) + s
+
+    def _decode(self, data):
+        codec = data[0]
+        if codec == LEVELDBLOG_CODEC_NONE:
+            return data[1:]
+        if codec == LEVELDBLOG_CODEC_ZLIB:
+            return zlib.decompress(data[1:])
+        if codec == LEVELDBLOG_CODEC_ZSTD:
+            zstandard = wandb.util.get_module(
+                "zstandard",
+                required="Reading zstd compressed records requires zstandard",
+            )
+            return zstandard.ZstdDecompressor().decompress(data[1:])
+        raise AssertionError("unknown record codec {}".format(codec))
+
+    def open_for_append(self, fname, compression=None):
+        """Open an existing log to continue writing records at its end.
+
+        The log is scanned (reusing the sidecar index when possible) to find
+        the end of the last complete record.  A torn record left behind by an
+        interrupted write is truncated so that block padding stays aligned.
+        """
         self._fname = fname
-        logger.info("open: %s", fname)
-        self._fp = open(fname, "wb")
-        # do something with _index
+        logger.info("open for append: %s", fname)
+        end = 0
+        if os.stat(fname).st_size >= LEVELDBLOG_HEADER_LEN:
+            self.open_for_scan(fname)
+            try:
+                end = self.build_index().end
+            finally:
+                self.close()
+                self._opened_for_scan = False
+                self._ds_index = None
+
+        self._fp = open(fname, "r+b")
+        if end < self._fp.seek(0, os.SEEK_END):
+            logger.warning("truncating torn record: %s at %d", fname, end)
+        self._fp.truncate(end)
+        self._fp.seek(end)
+        self._index = end
+        if not end:
+            self._version = LEVELDBLOG_HEADER_VERSION
+            self._set_compression(compression)
+            self._write_header()
+        else:
+            # keep writing records in the version of the existing log
+            self._set_compression(compression)
 
     def open_for_scan(self, fname):
         self._fname = fname
@@ -92,6 +373,9 @@ class DataStore(object):
         self._fp = open(fname, "rb")
         self._index = 0
         self._size_bytes = os.stat(fname).st_size
+        if self._size_bytes:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self._size_bytes = len(self._mm)
         self._opened_for_scan = True
         self._read_header()
 
@@ -104,19 +388,22 @@ class DataStore(object):
         assert self._opened_for_scan, "file not open for scanning"
         # TODO(jhr): handle some assertions as file corruption issues
         # assume we have enough room to read header, checked by caller?
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
-        if len(header) == 0:
+        index = self._index
+        if index == self._size_bytes:
             return None
         assert (
-            len(header) == LEVELDBLOG_HEADER_LEN
+            index + LEVELDBLOG_HEADER_LEN <= self._size_bytes
         ), "record header is {} bytes instead of the expected {}".format(
-            len(header), LEVELDBLOG_HEADER_LEN
+            self._size_bytes - index, LEVELDBLOG_HEADER_LEN
         )
-        fields = struct.unpack("<IHB", header)
-        checksum, dlength, dtype = fields
+        checksum, dlength, dtype = struct.unpack_from("<IHB", self._mm, index)
         # check len, better fit in the block
         self._index += LEVELDBLOG_HEADER_LEN
-        data = self._fp.read(dlength)
+        index = self._index
+        assert (
+            index + dlength <= self._size_bytes
+        ), "record checksum is invalid, data may be corrupt"
+        data = self._mm[index : index + dlength]
         checksum_computed = zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
         assert (
             checksum == checksum_computed
@@ -124,17 +411,27 @@ class DataStore(object):
         self._index += dlength
         return dtype, data
 
-    def scan_data(self):
-        # TODO(jhr): handle some assertions as file corruption issues
+    def _skip_padding(self):
         # how much left in the block.  if less than header len, read as pad,
         offset = self._index % LEVELDBLOG_BLOCK_LEN
         space_left = LEVELDBLOG_BLOCK_LEN - offset
         if space_left < LEVELDBLOG_HEADER_LEN:
-            pad_check = strtobytes("\x00" * space_left)
-            pad = self._fp.read(space_left)
+            # the padding is only written once the next record is
+            pad = self._mm[self._index : self._index + space_left]
+            pad_check = strtobytes("\x00" * len(pad))
             # verify they are zero
             assert pad == pad_check, "invald padding"
-            self._index += space_left
+            self._index += len(pad)
+
+    def scan_data(self):
+        data = self._scan_raw_data()
+        if data is None or self._version < 1:
+            return data
+        return self._decode(data)
+
+    def _scan_raw_data(self):
+        # TODO(jhr): handle some assertions as file corruption issues
+        self._skip_padding()
 
         record = self.scan_record()
         if record is None:  # eof
@@ -146,29 +443,137 @@ class DataStore(object):
         assert (
             dtype == LEVELDBLOG_FIRST
         ), "expected record to be type {} but found {}".format(LEVELDBLOG_FIRST, dtype)
+        chunks = [data]
         while True:
-            offset = self._index % LEVELDBLOG_BLOCK_LEN
             record = self.scan_record()
             if record is None:  # eof
                 return None
             dtype, new_data = record
+            chunks.append(new_data)
             if dtype == LEVELDBLOG_LAST:
-                data += new_data
                 break
             assert (
                 dtype == LEVELDBLOG_MIDDLE
             ), "expected record to be type {} but found {}".format(
                 LEVELDBLOG_MIDDLE, dtype
             )
-            data += new_data
-        return data
+        return b"".join(chunks)
+
+    def _index_check(self, end):
+        """Checksum of the data before end, ties an index to its file."""
+        start = max(0, end - LEVELDBLOG_BLOCK_LEN)
+        return zlib.crc32(self._mm[start:end]) & 0xFFFFFFFF
+
+    def _is_record_start(self, offset):
+        """Whether a valid FULL or FIRST record starts at offset."""
+        if offset + LEVELDBLOG_HEADER_LEN > self._size_bytes:
+            return False
+        checksum, dlength, dtype = struct.unpack_from("<IHB", self._mm, offset)
+        start = offset + LEVELDBLOG_HEADER_LEN
+        if (
+            dtype not in (LEVELDBLOG_FULL, LEVELDBLOG_FIRST)
+            or start + dlength > self._size_bytes
+        ):
+            return False
+        data = self._mm[start : start + dlength]
+        return checksum == zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
+
+    def build_index(self, save=True, reuse=True):
+        """Index all records of a file opened for scanning.
+
+        An existing sidecar index is reused and extended if the file has grown
+        since it was written, unless it does not match the file.  The scan
+        position is restored afterwards.
+
+        Arguments:
+            save: write the updated index next to the file.
+            reuse: use the existing sidecar index.
+
+        Returns:
+            DataStoreIndex
+        """
+        assert self._opened_for_scan, "file not open for scanning"
+        index_fname = self._fname + LEVELDBLOG_INDEX_SUFFIX
+        index = DataStoreIndex.load(index_fname) if reuse else None
+        if index is not None and (
+            index.end > self._size_bytes or index.check != self._index_check(index.end)
+        ):
+            logger.info("index %s does not match its file, rebuilding", index_fname)
+            index = None
+        if index is None:
+            index = DataStoreIndex()
+            index.end = LEVELDBLOG_HEADER_LEN
+            index.check = self._index_check(index.end)
+        if index.end == self._size_bytes:
+            self._ds_index = index
+            return index
+
+        saved_index = self._index
+        self._index = index.end
+        while True:
+            self._skip_padding()
+            offset = self._index
+            try:
+                data = self.scan_data()
+            except AssertionError:
+                # incomplete trailing record of an in progress write
+                if not self.in_last_block():
+                    raise
+                data = None
+            if data is None:
+                break
+            record_type, step = _record_type_and_step(data)
+            index.append(offset, record_type, step)
+            index.end = self._index
+        self._index = saved_index
+        index.check = self._index_check(index.end)
+
+        if save:
+            try:
+                index.save(index_fname)
+            except OSError as e:
+                logger.warning("unable to save index %s: %s", index_fname, e)
+        self._ds_index = index
+        return index
+
+    def _seek_indexed(self, find):
+        """Position the scanner at the record number find(index) returns."""
+        index = self._ds_index
+        if index is None:
+            index = self.build_index()
+        num = find(index)
+        if num is not None and not self._is_record_start(index.offsets[num]):
+            logger.warning("index of %s is invalid, rebuilding", self._fname)
+            index = self.build_index(reuse=False)
+            num = find(index)
+        if num is None:
+            self._index = index.end
+            return False
+        self._index = index.offsets[num]
+        return True
+
+    def seek_record(self, num):
+        """Position the scanner so that scan_data() returns record number num."""
+        return self._seek_indexed(lambda index: num if num < len(index) else None)
+
+    def seek_step(self, step):
+        """Position the scanner at the first history record with a step >= step.
+
+        Records other than history that follow that record are scanned
+        normally.  History steps are expected to be increasing.
+        """
+        return self._seek_indexed(lambda index: index.find_step(step))
 
     def _write_header(self):
+        # codec bytes are only needed when records are compressed
+        version = LEVELDBLOG_HEADER_VERSION
+        if self._codec == LEVELDBLOG_CODEC_NONE:
+            version = 0
         data = struct.pack(
             "<4sHB",
             strtobytes(LEVELDBLOG_HEADER_IDENT),
             LEVELDBLOG_HEADER_MAGIC,
-            LEVELDBLOG_HEADER_VERSION,
+            version,
         )
         assert (
             len(data) == LEVELDBLOG_HEADER_LEN
@@ -176,10 +581,12 @@ class DataStore(object):
             len(data), LEVELDBLOG_HEADER_LEN
         )
         self._fp.write(data)
+        self._fp.flush()
         self._index += len(data)
+        self._version = version
 
     def _read_header(self):
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
+        header = self._mm[:LEVELDBLOG_HEADER_LEN] if self._mm else b""
         assert (
             len(header) == LEVELDBLOG_HEADER_LEN
         ), "header is {} bytes instead of the expected {}".format(
@@ -190,8 +597,9 @@ class DataStore(object):
             raise Exception("Invalid header")
         if magic != LEVELDBLOG_HEADER_MAGIC:
             raise Exception("Invalid header")
-        if version != LEVELDBLOG_HEADER_VERSION:
+        if version not in LEVELDBLOG_HEADER_VERSIONS:
             raise Exception("Invalid header")
+        self._version = version
         self._index += len(header)
 
     def _write_record(self, s, dtype=None):
@@ -208,9 +616,9 @@ class DataStore(object):
         checksum = zlib.crc32(s, self._crc[dtype]) & 0xFFFFFFFF
         # logger.info("write_record: index=%d len=%d dtype=%d",
         #     self._index, dlength, dtype)
-        self._fp.write(struct.pack("<IHB", checksum, dlength, dtype))
+        self._buf += struct.pack("<IHB", checksum, dlength, dtype)
         if dlength:
-            self._fp.write(s)
+            self._buf += s
         self._index += LEVELDBLOG_HEADER_LEN + len(s)
 
     def _write_data(self, s):
@@ -226,7 +634,7 @@ class DataStore(object):
         #     self._index, offset, data_left)
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad = "\x00" * space_left
-            self._fp.write(strtobytes(pad))
+            self._buf += strtobytes(pad)
             self._index += space_left
             offset = 0
             space_left = LEVELDBLOG_BLOCK_LEN
@@ -252,13 +660,36 @@ class DataStore(object):
                 data_used += LEVELDBLOG_DATA_LEN
                 data_left -= LEVELDBLOG_DATA_LEN
 
-            # write last and flush the entire block to disk
+            # write last
             self._write_record(s[data_used:], LEVELDBLOG_LAST)
-            self._fp.flush()
-            os.fsync(self._fp.fileno())
 
+        self._write_blocks()
         return file_offset, self._index - file_offset, flush_index, flush_offset
 
+    def _write_blocks(self):
+        """Write the buffered blocks which are complete."""
+        complete = len(self._buf) - self._index % LEVELDBLOG_BLOCK_LEN
+        if complete > 0:
+            self._fp.write(self._buf[:complete])
+            del self._buf[:complete]
+
+    def buffered_bytes(self):
+        """Return the number of bytes written since the last flush()."""
+        return len(self._buf)
+
+    def flush(self, fsync=False):
+        """Write the buffered records to the file.
+
+        Arguments:
+            fsync: also wait for the file to be written to disk.
+        """
+        if self._buf:
+            self._fp.write(self._buf)
+            del self._buf[:]
+        self._fp.flush()
+        if fsync:
+            os.fsync(self._fp.fileno())
+
     def write(self, obj):
         """Write a protocol buffer.
 
@@ -273,10 +704,17 @@ class DataStore(object):
         raw_size = obj.ByteSize()
         s = obj.SerializeToString()
         assert len(s) == raw_size, "invalid serialization"
+        if self._version >= 1:
+            s = self._encode(s)
         ret = self._write_data(s)
         return ret
 
     def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
         if self._fp is not None:
             logger.info("close: %s", self._fname)
+            if not self._opened_for_scan:
+                self.flush()
             self._fp.close()
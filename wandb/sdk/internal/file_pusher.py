@@ -37,6 +37,8 @@ class FilePusher:
         self._tempdir = tempfile.TemporaryDirectory("wandb")
 
         self._stats = stats.Stats()
+        if file_stream is not None:
+            file_stream.set_upload_stats(self._stats)
 
         self._incoming_queue = queue.Queue()
         self._event_queue = queue.Queue()
@@ -1,12 +1,15 @@
 import base64
 import binascii
 import collections
+import gzip
 import itertools
+import json
 import logging
 import os
 import sys
 import random
 import requests
+import tempfile
 import threading
 import time
 from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
@@ -29,6 +32,9 @@ if TYPE_CHECKING:
 
 
 class DefaultFilePolicy(object):
+    # only the last pending chunk of the file is sent
+    coalesce = False
+
     def __init__(self, start_chunk_id=0):
         self._chunk_id = start_chunk_id
 
@@ -62,6 +68,8 @@ class JsonlFilePolicy(DefaultFilePolicy):
 
 
 class SummaryFilePolicy(DefaultFilePolicy):
+    coalesce = True
+
     def process_chunks(self, chunks):
         data = chunks[-1].data
         if len(data) > util.MAX_LINE_BYTES:
@@ -74,6 +82,86 @@ class SummaryFilePolicy(DefaultFilePolicy):
         return {"offset": 0, "content": [data]}
 
 
+class _ChunkSpool(object):
+    """Chunks kept in a temporary file until the stream has room for them.
+
+    Chunks are popped in the order they were appended.  For files whose policy
+    coalesces chunks only the latest one is kept, in memory, and it is popped
+    after the chunks in the file.
+    """
+
+    def __init__(self):
+        self._file = None
+        self._read_pos = 0
+        self._latest = collections.OrderedDict()
+        self.chunks = 0
+        self.bytes = 0
+        # time the oldest chunk still spooled was appended, or close to it
+        self.since = None
+
+    def __len__(self):
+        return self.chunks
+
+    def append(self, chunk, coalesce=False):
+        now = time.time()
+        if self.since is None:
+            self.since = now
+        if coalesce:
+            replaced = self._latest.pop(chunk.filename, None)
+            if replaced is not None:
+                self.chunks -= 1
+                self.bytes -= len(replaced[1].data)
+            self._latest[chunk.filename] = (now, chunk)
+        else:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile()
+            self._file.seek(0, os.SEEK_END)
+            line = json.dumps([now, chunk.filename, chunk.data]) + "\n"
+            self._file.write(line.encode("utf-8"))
+        self.chunks += 1
+        self.bytes += len(chunk.data)
+
+    def pop(self, max_bytes):
+        """Pop the oldest chunks, stops once they add up to max_bytes.
+
+        Returns:
+            A list of (time appended, Chunk) tuples.
+        """
+        popped = []
+        size = 0
+        if self._file is not None:
+            self._file.seek(self._read_pos)
+            while size < max_bytes:
+                line = self._file.readline()
+                if not line:
+                    break
+                since, filename, data = json.loads(line)
+                popped.append((since, Chunk(filename, data)))
+                size += len(data)
+            self._read_pos = self._file.tell()
+        while size < max_bytes and self._latest:
+            _, (since, chunk) = self._latest.popitem(last=False)
+            popped.append((since, chunk))
+            size += len(chunk.data)
+        self.chunks -= len(popped)
+        self.bytes -= size
+        if popped:
+            self.since = popped[-1][0]
+        if not self.chunks:
+            self.since = None
+            if self._file is not None:
+                # reclaim the disk space
+                self._file.seek(0)
+                self._file.truncate()
+                self._read_pos = 0
+        return popped
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 class StreamCRState:
     """There are two streams: stdout and stderr.
     We create two instances for each stream.
@@ -250,8 +338,18 @@ class BinaryFilePolicy(DefaultFilePolicy):
 class FileStreamApi(object):
     """Pushes chunks of files to our streaming endpoint.
 
-    This class is used as a singleton. It has a thread that serializes access to
-    the streaming endpoint and performs rate-limiting and batching.
+    This class is used as a singleton. It has a thread that batches chunks and
+    performs rate-limiting, the http requests are made by a small pool of
+    request threads so that a slow or retrying request does not stall the
+    stream.  At most MAX_INFLIGHT_REQUESTS requests are in flight, and at most
+    one of them carries data for any given file, so chunks of a file reach the
+    backend in order.  Chunks for a file with a request in flight are held back
+    and coalesced into its next request.
+
+    At most MAX_PENDING_BYTES of chunk data are held in memory.  Past that
+    push() spools new chunks to a temporary file, and they are streamed from
+    there, in order, as the backend catches up.  push() never blocks and no
+    chunk is dropped; the spooled chunks are reported by stats().
 
     TODO: Differentiate between binary/text encoding.
     """
@@ -259,11 +357,20 @@ class FileStreamApi(object):
     Finish = collections.namedtuple("Finish", ("exitcode"))
     Preempting = collections.namedtuple("Preempting", ())
     PushSuccess = collections.namedtuple("PushSuccess", ("artifact_id", "save_name"))
+    # posted by the request threads when a request is done
+    RequestDone = collections.namedtuple(
+        "RequestDone",
+        ("request_id", "filenames", "num_chunks", "num_bytes", "uploaded", "success"),
+    )
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
+    MAX_INFLIGHT_REQUESTS = 4
+    MAX_PENDING_BYTES = 64 * 1024 * 1024
+    # smaller request bodies (eg. heartbeats) are sent uncompressed
+    COMPRESS_MIN_BYTES = 1024
 
-    def __init__(self, api, run_id, start_time, settings=None):
+    def __init__(self, api, run_id, start_time, settings=None, compression="auto"):
         if settings is None:
             settings = dict()
         # NOTE: exc_info is set in thread_except_body context and readable by calling threads
@@ -290,6 +397,34 @@ class FileStreamApi(object):
         # cleans this thread up.
         self._thread.name = "FileStreamThread"
         self._thread.daemon = True
+
+        self._request_q = queue.Queue()
+        self._request_threads = []
+        self._request_id = 0
+        self._inflight_files = set()
+        # stats are updated by the stream and request threads
+        self._stats_lock = threading.Lock()
+        self._pending_bytes = 0
+        # chunks pushed past MAX_PENDING_BYTES, guarded by _stats_lock
+        self._spool = _ChunkSpool()
+        # chunks put in _queue and not yet read by the stream thread
+        self._queued_chunks = 0
+        self._pushed_chunks = 0
+        self._done_chunks = 0
+        self._sent_chunks = 0
+        self._inflight_requests = 0
+        # time of the oldest chunk not yet sent, keyed by request id (None
+        # for chunks not yet handed to a request)
+        self._pending_since = {}
+        # filesync stats shared with the file pusher, see set_upload_stats()
+        self._upload_stats = None
+
+        # "auto" compresses request bodies once the backend lists an encoding
+        # in the Accept-Encoding header of a response (RFC 7694)
+        self._compression = compression
+        self._encoding = None
+        if compression not in ("auto", "none"):
+            self._encoding = _supported_encoding([compression, "gzip"])
         self._init_endpoint()
 
     def _init_endpoint(self):
@@ -304,6 +439,12 @@ class FileStreamApi(object):
 
     def start(self):
         self._init_endpoint()
+        for i in range(self.MAX_INFLIGHT_REQUESTS):
+            thread = threading.Thread(target=self._request_thread_body)
+            thread.name = "FileStreamReqThr{}".format(i)
+            thread.daemon = True
+            thread.start()
+            self._request_threads.append(thread)
         self._thread.start()
 
     def set_default_file_policy(self, filename, file_policy):
@@ -314,6 +455,10 @@ class FileStreamApi(object):
     def set_file_policy(self, filename, file_policy):
         self._file_policies[filename] = file_policy
 
+    def set_upload_stats(self, upload_stats):
+        """Report the raw and sent request body sizes to filesync stats."""
+        self._upload_stats = upload_stats
+
     @property
     def heartbeat_seconds(self):
         # Defaults to 30
@@ -328,95 +473,242 @@ class FileStreamApi(object):
         else:
             return max(5, self.heartbeat_seconds)
 
+    def stats(self):
+        """Return a snapshot of the stream state, can be called from any thread.
+
+        Returns:
+            A dict with the number of chunks pushed but not yet sent, the size
+            of those held in memory and of those spooled to disk, the number
+            of requests in flight, the number of chunks sent and dropped, and
+            the age in seconds of the oldest chunk not yet sent.
+        """
+        with self._stats_lock:
+            since = list(self._pending_since.values())
+            if self._spool.since is not None:
+                since.append(self._spool.since)
+            oldest = min(since, default=None)
+            pending = self._pushed_chunks - self._done_chunks + len(self._spool)
+            return dict(
+                pending_chunks=pending,
+                pending_bytes=self._pending_bytes,
+                spooled_bytes=self._spool.bytes,
+                inflight_requests=self._inflight_requests,
+                sent_chunks=self._sent_chunks,
+                dropped_chunks=self._dropped_chunks,
+                lag_seconds=time.time() - oldest if oldest is not None else 0.0,
+            )
+
     def _read_queue(self):
         # called from the push thread (_thread_body), this does an initial read
         # that'll block for up to rate_limit_seconds. Then it tries to read
-        # as much out of the queue as it can. We do this because the http post
-        # to the server happens within _thread_body, and can take longer than
-        # our rate limit. So next time we get a chance to read the queue we want
-        # read all the stuff that queue'd up since last time.
-        #
-        # If we have more than MAX_ITEMS_PER_PUSH in the queue then the push thread
-        # will get behind and data will buffer up in the queue.
+        # as much out of the queue as it can. The http posts happen in the
+        # request threads, which wake us up with a RequestDone item, so we
+        # keep up with the queue while requests are slow or retrying.
         return util.read_many_from_queue(
             self._queue, self.MAX_ITEMS_PER_PUSH, self.rate_limit_seconds()
         )
 
+    def _submit(
+        self,
+        func,
+        args,
+        filenames=(),
+        num_chunks=0,
+        num_bytes=0,
+        uploaded=(),
+        since=None,
+    ):
+        self._request_id += 1
+        self._inflight_files.update(filenames)
+        with self._stats_lock:
+            self._inflight_requests += 1
+            if since is not None:
+                self._pending_since[self._request_id] = since
+        self._request_q.put(
+            (
+                self._request_id,
+                func,
+                args,
+                filenames,
+                num_chunks,
+                num_bytes,
+                set(uploaded),
+            )
+        )
+
+    def _request_thread_body(self):
+        while True:
+            job = self._request_q.get()
+            if job is None:
+                return
+            request_id, func, args, filenames, num_chunks, num_bytes, uploaded = job
+            success = False
+            try:
+                success = func(*args)
+            except Exception:
+                self._exc_info = sys.exc_info()
+                logger.exception("generic exception in filestream request thread")
+                util.sentry_exc(self._exc_info, delay=True)
+            finally:
+                self._queue.put(
+                    self.RequestDone(
+                        request_id, filenames, num_chunks, num_bytes, uploaded, success
+                    )
+                )
+
+    def _request_done(self, done):
+        self._inflight_files.difference_update(done.filenames)
+        with self._stats_lock:
+            self._inflight_requests -= 1
+            self._pending_since.pop(done.request_id, None)
+            self._done_chunks += done.num_chunks
+            self._pending_bytes -= done.num_bytes
+            if done.success:
+                self._sent_chunks += done.num_chunks
+
+    def _unspool(self):
+        """Move spooled chunks back in memory while there is room.
+
+        Nothing is moved while chunks pushed before them are still queued, so
+        chunks of a file stay in order.
+        """
+        with self._stats_lock:
+            room = self.MAX_PENDING_BYTES - self._pending_bytes
+            if not self._spool or self._queued_chunks or room <= 0:
+                return []
+            popped = self._spool.pop(room)
+            self._pending_bytes += sum(len(chunk.data) for _, chunk in popped)
+            self._pushed_chunks += len(popped)
+            if popped:
+                self._pending_since.setdefault(None, popped[0][0])
+        return popped
+
+    def _dispatch_chunks(self, ready, uploaded):
+        """Hand ready chunks to a request thread, returns the held back chunks.
+
+        Chunks of files that already have a request in flight stay in the ready
+        list so that a file never has two requests racing each other.
+        """
+        send, held = [], []
+        for received, chunk in ready:
+            if chunk.filename in self._inflight_files:
+                held.append((received, chunk))
+            else:
+                send.append((received, chunk))
+        if not send:
+            return held
+        chunks = [chunk for _, chunk in send]
+        filenames = {chunk.filename for chunk in chunks}
+        files = self._process_chunks(chunks)
+        self._submit(
+            self._send_files,
+            (files, uploaded),
+            filenames=filenames,
+            num_chunks=len(chunks),
+            num_bytes=sum(len(chunk.data) for chunk in chunks),
+            uploaded=uploaded,
+            since=send[0][0],
+        )
+        with self._stats_lock:
+            if held:
+                self._pending_since[None] = held[0][0]
+            else:
+                self._pending_since.pop(None, None)
+        return held
+
     def _thread_body(self):
         posted_data_time = time.time()
         posted_anything_time = time.time()
         ready_chunks = []
         uploaded = set()
         finished = None
-        while finished is None:
+        while (
+            finished is None or ready_chunks or self._inflight_requests or self._spool
+        ):
             items = self._read_queue()
             for item in items:
-                if isinstance(item, self.Finish):
+                if isinstance(item, self.RequestDone):
+                    self._request_done(item)
+                    # If we encountered an error trying to publish the
+                    # list of uploaded files, retry on the next request
+                    if not item.success:
+                        uploaded.update(item.uploaded)
+                elif isinstance(item, self.Finish):
                     finished = item
                 elif isinstance(item, self.Preempting):
-                    request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={
-                            "complete": False,
-                            "preempting": True,
-                            "dropped": self._dropped_chunks,
-                            "uploaded": list(uploaded),
-                        },
+                    self._submit(
+                        self._send_status,
+                        (
+                            {
+                                "complete": False,
+                                "preempting": True,
+                                "dropped": self._dropped_chunks,
+                                "uploaded": list(uploaded),
+                            },
+                        ),
                     )
                     uploaded = set()
                 elif isinstance(item, self.PushSuccess):
                     uploaded.add(item.save_name)
                 else:
                     # item is Chunk
-                    ready_chunks.append(item)
+                    with self._stats_lock:
+                        self._queued_chunks -= 1
+                        if not ready_chunks:
+                            self._pending_since.setdefault(None, time.time())
+                    ready_chunks.append((time.time(), item))
 
+            ready_chunks.extend(self._unspool())
             cur_time = time.time()
 
-            if ready_chunks and (
-                finished or cur_time - posted_data_time > self.rate_limit_seconds()
+            if (
+                ready_chunks
+                and self._inflight_requests < self.MAX_INFLIGHT_REQUESTS
+                and (
+                    finished or cur_time - posted_data_time > self.rate_limit_seconds()
+                )
             ):
-                posted_data_time = cur_time
-                posted_anything_time = cur_time
-                success = self._send(ready_chunks, uploaded=uploaded)
-                ready_chunks = []
-                if success:
+                held = self._dispatch_chunks(ready_chunks, uploaded)
+                if len(held) != len(ready_chunks):
+                    posted_data_time = cur_time
+                    posted_anything_time = cur_time
                     uploaded = set()
+                ready_chunks = held
 
             # If there aren't ready chunks or uploaded files, we still want to
             # send regular heartbeats so the backend doesn't erroneously mark this
             # run as crashed.
-            if cur_time - posted_anything_time > self.heartbeat_seconds:
+            if (
+                cur_time - posted_anything_time > self.heartbeat_seconds
+                and self._inflight_requests < self.MAX_INFLIGHT_REQUESTS
+            ):
                 posted_anything_time = cur_time
-
-                # If we encountered an error trying to publish the
-                # list of uploaded files, don't reset the `uploaded`
-                # list. Retry publishing the list on the next attempt.
-                if not isinstance(
-                    request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={
+                self._submit(
+                    self._send_status,
+                    (
+                        {
                             "complete": False,
                             "failed": False,
                             "dropped": self._dropped_chunks,
                             "uploaded": list(uploaded),
                         },
                     ),
-                    Exception,
-                ):
-                    uploaded = set()
+                    uploaded=uploaded,
+                )
+                uploaded = set()
+
+        for _ in self._request_threads:
+            self._request_q.put(None)
+        self._spool.close()
 
         # post the final close message. (item is self.Finish instance now)
-        request_with_retry(
-            self._client.post,
-            self._endpoint,
-            json={
+        self._post(
+            {
                 "complete": True,
                 "exitcode": int(finished.exitcode),
                 "dropped": self._dropped_chunks,
                 "uploaded": list(uploaded),
-            },
+            }
         )
 
     def _thread_except_body(self):
@@ -437,7 +729,8 @@ class FileStreamApi(object):
                 "Dropped streaming file chunk (see wandb/debug-internal.log)"
             )
             logging.exception("dropped chunk %s" % response)
-            self._dropped_chunks += 1
+            with self._stats_lock:
+                self._dropped_chunks += 1
         else:
             parsed: dict = None
             try:
@@ -449,8 +742,7 @@ class FileStreamApi(object):
                 if isinstance(limits, dict):
                     self._api.dynamic_settings.update(limits)
 
-    def _send(self, chunks, uploaded=None):
-        uploaded = list(uploaded or [])
+    def _process_chunks(self, chunks):
         # create files dict. dict of <filename: chunks> pairs where chunks is a list of
         # [chunk_id, chunk_data] tuples (as lists since this will be json).
         files = {}
@@ -463,34 +755,97 @@ class FileStreamApi(object):
             files[filename] = self._file_policies[filename].process_chunks(file_chunks)
             if not files[filename]:
                 del files[filename]
+        return files
 
+    def _send_files(self, files, uploaded=None):
+        uploaded = list(uploaded or [])
         for fs in file_stream_utils.split_files(files, max_bytes=util.MAX_LINE_BYTES):
             self._handle_response(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={"files": fs, "dropped": self._dropped_chunks},
+                self._post(
+                    {"files": fs, "dropped": self._dropped_chunks},
                     retry_callback=self._api.retry_callback,
                 )
             )
 
         if uploaded:
-            if isinstance(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={
-                        "complete": False,
-                        "failed": False,
-                        "dropped": self._dropped_chunks,
-                        "uploaded": uploaded,
-                    },
-                ),
-                Exception,
-            ):
-                return False
+            return self._send_status(
+                {
+                    "complete": False,
+                    "failed": False,
+                    "dropped": self._dropped_chunks,
+                    "uploaded": uploaded,
+                }
+            )
         return True
 
+    def _send_status(self, data):
+        return not isinstance(self._post(data), Exception)
+
+    def _post(self, data, retry_callback=None):
+        """Post a json body to the endpoint, compressed when the backend allows.
+
+        Returns:
+            The response, or the exception which made the request fail.
+        """
+        body = json.dumps(data).encode("utf-8")
+        encoding = self._encoding
+        payload = body
+        if encoding and len(body) >= self.COMPRESS_MIN_BYTES:
+            compressed = _compress(encoding, body)
+            if len(compressed) < len(body):
+                payload = compressed
+        headers = {"Content-Type": "application/json"}
+        if payload is not body:
+            headers["Content-Encoding"] = encoding
+        response = request_with_retry(
+            self._client.post,
+            self._endpoint,
+            data=payload,
+            headers=headers,
+            retry_callback=retry_callback,
+        )
+        if (
+            payload is not body
+            and isinstance(response, requests.exceptions.HTTPError)
+            and response.response is not None
+            and response.response.status_code == 415
+        ):
+            # the backend does not (or no longer) accept the encoding
+            logger.warning("file_stream %s encoding rejected", encoding)
+            self._negotiate(response.response, rejected=encoding)
+            payload = body
+            headers = {"Content-Type": "application/json"}
+            response = request_with_retry(
+                self._client.post,
+                self._endpoint,
+                data=payload,
+                headers=headers,
+                retry_callback=retry_callback,
+            )
+        if not isinstance(response, Exception):
+            self._negotiate(response)
+            if self._upload_stats:
+                self._upload_stats.update_file_stream_bytes(len(body), len(payload))
+        return response
+
+    def _negotiate(self, response, rejected=None):
+        if rejected:
+            if self._encoding == rejected:
+                self._encoding = None
+            if self._compression != "auto":
+                # fall back to plain bodies for the rest of the run
+                self._compression = "none"
+        if self._compression != "auto":
+            return
+        accept = response.headers.get("Accept-Encoding")
+        if accept is None:
+            return
+        encodings = [e.split(";")[0].strip().lower() for e in accept.split(",")]
+        self._encoding = _supported_encoding([e for e in encodings if e != rejected])
+
+    def _send(self, chunks, uploaded=None):
+        return self._send_files(self._process_chunks(chunks), uploaded=uploaded)
+
     def stream_file(self, path):
         name = path.split("/")[-1]
         with open(path) as f:
@@ -502,12 +857,34 @@ class FileStreamApi(object):
     def push(self, filename, data):
         """Push a chunk of a file to the streaming endpoint.
 
+        Never blocks, the chunk is spooled to disk while MAX_PENDING_BYTES
+        are pending (or chunks spooled before it are not yet sent).
+
         Arguments:
             filename: Name of file that this is a chunk of.
             chunk_id: TODO: change to 'offset'
             chunk: File data.
         """
-        self._queue.put(Chunk(filename, data))
+        chunk = Chunk(filename, data)
+        size = len(data)
+        with self._stats_lock:
+            # a single chunk larger than the limit is let through alone
+            if self._spool or (
+                self._pending_bytes
+                and self._pending_bytes + size > self.MAX_PENDING_BYTES
+            ):
+                if not self._spool:
+                    logger.warning(
+                        "file_stream has %d bytes pending, spooling chunks to disk",
+                        self._pending_bytes,
+                    )
+                policy = self._file_policies.get(filename)
+                self._spool.append(chunk, coalesce=getattr(policy, "coalesce", False))
+                return
+            self._pending_bytes += size
+            self._pushed_chunks += 1
+            self._queued_chunks += 1
+        self._queue.put(chunk)
 
     def push_success(self, artifact_id, save_name):
         """Notification that a file upload has been successfully completed
@@ -535,6 +912,21 @@ class FileStreamApi(object):
             six.reraise(*self._exc_info)
 
 
+def _supported_encoding(encodings):
+    # prefer zstd when the optional zstandard module is installed
+    if "zstd" in encodings and util.get_module("zstandard"):
+        return "zstd"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+def _compress(encoding, body):
+    if encoding == "zstd":
+        return util.get_module("zstandard").ZstdCompressor().compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
 MAX_SLEEP_SECONDS = 60 * 5
 
 
@@ -573,6 +965,7 @@ def request_with_retry(func, *args, **kwargs):
                     403,
                     404,
                     409,
+                    415,
                 }:
                     return e
 
@@ -18,6 +18,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TYPE_CHECKING,
 )
@@ -34,20 +35,43 @@ from wandb.proto.wandb_internal_pb2 import (
 
 from . import meta, sample, stats, tb_watcher
 from .settings_static import SettingsStatic
+from ..interface import history_batch
 from ..interface.interface_queue import InterfaceQueue
 from ..lib import handler_util, proto_util, tracelog
 
 if TYPE_CHECKING:
-    from wandb.proto.wandb_internal_pb2 import (
-        ArtifactDoneRequest,
-        MetricSummary,
-    )
+    from wandb.proto.wandb_internal_pb2 import ArtifactDoneRequest
 
 
 SummaryDict = Dict[str, Any]
+# history rows are kept as the JSON of their values, as sent by the user process
+HistoryJSON = Dict[str, str]
 
 logger = logging.getLogger(__name__)
 
+# media objects referring to the latest version of their artifact
+_LATEST_ARTIFACT_PATH = '"_latest_artifact_path"'
+
+
+def _json_number(value_json: str) -> Any:
+    """Decode a JSON number or boolean without a full parse.
+
+    Returns None for any other value, which the sampled history skips anyway.
+    """
+    c = value_json[:1]
+    if c and c in "-0123456789":
+        try:
+            return int(value_json)
+        except ValueError:
+            return float(value_json)
+    if value_json == "true":
+        return True
+    if value_json == "false":
+        return False
+    if value_json in ("NaN", "Infinity"):
+        return float(value_json)
+    return None
+
 
 def _dict_nested_set(target: Dict[str, Any], key_list: Sequence[str], v: Any) -> None:
     # recurse down the dictionary structure:
@@ -62,10 +86,98 @@ def _dict_nested_set(target: Dict[str, Any], key_list: Sequence[str], v: Any) ->
     target[key_list[-1]] = v
 
 
+class _MetricTracker(object):
+    """Summary state of one metric with a summary definition.
+
+    The flags and the summary key paths are compiled once per definition, the
+    tracked values are kept in slots which are updated in place for every row.
+    """
+
+    __slots__ = (
+        "generation",
+        "copy_path",
+        "last_path",
+        "best_path",
+        "max_path",
+        "min_path",
+        "mean_path",
+        "track_max",
+        "track_min",
+        "last",
+        "max",
+        "min",
+        "tot",
+        "num",
+        "_kl",
+    )
+
+    def __init__(self, kl: List[str]) -> None:
+        self._kl = tuple(kl)
+        self.generation = -1
+        self.last: Optional[float] = None
+        self.max: Optional[float] = None
+        self.min: Optional[float] = None
+        self.tot = 0.0
+        self.num = 0
+
+    def _path(self, enabled: bool, name: str) -> Optional[Tuple[str, ...]]:
+        return self._kl + (name,) if enabled else None
+
+    def compile(self, d: MetricRecord, generation: int) -> None:
+        s = d.summary
+        # defaulting to minimize if goal is not specified
+        goal_max = d.goal == d.GOAL_MAXIMIZE
+        enabled = not s.none
+        self.generation = generation
+        self.copy_path = self._kl if enabled and s.copy and len(self._kl) > 1 else None
+        self.last_path = self._path(enabled and not self.copy_path and s.last, "last")
+        self.best_path = self._path(enabled and not self.copy_path and s.best, "best")
+        self.max_path = self._path(enabled and not self.copy_path and s.max, "max")
+        self.min_path = self._path(enabled and not self.copy_path and s.min, "min")
+        self.mean_path = self._path(enabled and not self.copy_path and s.mean, "mean")
+        self.track_max = bool(self.max_path or self.best_path and goal_max)
+        self.track_min = bool(self.min_path or self.best_path and not goal_max)
+
+    def update(self, summary: SummaryDict, v: Any, float_v: float) -> bool:
+        if self.copy_path:
+            _dict_nested_set(summary, self.copy_path, v)
+            return True
+        updated = False
+        if self.last_path and float_v != self.last:
+            self.last = float_v
+            _dict_nested_set(summary, self.last_path, v)
+            updated = True
+        if self.track_max and (self.max is None or float_v > self.max):
+            self.max = float_v
+            if self.max_path:
+                _dict_nested_set(summary, self.max_path, v)
+                updated = True
+            if self.best_path:
+                _dict_nested_set(summary, self.best_path, v)
+                updated = True
+        if self.track_min and (self.min is None or float_v < self.min):
+            self.min = float_v
+            if self.min_path:
+                _dict_nested_set(summary, self.min_path, v)
+                updated = True
+            if self.best_path:
+                _dict_nested_set(summary, self.best_path, v)
+                updated = True
+        if self.mean_path:
+            self.tot += float_v
+            self.num += 1
+            _dict_nested_set(summary, self.mean_path, self.tot / self.num)
+            updated = True
+        return updated
+
+
 class HandleManager(object):
     _consolidated_summary: SummaryDict
-    _sampled_history: Dict[str, sample.UniformSampleAccumulator]
-    _partial_history: Dict[str, Any]
+    _summary_json: Dict[str, str]
+    _summary_dirty: Set[str]
+    _summary_removed: Set[str]
+    _sampled_history: sample.SampledHistory
+    _partial_history: HistoryJSON
     _settings: SettingsStatic
     _record_q: "Queue[Record]"
     _result_q: "Queue[Result]"
@@ -77,8 +189,9 @@ class HandleManager(object):
     _tb_watcher: Optional[tb_watcher.TBWatcher]
     _metric_defines: Dict[str, MetricRecord]
     _metric_globs: Dict[str, MetricRecord]
-    _metric_track: Dict[Tuple[str, ...], float]
-    _metric_copy: Dict[Tuple[str, ...], Any]
+    _metric_trackers: Dict[str, _MetricTracker]
+    _metric_generation: int
+    _metric_copy: Dict[str, Any]
     _track_time: Optional[float]
     _accumulate_time: float
     _artifact_xid_done: Dict[str, "ArtifactDoneRequest"]
@@ -111,11 +224,18 @@ class HandleManager(object):
 
         # keep track of summary from key/val updates
         self._consolidated_summary = dict()
-        self._sampled_history = defaultdict(sample.UniformSampleAccumulator)
+        # top level summary keys whose value is only kept as JSON, taken as is
+        # from the history, they are decoded when the summary is worked on
+        self._summary_json = dict()
+        # top level summary keys changed or removed since the last summary record
+        self._summary_dirty = set()
+        self._summary_removed = set()
+        self._sampled_history = sample.SampledHistory()
         self._partial_history = dict()
         self._metric_defines = defaultdict(MetricRecord)
         self._metric_globs = defaultdict(MetricRecord)
-        self._metric_track = dict()
+        self._metric_trackers = dict()
+        self._metric_generation = 0
         self._metric_copy = dict()
 
         # TODO: implement release protocol to clean this up
@@ -155,7 +275,7 @@ class HandleManager(object):
         self._result_q.put(result)
 
     def debounce(self) -> None:
-        pass
+        self._flush_summary_delta()
 
     def handle_request_defer(self, record: Record) -> None:
         defer = record.request.defer
@@ -176,7 +296,11 @@ class HandleManager(object):
         elif state == defer.FLUSH_PARTIAL_HISTORY:
             self._flush_partial_history()
         elif state == defer.FLUSH_SUM:
-            self._save_summary(self._consolidated_summary, flush=True)
+            self._save_summary(
+                self._summary_json_items(), self._summary_removed, flush=True
+            )
+            self._summary_dirty.clear()
+            self._summary_removed.clear()
 
         # defer is used to drive the sender finish state machine
         self._dispatch_record(record, always_send=True)
@@ -208,12 +332,19 @@ class HandleManager(object):
     def handle_alert(self, record: Record) -> None:
         self._dispatch_record(record)
 
-    def _save_summary(self, summary_dict: SummaryDict, flush: bool = False) -> None:
+    def _save_summary(
+        self,
+        summary_json: Dict[str, str],
+        removed: Iterable[str] = (),
+        flush: bool = False,
+    ) -> None:
         summary = SummaryRecord()
-        for k, v in summary_dict.items():
+        for k, value_json in summary_json.items():
             update = summary.update.add()
             update.key = k
-            update.value_json = json.dumps(v)
+            update.value_json = value_json
+        for k in removed:
+            summary.remove.add().key = k
         record = Record(summary=summary)
         if flush:
             self._dispatch_record(record)
@@ -221,89 +352,74 @@ class HandleManager(object):
             tracelog.log_message_queue(record, self._sender_q)
             self._sender_q.put(record)
 
-    def _save_history(self, history: HistoryRecord,) -> None:
-        for item in history.item:
-            # TODO(jhr) save nested keys?
-            k = item.key
-            v = json.loads(item.value_json)
-            if isinstance(v, numbers.Real):
-                self._sampled_history[k].add(v)
+    def _flush_summary_delta(self) -> None:
+        """Send the summary keys changed since the last summary record."""
+        if not self._summary_dirty and not self._summary_removed:
+            return
+        if not self._settings._offline:
+            self._save_summary(
+                self._summary_json_items(self._summary_dirty), self._summary_removed
+            )
+        self._summary_dirty.clear()
+        self._summary_removed.clear()
+
+    def _summary_json_items(
+        self, keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, str]:
+        """Return the JSON of the values of top level summary keys, or of all keys."""
+        if keys is None:
+            keys = list(self._consolidated_summary) + list(self._summary_json)
+        items = {}
+        for k in keys:
+            value_json = self._summary_json.get(k)
+            if value_json is None:
+                value_json = json.dumps(self._consolidated_summary[k])
+            items[k] = value_json
+        return items
+
+    def _decode_summary_key(self, key: str) -> None:
+        """Decode the value of a summary key that is only kept as JSON."""
+        value_json = self._summary_json.pop(key, None)
+        if value_json is not None:
+            self._consolidated_summary[key] = json.loads(value_json)
+
+    def _save_history(self, history_json: HistoryJSON) -> None:
+        # TODO(jhr) save nested keys?
+        # only numbers are sampled, other values don't need to be decoded
+        numbers = {}
+        for k, value_json in history_json.items():
+            v = _json_number(value_json)
+            if v is not None:
+                numbers[k] = v
+        self._sampled_history.add_many(numbers)
+
+    def _metric_tracker(
+        self, metric_key: str, kl: List[str], d: MetricRecord
+    ) -> "_MetricTracker":
+        tracker = self._metric_trackers.get(metric_key)
+        if tracker is None:
+            tracker = _MetricTracker(kl)
+            self._metric_trackers[metric_key] = tracker
+        if tracker.generation != self._metric_generation:
+            tracker.compile(d, self._metric_generation)
+        return tracker
 
-    def _update_summary_metrics(
+    def _update_summary_leaf(
         self,
-        s: "MetricSummary",
         kl: List[str],
-        v: "numbers.Real",
-        float_v: float,
-        goal_max: Optional[bool],
-    ) -> bool:
-        updated = False
-        best_key: Optional[Tuple[str, ...]] = None
-        if s.none:
-            return False
-        if s.copy:
-            # non key list copy already done in _update_summary
-            if len(kl) > 1:
-                _dict_nested_set(self._consolidated_summary, kl, v)
-                return True
-        if s.last:
-            last_key = tuple(kl + ["last"])
-            old_last = self._metric_track.get(last_key)
-            if old_last is None or float_v != old_last:
-                self._metric_track[last_key] = float_v
-                _dict_nested_set(self._consolidated_summary, last_key, v)
-                updated = True
-        if s.best:
-            best_key = tuple(kl + ["best"])
-        if s.max or best_key and goal_max:
-            max_key = tuple(kl + ["max"])
-            old_max = self._metric_track.get(max_key)
-            if old_max is None or float_v > old_max:
-                self._metric_track[max_key] = float_v
-                if s.max:
-                    _dict_nested_set(self._consolidated_summary, max_key, v)
-                    updated = True
-                if best_key:
-                    _dict_nested_set(self._consolidated_summary, best_key, v)
-                    updated = True
-        # defaulting to minimize if goal is not supecified
-        if s.min or best_key and not goal_max:
-            min_key = tuple(kl + ["min"])
-            old_min = self._metric_track.get(min_key)
-            if old_min is None or float_v < old_min:
-                self._metric_track[min_key] = float_v
-                if s.min:
-                    _dict_nested_set(self._consolidated_summary, min_key, v)
-                    updated = True
-                if best_key:
-                    _dict_nested_set(self._consolidated_summary, best_key, v)
-                    updated = True
-        if s.mean:
-            tot_key = tuple(kl + ["tot"])
-            num_key = tuple(kl + ["num"])
-            avg_key = tuple(kl + ["mean"])
-            tot = self._metric_track.get(tot_key, 0.0)
-            num = self._metric_track.get(num_key, 0)
-            tot += float_v
-            num += 1
-            self._metric_track[tot_key] = tot
-            self._metric_track[num_key] = num
-            _dict_nested_set(self._consolidated_summary, avg_key, tot / num)
-            updated = True
-        return updated
-
-    def _update_summary_leaf(
-        self, kl: List[str], v: Any, d: Optional[MetricRecord] = None,
+        v: Any,
+        d: Optional[MetricRecord] = None,
+        metric_key: str = "",
     ) -> bool:
         has_summary = d and d.HasField("summary")
         if len(kl) == 1:
-            copy_key = tuple(kl)
-            old_copy = self._metric_copy.get(copy_key)
+            key = kl[0]
+            old_copy = self._metric_copy.get(key)
             if old_copy is None or v != old_copy:
-                self._metric_copy[copy_key] = v
+                self._metric_copy[key] = v
                 # Store copy metric if not specified, or copy behavior
                 if not has_summary or (d and d.summary.copy):
-                    self._consolidated_summary[kl[0]] = v
+                    self._consolidated_summary[key] = v
                     return True
         if not d:
             return False
@@ -313,15 +429,8 @@ class HandleManager(object):
             return False
         if math.isnan(v):
             return False
-        float_v = float(v)
-        goal_max = None
-        if d.goal:
-            goal_max = d.goal == d.GOAL_MAXIMIZE
-        if self._update_summary_metrics(
-            d.summary, kl=kl, v=v, float_v=float_v, goal_max=goal_max
-        ):
-            return True
-        return False
+        tracker = self._metric_tracker(metric_key, kl, d)
+        return tracker.update(self._consolidated_summary, v, float(v))
 
     def _update_summary_list(
         self, kl: List[str], v: Any, d: Optional[MetricRecord] = None,
@@ -340,7 +449,7 @@ class HandleManager(object):
             if "_latest_artifact_path" in v and "artifact_path" in v:
                 # TODO: Make non-destructive?
                 v["artifact_path"] = v["_latest_artifact_path"]
-        updated = self._update_summary_leaf(kl=kl, v=v, d=d)
+        updated = self._update_summary_leaf(kl=kl, v=v, d=d, metric_key=metric_key)
         return updated
 
     def _update_summary_media_objects(self, v: Dict[str, Any]) -> Dict[str, Any]:
@@ -357,33 +466,57 @@ class HandleManager(object):
                 v[nk] = nv
         return v
 
-    def _update_summary(self, history_dict: Dict[str, Any]) -> bool:
+    def _update_summary_json(self, k: str, value_json: str) -> bool:
+        """Take the value of a history key as is, without decoding it."""
+        if _LATEST_ARTIFACT_PATH in value_json:
+            self._summary_json.pop(k, None)
+            v = self._update_summary_media_objects({k: json.loads(value_json)})[k]
+            self._consolidated_summary[k] = v
+            return True
+        if self._summary_json.get(k) == value_json:
+            return False
+        self._summary_json[k] = value_json
+        self._consolidated_summary.pop(k, None)
+        return True
+
+    def _update_summary(self, history_json: HistoryJSON) -> bool:
         # keep old behavior fast path if no define metrics have been used
         if not self._metric_defines:
-            history_dict = self._update_summary_media_objects(history_dict)
-            self._consolidated_summary.update(history_dict)
+            for k, value_json in history_json.items():
+                self._update_summary_json(k, value_json)
+            self._summary_dirty.update(history_json)
+            self._summary_removed.difference_update(history_json)
             return True
         updated = False
-        for k, v in history_dict.items():
-            if self._update_summary_list(kl=[k], v=v):
+        for k, value_json in history_json.items():
+            # only defined metrics, and dicts which can hold some, are decoded
+            if k.replace(".", "\\.") in self._metric_defines or value_json.startswith(
+                "{"
+            ):
+                self._decode_summary_key(k)
+                changed = self._update_summary_list(kl=[k], v=json.loads(value_json))
+            else:
+                changed = self._update_summary_json(k, value_json)
+            if changed:
+                self._summary_dirty.add(k)
+                self._summary_removed.discard(k)
                 updated = True
         return updated
 
     def _history_assign_step(
-        self, history: HistoryRecord, history_dict: Dict[str, Any],
+        self, history: HistoryRecord, history_json: HistoryJSON,
     ) -> None:
         has_step = history.HasField("step")
         item = history.item.add()
         item.key = "_step"
         if has_step:
             step = history.step.num
-            history_dict["_step"] = step
             item.value_json = json.dumps(step)
             self._step = step + 1
         else:
-            history_dict["_step"] = self._step
             item.value_json = json.dumps(self._step)
             self._step += 1
+        history_json["_step"] = item.value_json
 
     def _history_define_metric(self, hkey: str) -> Optional[MetricRecord]:
         """check for hkey match in glob metrics, return defined metric."""
@@ -405,7 +538,7 @@ class HandleManager(object):
         self,
         kl: List[str],
         v: Any,
-        history_dict: Dict[str, Any],
+        history_json: HistoryJSON,
         update_history: Dict[str, Any],
     ) -> None:
         hkey = ".".join([k.replace(".", "\\.") for k in kl])
@@ -420,9 +553,8 @@ class HandleManager(object):
             self._handle_defined_metric(mr)
 
         if m.options.step_sync and m.step_metric:
-            if m.step_metric not in history_dict:
-                copy_key = tuple([m.step_metric])
-                step = self._metric_copy.get(copy_key)
+            if m.step_metric not in history_json:
+                step = self._metric_copy.get(m.step_metric)
                 if step is not None:
                     update_history[m.step_metric] = step
 
@@ -430,7 +562,7 @@ class HandleManager(object):
         self,
         kl: List[str],
         v: Any,
-        history_dict: Dict[str, Any],
+        history_json: HistoryJSON,
         update_history: Dict[str, Any],
     ) -> None:
         if isinstance(v, dict):
@@ -438,78 +570,74 @@ class HandleManager(object):
                 self._history_update_list(
                     kl=kl[:] + [nk],
                     v=nv,
-                    history_dict=history_dict,
+                    history_json=history_json,
                     update_history=update_history,
                 )
             return
         self._history_update_leaf(
-            kl=kl, v=v, history_dict=history_dict, update_history=update_history
+            kl=kl, v=v, history_json=history_json, update_history=update_history
         )
 
     def _history_update(
-        self, history: HistoryRecord, history_dict: Dict[str, Any],
+        self, history: HistoryRecord, history_json: HistoryJSON,
     ) -> None:
 
         #  if syncing an old run, we can skip this logic
-        if history_dict.get("_step") is None:
-            self._history_assign_step(history, history_dict)
+        if history_json.get("_step", "null") == "null":
+            self._history_assign_step(history, history_json)
 
         update_history: Dict[str, Any] = {}
         # Look for metric matches
         if self._metric_defines or self._metric_globs:
-            for hkey, hval in history_dict.items():
-                self._history_update_list([hkey], hval, history_dict, update_history)
+            for hkey, value_json in history_json.items():
+                # only nested keys need the value, to be walked
+                hval = json.loads(value_json) if value_json.startswith("{") else None
+                self._history_update_list([hkey], hval, history_json, update_history)
 
         if update_history:
-            history_dict.update(update_history)
             for k, v in update_history.items():
                 item = history.item.add()
                 item.key = k
                 item.value_json = json.dumps(v)
+                history_json[k] = item.value_json
 
     def handle_history(self, record: Record) -> None:
-        history_dict = proto_util.dict_from_proto_list(record.history.item)
+        # values are only decoded where they are needed, the record is passed
+        # on to the sender with the JSON of the user process
+        history_json = {item.key: item.value_json for item in record.history.item}
 
         # Inject _runtime if it is not present
-        if history_dict is not None:
-            if "_runtime" not in history_dict:
-                self._history_assign_runtime(record.history, history_dict)
+        if "_runtime" not in history_json:
+            self._history_assign_runtime(record.history, history_json)
 
-        self._history_update(record.history, history_dict)
+        self._history_update(record.history, history_json)
         self._dispatch_record(record)
-        self._save_history(record.history)
-        updated = self._update_summary(history_dict)
-        if updated:
-            self._save_summary(self._consolidated_summary)
+        self._save_history(history_json)
+        # changed keys are sent as a summary delta on the next debounce
+        self._update_summary(history_json)
 
     def _flush_partial_history(self, step: Optional[int] = None,) -> None:
         if self._partial_history:
             history = HistoryRecord()
-            for k, v in self._partial_history.items():
+            for k, value_json in self._partial_history.items():
                 item = history.item.add()
                 item.key = k
-                item.value_json = json.dumps(v)
+                item.value_json = value_json
             if step is not None:
                 history.step.num = step
             self.handle_history(Record(history=history))
             self._partial_history = {}
 
-    def handle_request_partial_history(self, record: Record) -> None:
-        partial_history = record.request.partial_history
-
-        flush = None
-        if partial_history.HasField("action"):
-            flush = partial_history.action.flush
-
-        step = None
-        if partial_history.HasField("step"):
-            step = partial_history.step.num
-
-        history_dict = proto_util.dict_from_proto_list(partial_history.item)
+    def _handle_partial_history(
+        self,
+        history_json: HistoryJSON,
+        step: Optional[int] = None,
+        flush: Optional[bool] = None,
+    ) -> None:
         if step is not None:
             if step < self._step:
                 logger.warning(
-                    f"Step {step} < {self._step}. Dropping entry: {history_dict}."
+                    f"Step {step} < {self._step}. Dropping entry: {history_json}."
                 )
                 return
             elif step > self._step:
@@ -518,11 +646,33 @@ class HandleManager(object):
         elif flush is None:
             flush = True
 
-        self._partial_history.update(history_dict)
+        self._partial_history.update(history_json)
 
         if flush:
             self._flush_partial_history(self._step)
 
+    def handle_request_partial_history(self, record: Record) -> None:
+        partial_history = record.request.partial_history
+
+        flush = None
+        if partial_history.HasField("action"):
+            flush = partial_history.action.flush
+
+        step = None
+        if partial_history.HasField("step"):
+            step = partial_history.step.num
+
+        history_json = {item.key: item.value_json for item in partial_history.item}
+        self._handle_partial_history(history_json, step=step, flush=flush)
+
+    def handle_request_partial_history_batch(self, record: Record) -> None:
+        # batched rows were logged without step or commit, each one is
+        # handled as if it had been sent in its own partial history request
+        for history_json in history_batch.json_rows_from_proto(
+            record.request.partial_history_batch
+        ):
+            self._handle_partial_history(history_json)
+
     def handle_summary(self, record: Record) -> None:
         summary = record.summary
         for item in summary.update:
@@ -535,6 +685,15 @@ class HandleManager(object):
                 # summary[""] is valid
                 key = (item.key,)
 
+            self._summary_dirty.add(key[0])
+            self._summary_removed.discard(key[0])
+            if len(key) == 1:
+                # top level values are kept as sent until they are needed
+                self._summary_json[key[0]] = item.value_json
+                self._consolidated_summary.pop(key[0], None)
+                continue
+            self._decode_summary_key(key[0])
+
             target = self._consolidated_summary
 
             # recurse down the dictionary structure:
@@ -554,6 +713,7 @@ class HandleManager(object):
                 # summary[""] is valid
                 key = (item.key,)
 
+            self._decode_summary_key(key[0])
             target = self._consolidated_summary
 
             # recurse down the dictionary structure:
@@ -562,8 +722,11 @@ class HandleManager(object):
 
             # use the last element of the key to erase the leaf:
             del target[key[-1]]
-
-        self._save_summary(self._consolidated_summary)
+            if len(key) > 1:
+                self._summary_dirty.add(key[0])
+            else:
+                self._summary_dirty.discard(key[0])
+                self._summary_removed.add(key[0])
 
     def handle_exit(self, record: Record) -> None:
         if self._track_time is not None:
@@ -648,7 +811,9 @@ class HandleManager(object):
 
         if not self._settings._disable_stats:
             pid = os.getpid()
-            self._system_stats = stats.SystemStats(pid=pid, interface=self._interface)
+            self._system_stats = stats.SystemStats(
+                pid=pid, interface=self._interface, settings=self._settings
+            )
             self._system_stats.start()
 
         if not self._settings._disable_meta and not run_start.run.resumed:
@@ -696,10 +861,10 @@ class HandleManager(object):
 
     def handle_request_get_summary(self, record: Record) -> None:
         result = proto_util._result_from_record(record)
-        for key, value in self._consolidated_summary.items():
+        for key, value_json in self._summary_json_items().items():
             item = SummaryItem()
             item.key = key
-            item.value_json = json.dumps(value)
+            item.value_json = value_json
             result.response.get_summary_response.item.append(item)
         self._respond_result(result)
 
@@ -716,6 +881,8 @@ class HandleManager(object):
             self._metric_defines[metric.name].CopyFrom(metric)
         else:
             self._metric_defines[metric.name].MergeFrom(metric)
+        # recompile the summary trackers on next use
+        self._metric_generation += 1
 
         # before dispatching, make sure step_metric is defined, if not define it and
         # dispatch it locally first
@@ -773,9 +940,9 @@ class HandleManager(object):
             item = SampledHistoryItem()
             item.key = key
             values: Iterable[Any] = sampled.get()
-            if all(isinstance(i, numbers.Integral) for i in values):
+            if sampled.is_int:
                 item.values_int.extend(values)
-            elif all(isinstance(i, numbers.Real) for i in values):
+            else:
                 item.values_float.extend(values)
             result.response.sampled_history_response.item.append(item)
         self._respond_result(result)
@@ -797,18 +964,17 @@ class HandleManager(object):
     next = __next__
 
     def _history_assign_runtime(
-        self, history: HistoryRecord, history_dict: Dict[str, Any],
+        self, history: HistoryRecord, history_json: HistoryJSON,
     ) -> None:
         # _runtime calculation is meaningless if there is no _timestamp
-        if "_timestamp" not in history_dict:
+        if "_timestamp" not in history_json:
             return
+        timestamp = json.loads(history_json["_timestamp"])
         # if it is offline sync, self._run_start_time is 0
         # in that case set it to the first tfevent timestamp
         if self._run_start_time == 0:
-            self._run_start_time = history_dict["_timestamp"]
-        history_dict["_runtime"] = int(
-            history_dict["_timestamp"] - self._run_start_time
-        )
+            self._run_start_time = timestamp
         item = history.item.add()
         item.key = "_runtime"
-        item.value_json = json.dumps(history_dict[item.key])
+        item.value_json = json.dumps(int(timestamp - self._run_start_time))
+        history_json["_runtime"] = item.value_json
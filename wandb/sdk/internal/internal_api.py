@@ -112,6 +112,11 @@ class Api:
         self.upload_file_retry = normalize_exceptions(
             retry.retriable(retry_timedelta=retry_timedelta)(self.upload_file)
         )
+        self.upload_multipart_file_chunk_retry = normalize_exceptions(
+            retry.retriable(retry_timedelta=retry_timedelta)(
+                self.upload_multipart_file_chunk
+            )
+        )
         self._client_id_mapping = {}
         # Large file uploads to azure can optionally use their SDK
         self._azure_blob_module = util.get_module("azure.storage.blob")
@@ -120,10 +125,12 @@ class Api:
             self.query_types,
             self.server_info_types,
             self.server_use_artifact_input_info,
+            self.server_create_artifact_file_spec_input_info,
         ) = (
             None,
             None,
             None,
+            None,
         )
         self._max_cli_version = None
 
@@ -344,6 +351,38 @@ class Api:
             ]
         return self.server_use_artifact_input_info
 
+    def server_create_artifact_file_spec_input_introspection(self):
+        query_string = """
+           query ProbeServerCreateArtifactFileSpecInput {
+               CreateArtifactFileSpecInputInfoType: __type(name: "CreateArtifactFileSpecInput") {
+                   name
+                   inputFields {
+                       name
+                   }
+                }
+            }
+        """
+
+        if self.server_create_artifact_file_spec_input_info is None:
+            query = gql(query_string)
+            res = self.gql(query)
+            self.server_create_artifact_file_spec_input_info = [
+                field.get("name", "")
+                for field in (res.get("CreateArtifactFileSpecInputInfoType") or {}).get(
+                    "inputFields", [{}]
+                )
+            ]
+        return self.server_create_artifact_file_spec_input_info
+
+    def server_supports_multipart_upload(self):
+        try:
+            fields = self.server_create_artifact_file_spec_input_introspection()
+        except Exception:
+            logger.exception("failed to probe multipart upload support")
+            self.server_create_artifact_file_spec_input_info = []
+            return False
+        return "uploadPartsInput" in fields
+
     @normalize_exceptions
     def launch_agent_introspection(self):
         query = gql(
@@ -1601,6 +1640,37 @@ class Api:
             else:
                 raise requests.exceptions.ConnectionError(e.message)
 
+    def upload_multipart_file_chunk(self, url, upload_chunk, extra_headers=None):
+        """Upload one part of a multipart upload.
+
+        Arguments:
+            url (str): The signed url of the part
+            upload_chunk (bytes or file-like): The data of the part, a
+                file-like object is rewound before the request is retried
+            extra_headers (dict, optional): Headers to send with the part
+
+        Returns:
+            The requests library response object, its ETag header identifies
+            the uploaded part
+        """
+        try:
+            response = requests.put(url, data=upload_chunk, headers=extra_headers)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error("upload_multipart_file_chunk exception {}: {}".format(url, e))
+            status_code = e.response.status_code if e.response is not None else 0
+            if hasattr(upload_chunk, "seek"):
+                upload_chunk.seek(0)
+            # Retry errors from cloud storage or local network issues
+            if status_code in (308, 408, 409, 429, 500, 502, 503, 504) or isinstance(
+                e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+            ):
+                e = retry.TransientError(exc=e)
+                six.reraise(type(e), e, sys.exc_info()[2])
+            else:
+                util.sentry_reraise(e)
+        return response
+
     def upload_file(self, url, file, callback=None, extra_headers={}):
         """Uploads a file to W&B with failure resumption
 
@@ -2550,8 +2620,7 @@ class Api:
 
     @normalize_exceptions
     def create_artifact_files(self, artifact_files):
-        mutation = gql(
-            """
+        query_template = """
         mutation CreateArtifactFiles(
             $storageLayout: ArtifactStorageLayout!
             $artifactFiles: [CreateArtifactFileSpecInput!]!
@@ -2568,6 +2637,7 @@ class Api:
                             displayName
                             uploadUrl
                             uploadHeaders
+                            _MULTIPART_UPLOAD_FIELDS_
                             artifact {
                                 id
                             }
@@ -2577,6 +2647,21 @@ class Api:
             }
         }
         """
+        # part urls are only requested for files that asked for a multipart upload
+        multipart_fields = ""
+        if any("uploadPartsInput" in af for af in artifact_files):
+            multipart_fields = """
+                            storagePath
+                            uploadMultipartUrls {
+                                uploadID
+                                uploadUrlParts {
+                                    partNumber
+                                    uploadUrl
+                                }
+                            }
+            """
+        mutation = gql(
+            query_template.replace("_MULTIPART_UPLOAD_FIELDS_", multipart_fields)
         )
 
         # TODO: we should use constants here from interface/artifacts.py
@@ -2600,6 +2685,55 @@ class Api:
             result[node["displayName"]] = node
         return result
 
+    @normalize_exceptions
+    def complete_multipart_upload_artifact(
+        self, artifact_id, storage_path, completed_parts, upload_id
+    ):
+        """Combine the uploaded parts of a multipart upload into the stored file.
+
+        Arguments:
+            artifact_id (str): The id of the artifact the file belongs to
+            storage_path (str): The storage path returned by create_artifact_files
+            completed_parts (list): Dicts with the partNumber and the ETag (as
+                hexMD5) of every uploaded part
+            upload_id (str): The id of the multipart upload
+
+        Returns:
+            The digest of the stored file
+        """
+        mutation = gql(
+            """
+        mutation CompleteMultipartUploadArtifact(
+            $completeMultipartAction: CompleteMultipartAction!,
+            $completedParts: [UploadPartsInput!]!,
+            $artifactID: ID!
+            $storagePath: String!
+            $uploadID: String!
+        ) {
+            completeMultipartUploadArtifact(input: {
+                completeMultipartAction: $completeMultipartAction,
+                completedParts: $completedParts,
+                artifactID: $artifactID,
+                storagePath: $storagePath,
+                uploadID: $uploadID
+            }) {
+                digest
+            }
+        }
+        """
+        )
+        response = self.gql(
+            mutation,
+            variable_values={
+                "completeMultipartAction": "Complete",
+                "completedParts": completed_parts,
+                "artifactID": artifact_id,
+                "storagePath": storage_path,
+                "uploadID": upload_id,
+            },
+        )
+        return response["completeMultipartUploadArtifact"]["digest"]
+
     @normalize_exceptions
     def notify_scriptable_run_alert(self, title, text, level=None, wait_duration=None):
         mutation = gql(
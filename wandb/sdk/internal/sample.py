@@ -3,7 +3,9 @@
 sample.
 """
 
+import array
 import math
+import numbers
 
 
 class UniformSampleAccumulator(object):
@@ -25,10 +27,12 @@ class UniformSampleAccumulator(object):
         self._index = [0] * self._buckets
         self._count = 0
         self._log2 = [0]
+        # samples are kept as int64 until a value doesn't fit
+        self._is_int = True
 
         # pre-allocate buckets
         for _ in range(self._buckets):
-            self._bucket.append([0] * self._max)
+            self._bucket.append(array.array("q", bytes(8 * self._max)))
         # compute integer log2
         self._log2 += [int(math.log(i, 2)) for i in range(1, 2 ** self._buckets + 1)]
 
@@ -39,7 +43,18 @@ class UniformSampleAccumulator(object):
             vals = [self._bucket[b][i] for i in range(self._index[b])]
             print("{}: {}".format(b, vals))
 
+    @property
+    def is_int(self):
+        """Whether all the samples are integers."""
+        return self._is_int
+
+    def _to_float(self):
+        self._is_int = False
+        self._bucket = [array.array("d", b) for b in self._bucket]
+
     def add(self, val):
+        if self._is_int and not (type(val) is int or isinstance(val, numbers.Integral)):
+            self._to_float()
         self._count += 1
         cnt = self._count
         if cnt & self._mask:
@@ -53,21 +68,49 @@ class UniformSampleAccumulator(object):
             self._mask = (self._mask << 1) | 1
             b += self._buckets - 1
         b = (b + self._buckets_index) % self._buckets
-        self._bucket[b][self._index[b]] = val
+        try:
+            self._bucket[b][self._index[b]] = val
+        except OverflowError:
+            # larger than int64
+            self._to_float()
+            self._bucket[b][self._index[b]] = val
         self._index[b] += 1
 
+    def add_many(self, vals):
+        for val in vals:
+            self.add(val)
+
     def get(self):
-        full = []
-        sampled = []
-        # self._show()
+        full = array.array(self._bucket[0].typecode)
+        sampled = array.array(self._bucket[0].typecode)
         for b in range(self._buckets):
             max_num = 2 ** b
             b = (b + self._buckets_index) % self._buckets
             modb = self._index[b] // max_num
-            for i in range(self._index[b]):
-                if not modb or i % modb == 0:
-                    sampled.append(self._bucket[b][i])
-                full.append(self._bucket[b][i])
+            values = self._bucket[b][: self._index[b]]
+            sampled.extend(values[::modb] if modb else values)
+            full.extend(values)
         if len(sampled) < self._samples:
             return tuple(full)
         return tuple(sampled)
+
+
+class SampledHistory(object):
+    """Sample accumulators of the numeric keys of the history."""
+
+    def __init__(self):
+        self._accumulators = {}
+
+    def add_many(self, row):
+        """Add the numeric values of a history row."""
+        accumulators = self._accumulators
+        for key, val in row.items():
+            if not (type(val) in (int, float) or isinstance(val, numbers.Real)):
+                continue
+            accumulator = accumulators.get(key)
+            if accumulator is None:
+                accumulator = accumulators[key] = UniformSampleAccumulator()
+            accumulator.add(val)
+
+    def items(self):
+        return self._accumulators.items()
@@ -180,7 +180,7 @@ class SendManager:
         self._exit_code = 0
 
     @classmethod
-    def setup(cls, root_dir: str) -> "SendManager":
+    def setup(cls, root_dir: str, resume: Optional[str] = None) -> "SendManager":
         """This is a helper class method to setup a standalone SendManager.
         Currently we're using this primarily for `sync.py`.
         """
@@ -190,7 +190,7 @@ class SendManager:
             root_dir=root_dir,
             _start_time=0,
             git_remote=None,
-            resume=None,
+            resume=resume,
             program=None,
             ignore_globs=(),
             run_id=None,
@@ -204,6 +204,7 @@ class SendManager:
             save_code=None,
             email=None,
             silent=None,
+            _file_stream_compression="auto",
         )
         settings = SettingsStatic(sd)
         record_q: "Queue[Record]" = queue.Queue()
@@ -346,8 +347,22 @@ class SendManager:
                 break
             except Exception as e:
                 logger.warning("Error emptying retry queue: {}".format(e))
+        if self._fs:
+            self._fill_file_stream_stats(status_resp.file_stream_stats)
         self._respond_result(result)
 
+    def _fill_file_stream_stats(
+        self, stats: wandb_internal_pb2.FileStreamStats
+    ) -> None:
+        assert self._fs
+        fs_stats = self._fs.stats()
+        stats.pending_chunks = fs_stats["pending_chunks"]
+        stats.inflight_requests = fs_stats["inflight_requests"]
+        stats.sent_chunks = fs_stats["sent_chunks"]
+        stats.dropped_chunks = fs_stats["dropped_chunks"]
+        stats.lag_seconds = fs_stats["lag_seconds"]
+        stats.spooled_bytes = fs_stats["spooled_bytes"]
+
     def send_request_login(self, record: "Record") -> None:
         # TODO: do something with api_key or anonymous?
         # TODO: return an error if we aren't logged in?
@@ -461,10 +476,16 @@ class SendManager:
             resp.pusher_stats.uploaded_bytes = status["uploaded_bytes"]
             resp.pusher_stats.total_bytes = status["total_bytes"]
             resp.pusher_stats.deduped_bytes = status["deduped_bytes"]
+            resp.pusher_stats.file_stream_raw_bytes = status["file_stream_raw_bytes"]
+            resp.pusher_stats.file_stream_sent_bytes = status["file_stream_sent_bytes"]
             resp.file_counts.wandb_count = file_counts["wandb"]
             resp.file_counts.media_count = file_counts["media"]
             resp.file_counts.artifact_count = file_counts["artifact"]
             resp.file_counts.other_count = file_counts["other"]
+        if self._fs:
+            self._fill_file_stream_stats(
+                result.response.poll_exit_response.file_stream_stats
+            )
 
         if self._exit_result and not alive:
             # pusher join should not block as it was reported as not alive
@@ -783,6 +804,7 @@ class SendManager:
             self._run.run_id,
             self._run.start_time.ToSeconds(),
             settings=self._api_settings,
+            compression=self._settings._file_stream_compression,
         )
         # Ensure the streaming polices have the proper offsets
         self._fs.set_file_policy("wandb-summary.json", file_stream.SummaryFilePolicy())
@@ -815,18 +837,26 @@ class SendManager:
             self._run.start_time.ToSeconds(),
         )
 
-    def _save_history(self, history_dict: Dict[str, Any]) -> None:
+    def _save_history(self, history_json: Dict[str, str]) -> None:
         if self._fs:
-            self._fs.push(filenames.HISTORY_FNAME, json.dumps(history_dict))
+            # the values are already JSON, they are spliced into the line
+            line = ", ".join(
+                "%s: %s" % (json.dumps(k), value_json)
+                for k, value_json in history_json.items()
+            )
+            self._fs.push(filenames.HISTORY_FNAME, "{%s}" % line)
 
     def send_history(self, record: "Record") -> None:
         history = record.history
-        history_dict = proto_util.dict_from_proto_list(history.item)
-        self._save_history(history_dict)
+        history_json = {item.key: item.value_json for item in history.item}
+        self._save_history(history_json)
 
     def send_summary(self, record: "Record") -> None:
+        # summary records only carry the top level keys changed or removed
         summary_dict = proto_util.dict_from_proto_list(record.summary.update)
-        self._cached_summary = summary_dict
+        self._cached_summary.update(summary_dict)
+        for item in record.summary.remove:
+            self._cached_summary.pop(item.key, None)
         self._update_summary()
 
     def _update_summary(self) -> None:
@@ -11,6 +11,11 @@ class SettingsStatic:
     _offline: "Optional[bool]"
     _disable_stats: "Optional[bool]"
     _disable_meta: "Optional[bool]"
+    _stats_sample_rates: "Dict[str, float]"
+    _sync_file_durability: str
+    _sync_file_fsync_seconds: float
+    system_sample: int
+    system_sample_seconds: float
     _start_time: float
     _start_datetime: str
     files_dir: str
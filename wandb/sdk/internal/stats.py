@@ -2,11 +2,12 @@
 from __future__ import absolute_import
 
 import json
+import logging
 import platform
 import subprocess
 import threading
 import time
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Set, TYPE_CHECKING, Union
 
 import psutil
 import wandb
@@ -17,21 +18,27 @@ from . import tpu
 from ..interface.interface_queue import InterfaceQueue
 from ..lib import telemetry
 
+if TYPE_CHECKING:
+    from .settings_static import SettingsStatic
+
 
 GPUHandle = object
 SamplerDict = Dict[str, List[float]]
 StatsDict = Dict[str, Union[float, Dict[str, float]]]
 
+logger = logging.getLogger(__name__)
+
 
 # TODO: hard coded max watts as 16.5, found this number in the SMC list.
 # Eventually we can have the apple_gpu_stats binary query for this.
 M1_MAX_POWER_WATTS = 16.5
 
+# walking the process tree is expensive with many child processes (e.g.
+# dataloader workers), it is only refreshed this often
+PROCESS_TREE_REFRESH_SECONDS = 30.0
 
-def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
-    if not psutil:
-        return False
 
+def _our_pids() -> Set[int]:
     # NOTE: this optimizes for the case where wandb was initialized from
     # iniside the user script (i.e. `wandb.init()`). If we ran using
     # `wandb run` on the command line, the shell will be detected as the
@@ -43,7 +50,17 @@ def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
     our_processes = base_process.children(recursive=True)
     our_processes.append(base_process)
 
-    our_pids = set([process.pid for process in our_processes])
+    return set([process.pid for process in our_processes])
+
+
+def gpu_in_use_by_this_process(
+    gpu_handle: GPUHandle, our_pids: Optional[Set[int]] = None
+) -> bool:
+    if not psutil:
+        return False
+
+    if our_pids is None:
+        our_pids = _our_pids()
 
     compute_pids = set(
         [
@@ -63,7 +80,262 @@ def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
     return len(pids_using_device & our_pids) > 0
 
 
+class ProcessTree(object):
+    """Cached psutil handles of the monitored process and of our process tree."""
+
+    def __init__(
+        self, pid: int, refresh_seconds: float = PROCESS_TREE_REFRESH_SECONDS
+    ) -> None:
+        self._pid = pid
+        self._proc: Optional[psutil.Process] = None
+        self._refresh_seconds = refresh_seconds
+        self._pids: Set[int] = set()
+        self._refreshed: Optional[float] = None
+
+    @property
+    def proc(self) -> psutil.Process:
+        # raises psutil.NoSuchProcess until the process exists
+        if self._proc is None:
+            self._proc = psutil.Process(pid=self._pid)
+        return self._proc
+
+    def stale(self) -> bool:
+        return (
+            self._refreshed is None
+            or time.monotonic() - self._refreshed >= self._refresh_seconds
+        )
+
+    def pids(self) -> Set[int]:
+        if self.stale():
+            try:
+                self._pids = _our_pids()
+            except psutil.Error:
+                pass
+            self._refreshed = time.monotonic()
+        return self._pids
+
+
+class Collector(object):
+    """A source of system metrics, sampled by SystemStats at its own rate.
+
+    Subclasses set a name, which is also the key of their sample rate in the
+    _stats_sample_rates setting, and implement sample().
+    """
+
+    name = ""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def sample(self) -> StatsDict:
+        raise NotImplementedError
+
+
+class CPUCollector(Collector):
+    name = "cpu"
+
+    def __init__(self, interval: float, process_tree: ProcessTree) -> None:
+        super(CPUCollector, self).__init__(interval)
+        self._process_tree = process_tree
+
+    def sample(self) -> StatsDict:
+        stats: StatsDict = {"cpu": psutil.cpu_percent()}
+        try:
+            stats["proc.cpu.threads"] = self._process_tree.proc.num_threads()
+        except psutil.NoSuchProcess:
+            pass
+        return stats
+
+
+class MemoryCollector(Collector):
+    name = "memory"
+
+    def __init__(self, interval: float, process_tree: ProcessTree) -> None:
+        super(MemoryCollector, self).__init__(interval)
+        self._process_tree = process_tree
+
+    def sample(self) -> StatsDict:
+        sysmem = psutil.virtual_memory()
+        stats: StatsDict = {
+            "memory": sysmem.percent,
+            "proc.memory.availableMB": sysmem.available / 1048576.0,
+        }
+        try:
+            proc = self._process_tree.proc
+            stats["proc.memory.rssMB"] = proc.memory_info().rss / 1048576.0
+            stats["proc.memory.percent"] = proc.memory_percent()
+        except psutil.NoSuchProcess:
+            pass
+        return stats
+
+
+class DiskCollector(Collector):
+    name = "disk"
+
+    def sample(self) -> StatsDict:
+        # TODO: maybe show other partitions, will likely need user to configure
+        return {"disk": psutil.disk_usage("/").percent}
+
+
+class NetworkCollector(Collector):
+    name = "network"
+
+    def __init__(self, interval: float) -> None:
+        super(NetworkCollector, self).__init__(interval)
+        net = psutil.net_io_counters()
+        self.network_init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
+
+    def sample(self) -> StatsDict:
+        net = psutil.net_io_counters()
+        return {
+            "network": {
+                "sent": net.bytes_sent - self.network_init["sent"],
+                "recv": net.bytes_recv - self.network_init["recv"],
+            }
+        }
+
+
+class NvmlCollector(Collector):
+    name = "gpu"
+
+    def __init__(
+        self, interval: float, gpu_count: int, process_tree: ProcessTree
+    ) -> None:
+        super(NvmlCollector, self).__init__(interval)
+        self._process_tree = process_tree
+        self._handles: List[Optional[GPUHandle]] = []
+        for i in range(gpu_count):
+            try:
+                self._handles.append(pynvml.nvmlDeviceGetHandleByIndex(i))
+            except pynvml.NVMLError:
+                self._handles.append(None)
+        self._has_power = [True] * gpu_count
+        self._in_use = [False] * gpu_count
+
+    def _refresh_in_use(self) -> None:
+        our_pids = self._process_tree.pids()
+        for i, handle in enumerate(self._handles):
+            if handle is None:
+                continue
+            try:
+                self._in_use[i] = gpu_in_use_by_this_process(handle, our_pids)
+            except pynvml.NVMLError:
+                self._in_use[i] = False
+
+    def sample(self) -> StatsDict:
+        if self._process_tree.stale():
+            self._refresh_in_use()
+
+        stats: StatsDict = {}
+        for i, handle in enumerate(self._handles):
+            if handle is None:
+                continue
+            try:
+                utilz = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                temp = pynvml.nvmlDeviceGetTemperature(
+                    handle, pynvml.NVML_TEMPERATURE_GPU
+                )
+            except pynvml.NVMLError:
+                continue
+            gpu_stats = {
+                "gpu": utilz.gpu,
+                "memory": utilz.memory,
+                "memoryAllocated": (memory.used / float(memory.total)) * 100,
+                "temp": temp,
+            }
+
+            # Some GPUs don't provide information about power usage
+            if self._has_power[i]:
+                try:
+                    power_watts = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
+                    power_capacity_watts = (
+                        pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
+                    )
+                    gpu_stats["powerWatts"] = power_watts
+                    gpu_stats["powerPercent"] = (
+                        power_watts / power_capacity_watts
+                    ) * 100
+                except pynvml.NVMLError:
+                    self._has_power[i] = False
+
+            for key, value in gpu_stats.items():
+                stats["gpu.{}.{}".format(i, key)] = value
+                if self._in_use[i]:
+                    stats["gpu.process.{}.{}".format(i, key)] = value
+        return stats
+
+
+class AppleGPUCollector(Collector):
+    name = "gpu"
+
+    def __init__(self, interval: float, interface: Optional[InterfaceQueue]) -> None:
+        super(AppleGPUCollector, self).__init__(interval)
+        self._interface = interface
+        self._telem = telemetry.TelemetryRecord()
+
+    @staticmethod
+    def available() -> bool:
+        return platform.system() == "Darwin" and platform.processor() == "arm"
+
+    def sample(self) -> StatsDict:
+        stats: StatsDict = {}
+        try:
+            out = subprocess.check_output([util.apple_gpu_stats_binary(), "--json"])
+            m1_stats = json.loads(out.split(b"\n")[0])
+            stats["gpu.0.gpu"] = m1_stats["utilization"]
+            stats["gpu.0.memoryAllocated"] = m1_stats["mem_used"]
+            stats["gpu.0.temp"] = m1_stats["temperature"]
+            stats["gpu.0.powerWatts"] = m1_stats["power"]
+            stats["gpu.0.powerPercent"] = (m1_stats["power"] / M1_MAX_POWER_WATTS) * 100
+            # TODO: this stat could be useful eventually, it was consistently
+            # 0 in my experimentation and requires a frontend change
+            # so leaving it out for now.
+            # stats["gpu.0.cpuWaitMs"] = m1_stats["cpu_wait_ms"]
+
+            if self._interface and not self._telem.env.m1_gpu:
+                self._telem.env.m1_gpu = True
+                self._interface._publish_telemetry(self._telem)
+
+        except (OSError, ValueError, TypeError, subprocess.CalledProcessError) as e:
+            wandb.termwarn("GPU stats error {}".format(e))
+        return stats
+
+
+class TPUCollector(Collector):
+    name = "tpu"
+
+    def __init__(self, interval: float, profiler: "tpu.TPUProfiler") -> None:
+        super(TPUCollector, self).__init__(interval)
+        self._profiler = profiler
+
+    def start(self) -> None:
+        self._profiler.start()
+
+    def stop(self) -> None:
+        self._profiler.stop()
+
+    def sample(self) -> StatsDict:
+        tpu_utilization = self._profiler.get_tpu_utilization()
+        if tpu_utilization is None:
+            return {}
+        return {"tpu": tpu_utilization}
+
+
 class SystemStats(object):
+    """Samples the collectors in a background thread and publishes averages.
+
+    Every collector is sampled at its own rate, numeric stats are averaged over
+    sample_rate_seconds * samples_to_average seconds before they are published,
+    other stats (like network counters) are published as last sampled.  The
+    time spent sampling is published as proc.stats.samplerPercent.
+    """
 
     _pid: int
     _interface: InterfaceQueue
@@ -71,8 +343,16 @@ class SystemStats(object):
     samples: int
     _thread: Optional[threading.Thread]
     gpu_count: int
-
-    def __init__(self, pid: int, interface: InterfaceQueue) -> None:
+    collectors: List[Collector]
+    overhead: Dict[str, float]
+
+    def __init__(
+        self,
+        pid: int,
+        interface: InterfaceQueue,
+        settings: Optional["SettingsStatic"] = None,
+        collectors: Optional[Sequence[Collector]] = None,
+    ) -> None:
         try:
             pynvml.nvmlInit()
             self.gpu_count = pynvml.nvmlDeviceGetCount()
@@ -81,197 +361,166 @@ class SystemStats(object):
         # self.run = run
         self._pid = pid
         self._interface = interface
+        self._settings = settings
+        self._process_tree = ProcessTree(pid)
         self.sampler = {}
         self.samples = 0
-        self._shutdown = False
-        self._telem = telemetry.TelemetryRecord()
+        self._latest: StatsDict = {}
+        self.overhead = {}
+        self._shutdown = threading.Event()
+        self._thread = None
+        if collectors is None:
+            collectors = self._default_collectors()
+        self.collectors = list(collectors)
+
+    def _default_collectors(self) -> List[Collector]:
+        collectors: List[Collector] = []
+        if self.gpu_count:
+            collectors.append(
+                NvmlCollector(self._interval("gpu"), self.gpu_count, self._process_tree)
+            )
+        # On Apple M1 systems let's look for the gpu
+        elif AppleGPUCollector.available():
+            collectors.append(AppleGPUCollector(self._interval("gpu"), self._interface))
+
         if psutil:
-            net = psutil.net_io_counters()
-            self.network_init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
+            collectors.extend(
+                [
+                    CPUCollector(self._interval("cpu"), self._process_tree),
+                    MemoryCollector(self._interval("memory"), self._process_tree),
+                    NetworkCollector(self._interval("network")),
+                    DiskCollector(self._interval("disk")),
+                ]
+            )
         else:
             wandb.termlog(
                 "psutil not installed, only GPU stats will be reported.  Install with pip install psutil"
             )
-        self._thread = None
-        self._tpu_profiler = None
 
         if tpu.is_tpu_available():
             try:
-                self._tpu_profiler = tpu.get_profiler()
+                collectors.append(
+                    TPUCollector(self._interval("tpu"), tpu.get_profiler())
+                )
             except Exception as e:
                 wandb.termlog("Error initializing TPUProfiler: " + str(e))
+        return collectors
+
+    def _interval(self, name: str) -> float:
+        rates = self._settings and self._settings._stats_sample_rates or {}
+        return max(0.1, float(rates.get(name, self.sample_rate_seconds)))
 
     def start(self) -> None:
         if self._thread is None:
-            self._shutdown = False
+            self._shutdown.clear()
             self._thread = threading.Thread(target=self._thread_body)
             self._thread.name = "StatsThr"
             self._thread.daemon = True
         if not self._thread.is_alive():
             self._thread.start()
-        if self._tpu_profiler:
-            self._tpu_profiler.start()
+            for collector in self.collectors:
+                collector.start()
 
     @property
     def proc(self) -> psutil.Process:
-        return psutil.Process(pid=self._pid)
+        return self._process_tree.proc
 
     @property
     def sample_rate_seconds(self) -> float:
         """Sample system stats every this many seconds, defaults to 2, min is 0.5"""
-        return 2
-        # return max(0.5, self._api.dynamic_settings["system_sample_seconds"])
+        if self._settings is None:
+            return 2
+        return max(0.5, float(self._settings.system_sample_seconds))
 
     @property
     def samples_to_average(self) -> int:
         """The number of samples to average before pushing, defaults to 15 valid range (2:30)"""
-        return 15
-        # return min(30, max(2, self._api.dynamic_settings["system_samples"]))
+        if self._settings is None:
+            return 15
+        return min(30, max(2, int(self._settings.system_sample)))
+
+    def _sample(self, collector: Collector) -> None:
+        start = time.perf_counter()
+        try:
+            stats = collector.sample()
+        except Exception:
+            logger.exception("error sampling {} stats".format(collector.name))
+            stats = {}
+        self.overhead[collector.name] = (
+            self.overhead.get(collector.name, 0.0) + time.perf_counter() - start
+        )
+        for stat, value in stats.items():
+            if isinstance(value, (int, float)):
+                self.sampler.setdefault(stat, []).append(value)
+        self._latest.update(stats)
 
     def _thread_body(self) -> None:
+        now = time.monotonic()
+        next_due = [now] * len(self.collectors)
+        flush_seconds = self.sample_rate_seconds * self.samples_to_average
+        next_flush = now + flush_seconds
+        last_flush = now
         while True:
-            stats = self.stats()
-            for stat, value in stats.items():
-                if isinstance(value, (int, float)):
-                    self.sampler[stat] = self.sampler.get(stat, [])
-                    self.sampler[stat].append(value)
+            for i, collector in enumerate(self.collectors):
+                if next_due[i] <= now:
+                    self._sample(collector)
+                    # skip missed samples instead of bursting to catch up
+                    next_due[i] = max(next_due[i] + collector.interval, now)
             self.samples += 1
-            if self._shutdown or self.samples >= self.samples_to_average:
-                self.flush()
-                if self._shutdown:
-                    break
-            seconds = 0.0
-            while seconds < self.sample_rate_seconds:
-                time.sleep(0.1)
-                seconds += 0.1
-                if self._shutdown:
-                    self.flush()
-                    return
+            now = time.monotonic()
+            if now >= next_flush:
+                self.flush(now - last_flush)
+                last_flush = now
+                next_flush = now + flush_seconds
+            wait = min(next_due + [next_flush]) - now
+            if self._shutdown.wait(max(wait, 0)):
+                self.flush(time.monotonic() - last_flush)
+                return
+            now = time.monotonic()
 
     def shutdown(self) -> None:
-        self._shutdown = True
+        self._shutdown.set()
         try:
             if self._thread is not None:
                 self._thread.join()
         finally:
             self._thread = None
-        if self._tpu_profiler:
-            self._tpu_profiler.stop()
+        for collector in self.collectors:
+            collector.stop()
 
-    def flush(self) -> None:
-        stats = self.stats()
+    def flush(self, elapsed: Optional[float] = None) -> None:
+        if not self._latest:
+            self.stats()
+        stats = dict(self._latest)
         for stat, value in stats.items():
             # TODO: a bit hacky, we assume all numbers should be averaged.  If you want
             # max for a stat, you must put it in a sub key, like ["network"]["sent"]
             if isinstance(value, (float, int)):
-                # samples = list(self.sampler.get(stat, [stats[stat]]))
-                samples = list(self.sampler.get(stat, [value]))
+                samples = self.sampler.get(stat, [value])
                 stats[stat] = round(sum(samples) / len(samples), 2)
+        overhead = sum(self.overhead.values())
+        if elapsed:
+            stats["proc.stats.samplerPercent"] = round(overhead / elapsed * 100, 2)
+        logger.debug(
+            "stats sampler overhead: {}".format(
+                ", ".join(
+                    "{} {:.1f}ms".format(name, seconds * 1000)
+                    for name, seconds in self.overhead.items()
+                )
+            )
+        )
         # self.run.events.track("system", stats, _wandb=True)
         if self._interface:
             self._interface.publish_stats(stats)
         self.samples = 0
         self.sampler = {}
+        self._latest = {}
+        self.overhead = {}
 
     def stats(self) -> StatsDict:
+        """Sample all collectors once and return the stats."""
         stats: StatsDict = {}
-        for i in range(0, self.gpu_count):
-            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-            try:
-                utilz = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                temp = pynvml.nvmlDeviceGetTemperature(
-                    handle, pynvml.NVML_TEMPERATURE_GPU
-                )
-                in_use_by_us = gpu_in_use_by_this_process(handle)
-
-                stats["gpu.{}.{}".format(i, "gpu")] = utilz.gpu
-                stats["gpu.{}.{}".format(i, "memory")] = utilz.memory
-                stats["gpu.{}.{}".format(i, "memoryAllocated")] = (
-                    memory.used / float(memory.total)
-                ) * 100
-                stats["gpu.{}.{}".format(i, "temp")] = temp
-
-                if in_use_by_us:
-                    stats["gpu.process.{}.{}".format(i, "gpu")] = utilz.gpu
-                    stats["gpu.process.{}.{}".format(i, "memory")] = utilz.memory
-                    stats["gpu.process.{}.{}".format(i, "memoryAllocated")] = (
-                        memory.used / float(memory.total)
-                    ) * 100
-                    stats["gpu.process.{}.{}".format(i, "temp")] = temp
-
-                    # Some GPUs don't provide information about power usage
-                try:
-                    power_watts = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
-                    power_capacity_watts = (
-                        pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
-                    )
-                    power_usage = (power_watts / power_capacity_watts) * 100
-
-                    stats["gpu.{}.{}".format(i, "powerWatts")] = power_watts
-                    stats["gpu.{}.{}".format(i, "powerPercent")] = power_usage
-
-                    if in_use_by_us:
-                        stats["gpu.process.{}.{}".format(i, "powerWatts")] = power_watts
-                        stats[
-                            "gpu.process.{}.{}".format(i, "powerPercent")
-                        ] = power_usage
-
-                except pynvml.NVMLError:
-                    pass
-
-            except pynvml.NVMLError:
-                pass
-
-        # On Apple M1 systems let's look for the gpu
-        if (
-            platform.system() == "Darwin"
-            and platform.processor() == "arm"
-            and self.gpu_count == 0
-        ):
-            try:
-                out = subprocess.check_output([util.apple_gpu_stats_binary(), "--json"])
-                m1_stats = json.loads(out.split(b"\n")[0])
-                stats["gpu.0.gpu"] = m1_stats["utilization"]
-                stats["gpu.0.memoryAllocated"] = m1_stats["mem_used"]
-                stats["gpu.0.temp"] = m1_stats["temperature"]
-                stats["gpu.0.powerWatts"] = m1_stats["power"]
-                stats["gpu.0.powerPercent"] = (
-                    m1_stats["power"] / M1_MAX_POWER_WATTS
-                ) * 100
-                # TODO: this stat could be useful eventually, it was consistently
-                # 0 in my experimentation and requires a frontend change
-                # so leaving it out for now.
-                # stats["gpu.0.cpuWaitMs"] = m1_stats["cpu_wait_ms"]
-
-                if self._interface and not self._telem.env.m1_gpu:
-                    self._telem.env.m1_gpu = True
-                    self._interface._publish_telemetry(self._telem)
-
-            except (OSError, ValueError, TypeError, subprocess.CalledProcessError) as e:
-                wandb.termwarn("GPU stats error {}".format(e))
-                pass
-
-        if psutil:
-            net = psutil.net_io_counters()
-            sysmem = psutil.virtual_memory()
-            stats["cpu"] = psutil.cpu_percent()
-            stats["memory"] = sysmem.percent
-            stats["network"] = {
-                "sent": net.bytes_sent - self.network_init["sent"],
-                "recv": net.bytes_recv - self.network_init["recv"],
-            }
-            # TODO: maybe show other partitions, will likely need user to configure
-            stats["disk"] = psutil.disk_usage("/").percent
-            stats["proc.memory.availableMB"] = sysmem.available / 1048576.0
-            try:
-                stats["proc.memory.rssMB"] = self.proc.memory_info().rss / 1048576.0
-                stats["proc.memory.percent"] = self.proc.memory_percent()
-                stats["proc.cpu.threads"] = self.proc.num_threads()
-            except psutil.NoSuchProcess:
-                pass
-        if self._tpu_profiler:
-            tpu_utilization = self._tpu_profiler.get_tpu_utilization()
-            if tpu_utilization is not None:
-                stats["tpu"] = tpu_utilization
+        for collector in self.collectors:
+            self._sample(collector)
+        stats.update(self._latest)
         return stats
@@ -1,29 +1,71 @@
 #
 # -*- coding: utf-8 -*-
-"""Writer thread."""
+"""Writer thread.
+
+Records are group committed: the datastore buffers them and writes whole
+blocks to the sync file, the last partial block is written on every debounce
+and on flush requests (defer, exit, final and preempting records).  Whether
+written records are also fsynced depends on the `_sync_file_durability`
+setting:
+
+    none: never fsync, the OS writes the file back when it sees fit
+    periodic: fsync every `_sync_file_fsync_seconds` if records were written
+    flush: fsync on every flush request
+"""
 
 from __future__ import print_function
 
 import logging
+import os
+import time
 
 from . import datastore
 
 
 logger = logging.getLogger(__name__)
 
+# records which ask for the records before them to be committed
+_FLUSH_RECORD_TYPES = frozenset(("exit", "final", "preempting"))
+
 
 class WriteManager(object):
     def __init__(
-        self, settings, record_q, result_q,
+        self, settings, record_q, result_q, writer_q=None,
     ):
         self._settings = settings
         self._record_q = record_q
         self._result_q = result_q
+        self._writer_q = writer_q
         self._ds = None
+        self._durability = settings._sync_file_durability
+        self._fsync_seconds = settings._sync_file_fsync_seconds
+        self._last_fsync = time.time()
+        # records written since the last fsync
+        self._unsynced = 0
+        self._stats = dict(
+            records=0,
+            write_seconds=0.0,
+            write_seconds_max=0.0,
+            commits=0,
+            commit_seconds=0.0,
+            commit_seconds_max=0.0,
+            fsyncs=0,
+            queue_depth=0,
+            queue_depth_max=0,
+        )
+
+    def __len__(self):
+        if self._writer_q is None:
+            return 0
+        return self._writer_q.qsize()
 
     def open(self):
         self._ds = datastore.DataStore()
-        self._ds.open_for_write(self._settings.sync_file)
+        compression = self._settings._sync_file_compression
+        if os.path.exists(self._settings.sync_file):
+            self._ds.open_for_append(self._settings.sync_file, compression=compression)
+        else:
+            self._ds.open_for_write(self._settings.sync_file, compression=compression)
 
     def write(self, record):
         if not self._ds:
@@ -32,11 +74,67 @@ class WriteManager(object):
         record_type = record.WhichOneof("record_type")
         assert record_type
 
+        start = time.perf_counter()
         self._ds.write(record)
+        elapsed = time.perf_counter() - start
+        self._unsynced += 1
+
+        stats = self._stats
+        stats["records"] += 1
+        stats["write_seconds"] += elapsed
+        stats["write_seconds_max"] = max(stats["write_seconds_max"], elapsed)
+        stats["queue_depth"] = len(self)
+        stats["queue_depth_max"] = max(stats["queue_depth_max"], stats["queue_depth"])
+
+        if record_type in _FLUSH_RECORD_TYPES or (
+            record_type == "request" and record.request.HasField("defer")
+        ):
+            self.commit(fsync=self._durability == "flush")
+
+    def commit(self, fsync=False):
+        """Write the buffered records to the sync file.
+
+        Arguments:
+            fsync: also wait for the records to be written to disk
+        """
+        if not self._ds:
+            return
+        fsync = fsync and self._unsynced > 0
+        if not fsync and not self._ds.buffered_bytes():
+            return
+        start = time.perf_counter()
+        self._ds.flush(fsync=fsync)
+        elapsed = time.perf_counter() - start
+
+        stats = self._stats
+        stats["commits"] += 1
+        stats["commit_seconds"] += elapsed
+        stats["commit_seconds_max"] = max(stats["commit_seconds_max"], elapsed)
+        if fsync:
+            stats["fsyncs"] += 1
+            self._unsynced = 0
+            self._last_fsync = time.time()
+
+    def stats(self):
+        """Return the counters of the writer.
+
+        Write latencies are the time spent encoding and buffering records,
+        commit latencies the time spent writing (and fsyncing) them.  The
+        queue depth is the number of records waiting to be written.
+        """
+        stats = dict(self._stats)
+        stats["queue_depth"] = len(self)
+        return stats
 
     def finish(self):
         if self._ds:
+            self.commit(fsync=self._durability != "none")
             self._ds.close()
+            logger.info("writer stats: %s", self.stats())
 
     def debounce(self) -> None:
-        pass
+        fsync = (
+            self._durability == "periodic"
+            and time.time() - self._last_fsync >= self._fsync_seconds
+        )
+        self.commit(fsync=fsync)
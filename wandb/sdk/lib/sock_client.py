@@ -1,5 +1,6 @@
 import socket
 import struct
+import threading
 from typing import Any, Optional
 from typing import TYPE_CHECKING
 import uuid
@@ -20,14 +21,24 @@ class SockClientClosedError(Exception):
 
 class SockClient:
     _sock: socket.socket
-    _data: bytes
+    _buffer: bytearray
+    _buffer_start: int
+    _buffer_end: int
     _sockid: str
+    _send_lock: threading.Lock
 
     # current header is magic byte "W" followed by 4 byte length of the message
     HEADLEN = 1 + 4
 
+    # receive buffer grows to fit the largest record seen, reads fill all free space
+    INITIAL_BUFFER_SIZE = 64 * 1024
+    MAX_IDLE_BUFFER_SIZE = 4 * 1024 * 1024
+
     def __init__(self) -> None:
-        self._data = b""
+        self._buffer = bytearray(self.INITIAL_BUFFER_SIZE)
+        self._buffer_start = 0
+        self._buffer_end = 0
+        self._send_lock = threading.Lock()
         # TODO: use safe uuid's (python3.7+) or emulate this
         self._sockid = uuid.uuid4().hex
 
@@ -45,13 +56,30 @@ class SockClient:
     def set_socket(self, sock: socket.socket) -> None:
         self._sock = sock
 
+    def _sendall_with_header(self, header: bytes, data: bytes) -> None:
+        if not hasattr(self._sock, "sendmsg"):
+            # sendmsg() is not available on windows
+            self._sock.sendall(header + data)
+            return
+        buffers = [memoryview(header), memoryview(data)]
+        while buffers:
+            sent = self._sock.sendmsg(buffers)
+            # partial vectored write, skip the buffers that were sent and
+            # resume from the first unsent byte without copying the payload
+            while buffers and sent >= len(buffers[0]):
+                sent -= len(buffers[0])
+                buffers.pop(0)
+            if buffers:
+                buffers[0] = buffers[0][sent:]
+
     def _send_message(self, msg: Any) -> None:
         tracelog.log_message_send(msg, self._sockid)
         raw_size = msg.ByteSize()
         data = msg.SerializeToString()
         assert len(data) == raw_size, "invalid serialization"
         header = struct.pack("<BI", ord("W"), raw_size)
-        self._sock.send(header + data)
+        with self._send_lock:
+            self._sendall_with_header(header, data)
 
     def send_server_request(self, msg: Any) -> None:
         self._send_message(msg)
@@ -124,20 +152,44 @@ class SockClient:
 
     def _extract_packet_bytes(self) -> Optional[bytes]:
         # Do we have enough data to read the header?
-        len_data = len(self._data)
-        start_offset = self.HEADLEN
-        if len_data >= start_offset:
-            header = self._data[:start_offset]
-            fields = struct.unpack("<BI", header)
-            magic, dlength = fields
-            assert magic == ord("W")
-            # Do we have enough data to read the full record?
-            end_offset = self.HEADLEN + dlength
-            if len_data >= end_offset:
-                rec_data = self._data[start_offset:end_offset]
-                self._data = self._data[end_offset:]
-                return rec_data
-        return None
+        start = self._buffer_start
+        len_data = self._buffer_end - start
+        if len_data < self.HEADLEN:
+            return None
+        magic, dlength = struct.unpack_from("<BI", self._buffer, start)
+        assert magic == ord("W")
+        # Do we have enough data to read the full record?
+        end_offset = self.HEADLEN + dlength
+        if len_data < end_offset:
+            self._reserve(end_offset)
+            return None
+        with memoryview(self._buffer) as view:
+            rec_data = bytes(view[start + self.HEADLEN : start + end_offset])
+        self._buffer_start += end_offset
+        if self._buffer_start == self._buffer_end:
+            self._buffer_start = self._buffer_end = 0
+            if len(self._buffer) > self.MAX_IDLE_BUFFER_SIZE:
+                # dont hold on to the memory of a single huge record
+                self._buffer = bytearray(self.INITIAL_BUFFER_SIZE)
+        return rec_data
+
+    def _reserve(self, size: int) -> None:
+        """Make sure a record of size bytes fits in the buffer from its start."""
+        if self._buffer_start + size <= len(self._buffer):
+            return
+        pending = self._buffer_end - self._buffer_start
+        if size > len(self._buffer):
+            new_size = len(self._buffer)
+            while new_size < size:
+                new_size *= 2
+            new_buffer = bytearray(new_size)
+            new_buffer[:pending] = self._buffer[self._buffer_start : self._buffer_end]
+            self._buffer = new_buffer
+        else:
+            # move the pending bytes to the front of the buffer
+            self._buffer[:pending] = self._buffer[self._buffer_start : self._buffer_end]
+        self._buffer_start = 0
+        self._buffer_end = pending
 
     def _read_packet_bytes(self, timeout: int = None) -> Optional[bytes]:
         """Read full message from socket.
@@ -153,10 +205,14 @@ class SockClient:
             if rec:
                 return rec
 
+            if self._buffer_end == len(self._buffer):
+                # no free space left at the end, a partial header is pending
+                self._reserve(self.HEADLEN)
             if timeout:
                 self._sock.settimeout(timeout)
             try:
-                data = self._sock.recv(4096)
+                with memoryview(self._buffer) as view:
+                    nbytes = self._sock.recv_into(view[self._buffer_end :])
             except socket.timeout:
                 break
             except ConnectionResetError:
@@ -166,11 +222,11 @@ class SockClient:
             finally:
                 if timeout:
                     self._sock.settimeout(None)
-            if len(data) == 0:
+            if nbytes == 0:
                 # socket.recv() will return 0 bytes if socket was shutdown
                 # caller will handle this condition like other connection problems
                 raise SockClientClosedError()
-            self._data += data
+            self._buffer_end += nbytes
         return None
 
     def read_server_request(self) -> Optional[spb.ServerRequest]:
@@ -188,6 +188,18 @@ class WandbServicer(spb_grpc.InternalServiceServicer):
         result = pb.PartialHistoryResponse()
         return result
 
+    def PartialLogBatch(  # noqa: N802
+        self,
+        partial_history_batch: pb.PartialHistoryBatchRequest,
+        context: grpc.ServicerContext,
+    ) -> pb.PartialHistoryResponse:
+        stream_id = partial_history_batch._info.stream_id
+        iface = self._mux.get_stream(stream_id).interface
+        iface._publish_partial_history_batch(partial_history_batch)
+        # make up a response even though this was async
+        result = pb.PartialHistoryResponse()
+        return result
+
     def Log(  # noqa: N802
         self, history: pb.HistoryRecord, context: grpc.ServicerContext
     ) -> pb.HistoryResult:
@@ -6,6 +6,7 @@ import os
 import re
 import shutil
 import tempfile
+import threading
 import time
 from typing import (
     Any,
@@ -32,6 +33,7 @@ from wandb.apis.public import Artifact as PublicArtifact
 import wandb.data_types as data_types
 from wandb.errors import CommError
 from wandb.errors.term import termlog, termwarn
+from wandb.filesync import multipart
 
 from . import lib as wandb_lib
 from .interface.artifacts import (  # noqa: F401 pylint: disable=unused-import
@@ -42,6 +44,7 @@ from .interface.artifacts import (  # noqa: F401 pylint: disable=unused-import
     b64_string_to_hex,
     get_artifacts_cache,
     md5_file_b64,
+    md5_hash_file,
     md5_string,
     StorageHandler,
     StorageLayout,
@@ -53,6 +56,7 @@ if TYPE_CHECKING:
     import google.cloud.storage as gcs_module  # type: ignore
     import boto3  # type: ignore
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
+    from wandb.filesync.step_prepare import ResponsePrepare
 
 # This makes the first sleep 1s, and then doubles it up to total times,
 # which makes for ~18 hours.
@@ -68,6 +72,37 @@ _REQUEST_POOL_MAXSIZE = 64
 
 ARTIFACT_TMP = tempfile.TemporaryDirectory("wandb-artifacts")
 
+_session = None
+_session_lock = threading.Lock()
+# downloads of the same cache object are serialized, on one of these locks
+_download_locks = [threading.Lock() for _ in range(_REQUEST_POOL_MAXSIZE)]
+
+
+def _get_session() -> requests.Session:
+    """Return the HTTP session shared by all storage policies.
+
+    Its connection pool blocks once _REQUEST_POOL_MAXSIZE connections are in
+    use, rather than opening connections which are thrown away after the
+    request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=_REQUEST_RETRY_STRATEGY,
+                pool_connections=_REQUEST_POOL_CONNECTIONS,
+                pool_maxsize=_REQUEST_POOL_MAXSIZE,
+                pool_block=True,
+            )
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def _download_lock(path: str) -> threading.Lock:
+    return _download_locks[hash(path) % len(_download_locks)]
+
 
 class _AddedObj(object):
     def __init__(self, entry: ArtifactEntry, obj: data_types.WBValue):
@@ -375,7 +410,8 @@ class Artifact(ArtifactInterface):
             raise ValueError("Path is not a file: %s" % local_path)
 
         name = util.to_forward_slash_path(name or os.path.basename(local_path))
-        digest = md5_file_b64(local_path)
+        digest = self._cache.md5_file_b64(local_path)
+        self._cache.flush_digests()
 
         if is_tmp:
             file_path, file_name = os.path.split(name)
@@ -417,6 +453,7 @@ class Artifact(ArtifactInterface):
         pool.map(add_manifest_file, paths)
         pool.close()
         pool.join()
+        self._cache.flush_digests()
 
         termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
 
@@ -689,7 +726,7 @@ class Artifact(ArtifactInterface):
     def _add_local_file(
         self, name: str, path: str, digest: Optional[str] = None
     ) -> ArtifactEntry:
-        digest = digest or md5_file_b64(path)
+        digest = digest or self._cache.md5_file_b64(path)
         size = os.path.getsize(path)
         name = util.to_forward_slash_path(name)
 
@@ -849,14 +886,7 @@ class WandbStoragePolicy(StoragePolicy):
     def __init__(self, config: Dict = None) -> None:
         self._cache = get_artifacts_cache()
         self._config = config or {}
-        self._session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            max_retries=_REQUEST_RETRY_STRATEGY,
-            pool_connections=_REQUEST_POOL_CONNECTIONS,
-            pool_maxsize=_REQUEST_POOL_MAXSIZE,
-        )
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
+        self._session = _get_session()
 
         s3 = S3Handler()
         gcs = GCSHandler()
@@ -885,18 +915,55 @@ class WandbStoragePolicy(StoragePolicy):
         if hit:
             return path
 
-        response = self._session.get(
-            self._file_url(self._api, artifact.entity, manifest_entry),
-            auth=("api", self._api.api_key),
-            stream=True,
-        )
-        response.raise_for_status()
-
-        with cache_open(mode="wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
+        with _download_lock(path):
+            if os.path.isfile(path) and os.path.getsize(path) == manifest_entry.size:
+                return path
+            self._download_to_cache(
+                self._file_url(self._api, artifact.entity, manifest_entry),
+                path,
+                manifest_entry,
+            )
         return path
 
+    def _download_to_cache(
+        self, url: str, path: str, manifest_entry: ArtifactEntry
+    ) -> None:
+        # Partial downloads stay next to the cache object and are resumed with a
+        # range request. The name makes ArtifactsCache.cleanup reclaim them.
+        partial_path = os.path.join(
+            os.path.dirname(path),
+            "%s_%s.partial" % (ArtifactsCache._TMP_PREFIX, os.path.basename(path)),
+        )
+        size = manifest_entry.size or 0
+        offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+        if offset > size:
+            offset = 0
+
+        headers = {}
+        if 0 < offset < size:
+            headers["Range"] = "bytes=%d-" % offset
+        if offset < size or not offset:
+            response = self._session.get(
+                url, auth=("api", self._api.api_key), stream=True, headers=headers
+            )
+            response.raise_for_status()
+            if headers and response.status_code != 206:
+                # the server sent the whole file
+                offset = 0
+            with util.fsync_open(partial_path, "ab" if offset else "wb") as file:
+                for data in response.iter_content(chunk_size=1024 * 1024):
+                    file.write(data)
+
+        if offset and b64_string_to_hex(manifest_entry.digest) != (
+            md5_hash_file(partial_path).hexdigest()
+        ):
+            # the partial download was stale, start over
+            os.remove(partial_path)
+            self._download_to_cache(url, path, manifest_entry)
+            return
+        os.replace(partial_path, path)
+        self._cache.add_obj_path(path)
+
     def store_reference(
         self,
         artifact: ArtifactInterface,
@@ -961,19 +1028,38 @@ class WandbStoragePolicy(StoragePolicy):
                 shutil.copyfile(entry.local_path, f.name)
             entry.local_path = cache_path
 
-        resp = preparer.prepare(
-            lambda: {
+        # large files are uploaded in parts when the backend supports it
+        size = entry.size if entry.size is not None else 0
+        part_size = multipart.part_size_for(size)
+        parts = None
+        if (
+            entry.local_path is not None
+            and size > part_size
+            and self._api.server_supports_multipart_upload()
+        ):
+            parts = multipart.file_parts(entry.local_path, part_size)
+
+        def prepare_fn() -> Dict:
+            file_spec = {
                 "artifactID": artifact_id,
                 "artifactManifestID": artifact_manifest_id,
                 "name": entry.path,
                 "md5": entry.digest,
             }
-        )
+            if parts:
+                file_spec["uploadPartsInput"] = parts
+            return file_spec
+
+        resp = preparer.prepare(prepare_fn)
 
         entry.birth_artifact_id = resp.birth_artifact_id
-        exists = resp.upload_url is None
+        exists = resp.upload_url is None and resp.multipart_upload_urls is None
         if not exists:
-            if entry.local_path is not None:
+            if entry.local_path is not None and resp.multipart_upload_urls:
+                self._upload_multipart(
+                    artifact_id, entry, resp, parts, part_size, progress_callback
+                )
+            elif entry.local_path is not None:
                 with open(entry.local_path, "rb") as file:
                     # This fails if we don't send the first byte before the signed URL
                     # expires.
@@ -988,6 +1074,37 @@ class WandbStoragePolicy(StoragePolicy):
                     )
         return exists
 
+    def _upload_multipart(
+        self,
+        artifact_id: str,
+        entry: ArtifactEntry,
+        resp: "ResponsePrepare",
+        parts: List[Dict],
+        part_size: int,
+        progress_callback: Optional[Callable] = None,
+    ) -> None:
+        upload_id = resp.multipart_upload_urls["uploadID"]
+        part_urls = {
+            part["partNumber"]: part["uploadUrl"]
+            for part in resp.multipart_upload_urls["uploadUrlParts"]
+        }
+        state = multipart.UploadState.for_storage_path(
+            resp.storage_path, upload_id, part_size
+        )
+        completed_parts = multipart.upload_parts(
+            self._api,
+            entry.local_path,
+            parts,
+            part_urls,
+            part_size,
+            state,
+            progress_callback=progress_callback,
+        )
+        self._api.complete_multipart_upload_artifact(
+            artifact_id, resp.storage_path, completed_parts, upload_id
+        )
+        state.remove()
+
 
 # Don't use this yet!
 class __S3BucketPolicy(StoragePolicy):
@@ -1223,7 +1340,7 @@ class LocalFileHandler(StorageHandler):
 
         def md5(path: str) -> str:
             return (
-                md5_file_b64(path)
+                self._cache.md5_file_b64(path)
                 if checksum
                 else md5_string(str(os.stat(path).st_size))
             )
@@ -1268,6 +1385,7 @@ class LocalFileHandler(StorageHandler):
         else:
             # TODO: update error message if we don't allow directories.
             raise ValueError('Path "%s" must be a valid file or directory path' % path)
+        self._cache.flush_digests()
         return entries
 
 
@@ -50,6 +50,7 @@ from wandb.util import (
     parse_artifact_string,
     sentry_set_scope,
     to_forward_slash_path,
+    to_human_size,
 )
 from wandb.viz import (
     create_custom_chart,
@@ -63,6 +64,7 @@ from . import wandb_config
 from . import wandb_metric
 from . import wandb_summary
 from .interface.artifacts import Artifact as ArtifactInterface
+from .interface.history_batch import HistoryBatch
 from .interface.interface import InterfaceBase
 from .interface.summary_record import SummaryRecord
 from .lib import (
@@ -98,6 +100,7 @@ if TYPE_CHECKING:
     from .lib.printer import PrinterTerm, PrinterJupyter
     from wandb.proto.wandb_internal_pb2 import (
         CheckVersionResponse,
+        FileStreamStats,
         GetSummaryResponse,
         SampledHistoryResponse,
     )
@@ -129,10 +132,14 @@ class RunStatusChecker:
         interface: InterfaceBase,
         stop_polling_interval: int = 15,
         retry_polling_interval: int = 5,
+        file_stream_lag_warning: int = 120,
     ) -> None:
         self._interface = interface
         self._stop_polling_interval = stop_polling_interval
         self._retry_polling_interval = retry_polling_interval
+        self._file_stream_lag_warning = file_stream_lag_warning
+        self._file_stream_behind = False
+        self._file_stream_spooling = False
 
         self._join_event = threading.Event()
 
@@ -162,8 +169,29 @@ class RunStatusChecker:
                                 hr.http_status_code, hr.http_response_text.rstrip()
                             )
                         )
+            if status_response and status_response.HasField("file_stream_stats"):
+                self._check_file_stream_stats(status_response.file_stream_stats)
             join_requested = self._join_event.wait(self._retry_polling_interval)
 
+    def _check_file_stream_stats(self, stats: "FileStreamStats") -> None:
+        behind = stats.lag_seconds > self._file_stream_lag_warning
+        if behind and not self._file_stream_behind:
+            wandb.termwarn(
+                "Streaming run data is falling behind ({} chunks waiting for {:.0f}s), "
+                "retrying in the background".format(
+                    stats.pending_chunks, stats.lag_seconds
+                )
+            )
+        self._file_stream_behind = behind
+        spooling = stats.spooled_bytes > 0
+        if spooling and not self._file_stream_spooling:
+            wandb.termwarn(
+                "Streaming run data is falling behind, buffering {} on disk".format(
+                    to_human_size(stats.spooled_bytes)
+                )
+            )
+        self._file_stream_spooling = spooling
+
     def check_status(self) -> None:
         join_requested = False
         while not join_requested:
@@ -409,6 +437,13 @@ class Run:
         self._step = 0
         self._torch_history: Optional["wandb.wandb_torch.TorchHistory"] = None
 
+        # scalar-only rows logged without step/commit can be sent in batches
+        self._history_batch: Optional[HistoryBatch] = None
+        self._history_batch_lock = threading.Lock()
+        self._history_batch_timer: Optional[threading.Timer] = None
+        if self._settings._history_batch_rows > 0:
+            self._history_batch = HistoryBatch()
+
         self._start_time = time.time()
 
         _datatypes_set_callback(self._datatypes_callback)
@@ -1158,11 +1193,14 @@ class Run:
 
     def _summary_update_callback(self, summary_record: SummaryRecord) -> None:
         if self._backend and self._backend.interface:
+            # batched rows must reach the summary before the user update does
+            self._history_batch_flush()
             self._backend.interface.publish_summary(summary_record)
 
     def _summary_get_current_summary_callback(self) -> Dict[str, Any]:
         if not self._backend or not self._backend.interface:
             return {}
+        self._history_batch_flush()
         ret = self._backend.interface.communicate_get_summary()
         if not ret:
             return {}
@@ -1170,6 +1208,7 @@ class Run:
 
     def _metric_callback(self, metric_record: MetricRecord) -> None:
         if self._backend and self._backend.interface:
+            self._history_batch_flush()
             self._backend.interface._publish_metric(metric_record)
 
     def _datatypes_callback(self, fname: str) -> None:
@@ -1221,6 +1260,11 @@ class Run:
             )
 
         if self._backend and self._backend.interface:
+            if step is None and commit is None and self._history_batch_add(row):
+                return
+            # anything queued so far has to be published before this row
+            self._history_batch_flush()
+
             not_using_tensorboard = len(wandb.patched["tensorboard"]) == 0
 
             self._backend.interface.publish_partial_history(
@@ -1231,6 +1275,46 @@ class Run:
                 publish_step=not_using_tensorboard,
             )
 
+    def _history_batch_add(self, row: Dict[str, Any]) -> bool:
+        if self._history_batch is None:
+            return False
+        with self._history_batch_lock:
+            batch = self._history_batch
+            if not batch.add(row):
+                # the row may only conflict with the rows already queued
+                if not len(batch):
+                    return False
+                self._history_batch_publish()
+                if not batch.add(row):
+                    return False
+            if len(batch) >= self._settings._history_batch_rows:
+                self._history_batch_publish()
+            elif not self._history_batch_timer:
+                self._history_batch_timer = threading.Timer(
+                    self._settings._history_batch_seconds, self._history_batch_flush
+                )
+                self._history_batch_timer.daemon = True
+                self._history_batch_timer.start()
+        return True
+
+    def _history_batch_flush(self) -> None:
+        if self._history_batch is None:
+            return
+        with self._history_batch_lock:
+            self._history_batch_publish()
+
+    def _history_batch_publish(self) -> None:
+        # must be called with _history_batch_lock held
+        if self._history_batch_timer:
+            self._history_batch_timer.cancel()
+            self._history_batch_timer = None
+        batch = self._history_batch
+        if not batch:
+            return
+        if self._backend and self._backend.interface:
+            self._backend.interface.publish_partial_history_batch(batch)
+        batch.clear()
+
     def _console_callback(self, name: str, data: str) -> None:
         # logger.info("console callback: %s, %s", name, data)
         if self._backend and self._backend.interface:
@@ -1975,6 +2059,8 @@ class Run:
         self._console_stop()  # TODO: there's a race here with jupyter console logging
 
         if self._backend and self._backend.interface:
+            self._history_batch_flush()
+
             # telemetry could have changed, publish final data
             self._telemetry_flush()
 
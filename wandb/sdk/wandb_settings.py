@@ -100,6 +100,15 @@ def _str_as_bool(val: Union[str, bool]) -> bool:
     raise UsageError(f"Could not parse value {val} as a bool.")
 
 
+def _str_as_rates(val: Union[str, Mapping[str, Any]]) -> Dict[str, float]:
+    """
+    Parse "name=seconds,name=seconds" (or a dict) as a dict of rates.
+    """
+    if isinstance(val, str):
+        val = dict(item.split("=", 1) for item in val.split(",") if item.strip())
+    return {str(k).strip(): float(v) for k, v in val.items()}
+
+
 def _redact_dict(
     d: Dict[str, Any],
     unsafe_keys: Union[Set[str], FrozenSet[str]] = frozenset({"api_key"}),
@@ -365,6 +374,9 @@ class Settings:
     _disable_viewer: bool  # Prevent early viewer query
     _except_exit: bool
     _executable: str
+    _file_stream_compression: str  # Request body encoding for file_stream posts
+    _history_batch_rows: int  # Batch scalar-only wandb.log rows (0 disables)
+    _history_batch_seconds: float  # Max time a batched row is held back
     _internal_check_process: Union[int, float]
     _internal_queue_timeout: Union[int, float]
     _jupyter: bool
@@ -383,6 +395,10 @@ class Settings:
     _service_transport: str
     _start_datetime: datetime
     _start_time: float
+    _stats_sample_rates: Dict[str, float]  # Per collector system stats rates
+    _sync_file_compression: str  # Record compression in .wandb files
+    _sync_file_durability: str  # When writes to .wandb files are fsynced
+    _sync_file_fsync_seconds: float  # fsync interval of the periodic durability
     _tmp_code_dir: str
     _tracelog: str
     _unsaved_keys: Sequence[str]
@@ -480,6 +496,12 @@ class Settings:
                 "auto_hook": True,
             },
             _console={"hook": lambda _: self._convert_console(), "auto_hook": True},
+            _file_stream_compression={
+                "value": "auto",
+                "validator": self._validate_file_stream_compression,
+            },
+            _history_batch_rows={"value": 0, "preprocessor": lambda x: int(x)},
+            _history_batch_seconds={"value": 1, "preprocessor": lambda x: float(x)},
             _internal_check_process={"value": 8},
             _internal_queue_timeout={"value": 2},
             _jupyter={
@@ -498,6 +520,16 @@ class Settings:
             },
             _platform={"value": util.get_platform_name()},
             _save_requirements={"value": True},
+            _stats_sample_rates={"value": {}, "preprocessor": _str_as_rates},
+            _sync_file_compression={
+                "value": "none",
+                "validator": self._validate_sync_file_compression,
+            },
+            _sync_file_durability={
+                "value": "periodic",
+                "validator": self._validate_sync_file_durability,
+            },
+            _sync_file_fsync_seconds={"value": 5, "preprocessor": lambda x: float(x)},
             _tmp_code_dir={
                 "value": "code",
                 "hook": lambda x: self._path_convert(self.tmp_dir, x),
@@ -724,6 +756,33 @@ class Settings:
             raise UsageError(f"Settings field `console`: '{value}' not in {choices}")
         return True
 
+    @staticmethod
+    def _validate_file_stream_compression(value: str) -> bool:
+        choices: Set[str] = {"auto", "none", "gzip", "zstd"}
+        if value not in choices:
+            raise UsageError(
+                f"Settings field `_file_stream_compression`: '{value}' not in {choices}"
+            )
+        return True
+
+    @staticmethod
+    def _validate_sync_file_compression(value: str) -> bool:
+        choices: Set[str] = {"none", "zlib", "zstd"}
+        if value not in choices:
+            raise UsageError(
+                f"Settings field `_sync_file_compression`: '{value}' not in {choices}"
+            )
+        return True
+
+    @staticmethod
+    def _validate_sync_file_durability(value: str) -> bool:
+        choices: Set[str] = {"none", "periodic", "flush"}
+        if value not in choices:
+            raise UsageError(
+                f"Settings field `_sync_file_durability`: '{value}' not in {choices}"
+            )
+        return True
+
     @staticmethod
     def _validate_problem(value: str) -> bool:
         choices: Set[str] = {"fatal", "warn", "silent"}
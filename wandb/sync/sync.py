@@ -4,8 +4,11 @@ sync.
 
 from __future__ import print_function
 
+from concurrent import futures
 import datetime
 import fnmatch
+import json
+import multiprocessing
 import os
 import sys
 import tempfile
@@ -25,9 +28,16 @@ from wandb.util import check_and_warn_old, mkdir_exists_ok
 
 WANDB_SUFFIX = ".wandb"
 SYNCED_SUFFIX = ".synced"
+SYNC_STATE_SUFFIX = ".sync-state"
 TFEVENT_SUBSTRING = ".tfevents."
 TMPDIR = tempfile.TemporaryDirectory()
 
+# records appended to run files, with the resume state field of their file
+_RESUMABLE_RECORDS = {"history": "history", "stats": "events", "output": "output"}
+# the sync state is saved after this many records or seconds
+SYNC_STATE_RECORDS = 1000
+SYNC_STATE_SECONDS = 10
+
 
 class _LocalRun(object):
     def __init__(self, path, synced=None):
@@ -42,6 +52,83 @@ class _LocalRun(object):
         return self.path
 
 
+class SyncResult(object):
+    """Outcome of syncing one path."""
+
+    def __init__(self, path):
+        self.path = path
+        self.url = None
+        self.records = 0
+        # records skipped because an interrupted sync already sent them
+        self.skipped = 0
+        self.size = 0
+        self.seconds = 0.0
+        self.error = None
+
+
+class _SyncState(object):
+    """Records of a run sent by an interrupted sync.
+
+    The state is saved next to the .wandb file while it is being synced and
+    removed once the sync completes, a left over state means the run is
+    resumed.  Only records appended to run files (history, system metrics and
+    console output) are skipped then, exactly as many as the server reports
+    having received: the resumed run appends at the offsets of the server.
+    """
+
+    def __init__(self, path, counts=None):
+        self.path = path
+        self.counts = counts or dict.fromkeys(_RESUMABLE_RECORDS, 0)
+        self._saved_records = 0
+        self._saved_time = time.time()
+
+    @classmethod
+    def load(cls, sync_item):
+        path = sync_item + SYNC_STATE_SUFFIX
+        try:
+            with open(path) as f:
+                counts = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(path, {k: int(counts.get(k, 0)) for k in _RESUMABLE_RECORDS})
+
+    @staticmethod
+    def skip_counts(resume_state):
+        """Return the number of records of each type the server already has."""
+        if not resume_state.resumed:
+            return dict.fromkeys(_RESUMABLE_RECORDS, 0)
+        return {
+            record_type: getattr(resume_state, field) or 0
+            for record_type, field in _RESUMABLE_RECORDS.items()
+        }
+
+    def count(self, pb):
+        """Count a record, returns its index among the records of its type."""
+        record_type = pb.WhichOneof("record_type")
+        index = self.counts[record_type]
+        # partial output lines are only sent with the rest of their line
+        if record_type != "output" or pb.output.line.endswith("\n"):
+            self.counts[record_type] += 1
+        return index
+
+    def maybe_save(self, records):
+        if (
+            records - self._saved_records < SYNC_STATE_RECORDS
+            and time.time() - self._saved_time < SYNC_STATE_SECONDS
+        ):
+            return
+        self._saved_records = records
+        self._saved_time = time.time()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.counts, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
 class SyncThread(threading.Thread):
     def __init__(
         self,
@@ -54,6 +141,7 @@ class SyncThread(threading.Thread):
         mark_synced=None,
         app_url=None,
         sync_tensorboard=None,
+        quiet=None,
     ):
         threading.Thread.__init__(self)
         # mark this process as internal
@@ -67,6 +155,12 @@ class SyncThread(threading.Thread):
         self._mark_synced = mark_synced
         self._app_url = app_url
         self._sync_tensorboard = sync_tensorboard
+        self._quiet = quiet
+        self.results = []
+
+    def _print(self, *args, **kwargs):
+        if not self._quiet:
+            print(*args, **kwargs)
 
     def _parse_pb(self, data, exit_pb=None):
         pb = wandb_internal_pb2.Record()
@@ -126,7 +220,9 @@ class SyncThread(threading.Thread):
             if tb_event_files > 0 and sync_item.endswith(WANDB_SUFFIX):
                 wandb.termwarn("Found .wandb file, not streaming tensorboard metrics.")
             else:
-                print("Found {} tfevent files in {}".format(tb_event_files, tb_root))
+                self._print(
+                    "Found {} tfevent files in {}".format(tb_event_files, tb_root)
+                )
                 if len(tb_logdirs) > 3:
                     wandb.termwarn(
                         "Found {} directories containing tfevent files. "
@@ -136,7 +232,7 @@ class SyncThread(threading.Thread):
                 return True
         return False
 
-    def _send_tensorboard(self, tb_root, tb_logdirs, send_manager):
+    def _send_tensorboard(self, tb_root, tb_logdirs, send_manager, result):
         if self._entity is None:
             viewer, server_info = send_manager._api.viewer_server_info()
             self._entity = viewer.get("entity")
@@ -151,7 +247,8 @@ class SyncThread(threading.Thread):
             url_quote(proto_run.project),
             url_quote(proto_run.run_id),
         )
-        print("Syncing: %s ..." % url)
+        result.url = url
+        self._print("Syncing: %s ..." % url)
         sys.stdout.flush()
         # using a handler here automatically handles the step
         # logic, adds summaries to the run, and handles different
@@ -194,8 +291,10 @@ class SyncThread(threading.Thread):
                 data = next(send_manager)
                 send_manager.send(data)
 
-            print_line = spinner_states[progress_step % 4] + line
-            wandb.termlog(print_line, newline=False, prefix=True)
+            result.records += 1
+            if not self._quiet:
+                print_line = spinner_states[progress_step % 4] + line
+                wandb.termlog(print_line, newline=False, prefix=True)
             progress_step += 1
 
         # finish sending any data
@@ -223,75 +322,116 @@ class SyncThread(threading.Thread):
 
     def run(self):
         for sync_item in self._sync_list:
-            tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
-            if os.path.isdir(sync_item):
-                files = os.listdir(sync_item)
-                filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
-                if tb_root is None and (
-                    check_and_warn_old(files) or len(filtered_files) != 1
-                ):
-                    print("Skipping directory: {}".format(sync_item))
-                    continue
-                if len(filtered_files) > 0:
-                    sync_item = os.path.join(sync_item, filtered_files[0])
-            sync_tb = self._setup_tensorboard(
-                tb_root, tb_logdirs, tb_event_files, sync_item
-            )
-            # If we're syncing tensorboard, let's use a tmp dir for images etc.
-            root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
+            self.results.append(self.sync(sync_item))
+
+    def sync(self, sync_item):
+        """Sync a run directory, .wandb file or tensorboard logs.
+
+        Returns:
+            SyncResult
+        """
+        result = SyncResult(sync_item)
+        start = time.time()
+        try:
+            self._sync_item(sync_item, result)
+        except Exception as e:
+            result.error = "{}: {}".format(type(e).__name__, e)
+            wandb.termerror("Unable to sync {}: {}".format(sync_item, result.error))
+        result.seconds = time.time() - start
+        return result
+
+    def _sync_item(self, sync_item, result):
+        tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
+        if os.path.isdir(sync_item):
+            files = os.listdir(sync_item)
+            filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
+            if tb_root is None and (
+                check_and_warn_old(files) or len(filtered_files) != 1
+            ):
+                self._print("Skipping directory: {}".format(sync_item))
+                return
+            if len(filtered_files) > 0:
+                sync_item = os.path.join(sync_item, filtered_files[0])
+        sync_tb = self._setup_tensorboard(
+            tb_root, tb_logdirs, tb_event_files, sync_item
+        )
+        # If we're syncing tensorboard, let's use a tmp dir for images etc.
+        root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
+        if sync_tb:
             sm = sender.SendManager.setup(root_dir)
-            if sync_tb:
-                self._send_tensorboard(tb_root, tb_logdirs, sm)
-                continue
+            self._send_tensorboard(tb_root, tb_logdirs, sm, result)
+            return
 
-            ds = datastore.DataStore()
-            try:
-                ds.open_for_scan(sync_item)
-            except AssertionError as e:
-                print(".wandb file is empty ({}), skipping: {}".format(e, sync_item))
+        # resume an interrupted sync of this file
+        state = None if self._view else _SyncState.load(sync_item)
+        sm = sender.SendManager.setup(root_dir, resume="allow" if state else None)
+        ds = datastore.DataStore()
+        try:
+            ds.open_for_scan(sync_item)
+        except AssertionError as e:
+            self._print(".wandb file is empty ({}), skipping: {}".format(e, sync_item))
+            return
+        result.size = os.path.getsize(sync_item)
+        skip = dict.fromkeys(_RESUMABLE_RECORDS, 0)
+        new_state = _SyncState(sync_item + SYNC_STATE_SUFFIX)
+
+        # save exit for final send
+        exit_pb = None
+        finished = False
+        shown = False
+        while True:
+            data = self._robust_scan(ds)
+            if data is None:
+                break
+            pb, exit_pb, cont = self._parse_pb(data, exit_pb)
+            if exit_pb is not None:
+                finished = True
+            if cont:
                 continue
-
-            # save exit for final send
-            exit_pb = None
-            finished = False
-            shown = False
-            while True:
-                data = self._robust_scan(ds)
-                if data is None:
-                    break
-                pb, exit_pb, cont = self._parse_pb(data, exit_pb)
-                if exit_pb is not None:
-                    finished = True
-                if cont:
+            record_type = pb.WhichOneof("record_type")
+            if record_type in _RESUMABLE_RECORDS:
+                if new_state.count(pb) < skip[record_type]:
+                    result.skipped += 1
                     continue
-                sm.send(pb)
-                # send any records that were added in previous send
-                while not sm._record_q.empty():
-                    data = sm._record_q.get(block=True)
-                    sm.send(data)
-
-                if pb.control.req_resp:
-                    result = sm._result_q.get(block=True)
-                    result_type = result.WhichOneof("result_type")
-                    if not shown and result_type == "run_result":
-                        r = result.run_result.run
-                        # TODO(jhr): hardcode until we have settings in sync
-                        url = "{}/{}/{}/runs/{}".format(
-                            self._app_url,
-                            url_quote(r.entity),
-                            url_quote(r.project),
-                            url_quote(r.run_id),
-                        )
-                        print("Syncing: %s ..." % url, end="")
-                        sys.stdout.flush()
-                        shown = True
-            sm.finish()
-            # Only mark synced if the run actually finished
-            if self._mark_synced and not self._view and finished:
-                synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
-                with open(synced_file, "w"):
-                    pass
-            print("done.")
+            sm.send(pb)
+            result.records += 1
+            # send any records that were added in previous send
+            while not sm._record_q.empty():
+                data = sm._record_q.get(block=True)
+                sm.send(data)
+
+            if pb.control.req_resp:
+                result_pb = sm._result_q.get(block=True)
+                result_type = result_pb.WhichOneof("result_type")
+                if not shown and result_type == "run_result":
+                    r = result_pb.run_result.run
+                    # TODO(jhr): hardcode until we have settings in sync
+                    url = "{}/{}/{}/runs/{}".format(
+                        self._app_url,
+                        url_quote(r.entity),
+                        url_quote(r.project),
+                        url_quote(r.run_id),
+                    )
+                    result.url = url
+                    self._print("Syncing: %s ..." % url, end="")
+                    sys.stdout.flush()
+                    shown = True
+                    if state:
+                        skip = state.skip_counts(sm._resume_state)
+            new_state.maybe_save(result.records)
+        sm.finish()
+        new_state.remove()
+        # Only mark synced if the run actually finished
+        if self._mark_synced and not self._view and finished:
+            synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
+            with open(synced_file, "w"):
+                pass
+        self._print("done.")
+
+
+def _sync_one(options, sync_item):
+    """Sync one path in a worker process of the sync pool."""
+    return SyncThread(sync_list=[sync_item], quiet=True, **options).sync(sync_item)
 
 
 class SyncManager:
@@ -305,6 +445,7 @@ class SyncManager:
         view=None,
         verbose=None,
         sync_tensorboard=None,
+        jobs=None,
     ):
         self._sync_list = []
         self._thread = None
@@ -316,17 +457,12 @@ class SyncManager:
         self._view = view
         self._verbose = verbose
         self._sync_tensorboard = sync_tensorboard
+        self._jobs = jobs or 1
+        self._results = []
+        self._start_time = None
 
-    def status(self):
-        pass
-
-    def add(self, p):
-        self._sync_list.append(os.path.abspath(str(p)))
-
-    def start(self):
-        # create a thread for each file?
-        self._thread = SyncThread(
-            sync_list=self._sync_list,
+    def _options(self):
+        return dict(
             project=self._project,
             entity=self._entity,
             run_id=self._run_id,
@@ -336,8 +472,108 @@ class SyncManager:
             app_url=self._app_url,
             sync_tensorboard=self._sync_tensorboard,
         )
+
+    def status(self):
+        """Return the progress of the sync."""
+        results = list(self._results)
+        seconds = time.time() - self._start_time if self._start_time else 0
+        size = sum(r.size for r in results)
+        return dict(
+            total=len(self._sync_list),
+            done=len(results),
+            failed=len([r for r in results if r.error]),
+            records=sum(r.records for r in results),
+            skipped=sum(r.skipped for r in results),
+            size=size,
+            seconds=seconds,
+            runs_per_second=len(results) / seconds if seconds else 0.0,
+            bytes_per_second=size / seconds if seconds else 0.0,
+        )
+
+    def add(self, p):
+        self._sync_list.append(os.path.abspath(str(p)))
+
+    def start(self):
+        self._start_time = time.time()
+        target = self._run
+        if self._jobs > 1 and len(self._sync_list) > 1 and not self._view:
+            target = self._run_pool
+        self._thread = threading.Thread(target=target, name="SyncManager")
         self._thread.start()
 
+    def _run(self):
+        sync_thread = SyncThread(sync_list=self._sync_list, **self._options())
+        for sync_item in self._sync_list:
+            self._results.append(sync_thread.sync(sync_item))
+        if len(self._sync_list) > 1 and not self._view:
+            self._print_summary()
+
+    def _run_pool(self):
+        # worker processes are spawned rather than forked from this threaded one
+        context = multiprocessing.get_context("spawn")
+        options = self._options()
+        total = len(self._sync_list)
+        with futures.ProcessPoolExecutor(
+            max_workers=min(self._jobs, total), mp_context=context
+        ) as executor:
+            pending = {
+                executor.submit(_sync_one, options, sync_item): sync_item
+                for sync_item in self._sync_list
+            }
+            for future in futures.as_completed(pending):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # the worker process died
+                    result = SyncResult(pending[future])
+                    result.error = "{}: {}".format(type(e).__name__, e)
+                self._results.append(result)
+                self._print_progress(result)
+        self._print_summary()
+
+    def _print_progress(self, result):
+        status = self.status()
+        name = result.url or result.path
+        if result.error:
+            line = "Failed to sync {}: {}".format(name, result.error)
+        else:
+            line = "Synced {} ({} records".format(name, result.records)
+            if result.skipped:
+                line += ", {} already synced".format(result.skipped)
+            line += ", {:.1f}s)".format(result.seconds)
+        print(
+            "[{}/{}] {} | {:.2f} runs/s, {}/s".format(
+                status["done"],
+                status["total"],
+                line,
+                status["runs_per_second"],
+                wandb.util.to_human_size(status["bytes_per_second"]),
+            )
+        )
+        sys.stdout.flush()
+
+    def _print_summary(self):
+        status = self.status()
+        print(
+            "Synced {} of {} runs ({} records, {}) in {:.1f}s: "
+            "{:.2f} runs/s, {:.0f} records/s, {}/s".format(
+                status["done"] - status["failed"],
+                status["total"],
+                status["records"],
+                wandb.util.to_human_size(status["size"]),
+                status["seconds"],
+                status["runs_per_second"],
+                status["records"] / status["seconds"] if status["seconds"] else 0,
+                wandb.util.to_human_size(status["bytes_per_second"]),
+            )
+        )
+        failed = [r for r in self._results if r.error]
+        if failed:
+            wandb.termerror("Failed to sync {} runs:".format(len(failed)))
+            for result in failed:
+                wandb.termerror("  {}: {}".format(result.path, result.error))
+        sys.stdout.flush()
+
     def is_done(self):
         return not self._thread.is_alive()
 